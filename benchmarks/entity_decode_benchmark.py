@@ -0,0 +1,64 @@
+"""
+Measures how long it takes to decode a 500 records search (25 pages) into entities, compared to reading the json.
+
+Usage:
+    python -m benchmarks.entity_decode_benchmark
+"""
+import json
+import statistics
+import time
+
+from mr_knowledge_bot.bot.entites.the_movie_db.movie_entity import TheMovieDBMovieEntity
+from mr_knowledge_bot.bot.tests.conftest import FakeTheMovieDBServer
+
+
+PAGES = 25
+ROUNDS = 50
+
+
+def measure(decode, bodies):
+    durations = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for body in bodies:
+            decode(body)
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def read_json(body):
+    return json.loads(body)
+
+
+def decode_entities(body):
+    return TheMovieDBMovieEntity.from_response(json.loads(body))
+
+
+def decode_all_fields(body):
+    # what the list used to cost, when every derived field was decoded up front.
+    entities = decode_entities(body)
+    for entity in entities:
+        entity.genres, entity.runtime, entity.videos
+    return entities
+
+
+def report(name, durations):
+    mean, median = statistics.mean(durations) * 1000, statistics.median(durations) * 1000
+    print(f'{name:<30} mean={mean:.3f}ms median={median:.3f}ms')
+
+
+def main():
+    server = FakeTheMovieDBServer().start()
+    try:
+        bodies = [json.dumps(server.page(page)).encode() for page in range(1, PAGES + 1)]
+    finally:
+        server.stop()
+
+    print(f'{PAGES} pages ({PAGES * FakeTheMovieDBServer.page_size} records) x {ROUNDS} rounds')
+    report('json only', measure(read_json, bodies))
+    report('json + entities', measure(decode_entities, bodies))
+    report('json + entities + all fields', measure(decode_all_fields, bodies))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Measures the decode throughput (records/sec) of the generated entity decoder, compared to the hand-written
+constructor call with a .get chain per field, over the results of the bundled search movies response.
+
+Usage:
+    python -m benchmarks.entity_decoder_benchmark
+"""
+import json
+import time
+
+from mr_knowledge_bot.bot.entites.the_movie_db.movie_entity import TheMovieDBMovieEntity
+
+
+SEARCH_MOVIES_RESPONSE = 'mr_knowledge_bot/bot/tests/movie/test_data/search_movies_response.json'
+ROUNDS = 2000
+
+
+def decode_by_constructor(result):
+    # how every result was decoded before the entities declared their response_fields.
+    return TheMovieDBMovieEntity(
+        _id=result.get('id'),
+        name=result.get('title'),
+        release_date=result.get('release_date'),
+        genres=result.get('genre_ids') or result.get('genres'),
+        overview=result.get('overview'),
+        popularity=result.get('popularity'),
+        rating=result.get('vote_average'),
+        homepage=result.get('homepage'),
+        status=result.get('status'),
+        runtime=result.get('runtime'),
+        videos=result.get('videos')
+    )
+
+
+def measure(decode, results):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for result in results:
+            decode(result)
+    return len(results) * ROUNDS / (time.perf_counter() - start)
+
+
+def main():
+    with open(SEARCH_MOVIES_RESPONSE) as search_movies_response:
+        results = [result for page in json.load(search_movies_response) for result in page['results']]
+    assert all(
+        TheMovieDBMovieEntity.decode(result).to_dict() == decode_by_constructor(result).to_dict() for result in results
+    )
+
+    print(f'{len(results)} records x {ROUNDS} rounds')
+    constructor = measure(decode_by_constructor, results)
+    generated = measure(TheMovieDBMovieEntity.decode, results)
+    print(f'{"constructor + .get chain":<26} {constructor:,.0f} records/sec')
+    print(f'{"generated decoder":<26} {generated:,.0f} records/sec ({generated / constructor:.2f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Compares the memory of the slotted TMDB entities against the previous layout, where every entity kept its
+attributes in a per-instance __dict__.
+
+Usage:
+    python -m benchmarks.entity_memory_benchmark
+"""
+import copy
+import json
+import sys
+import tracemalloc
+
+from mr_knowledge_bot.bot.entites.the_movie_db.movie_entity import TheMovieDBMovieEntity
+from mr_knowledge_bot.bot.entites.the_movie_db.tv_show_entity import TheMovieDBTVShowEntity
+
+
+RESULTS = 100  # the maximum number of entities a conversation keeps.
+SEARCH_MOVIES_RESPONSE = 'mr_knowledge_bot/bot/tests/movie/test_data/search_movies_response.json'
+
+
+# the attributes the previous entities kept in their __dict__, and the keys of the TMDB payload they were set from.
+DICT_ATTRIBUTES = {
+    TheMovieDBMovieEntity: {
+        'id': 'id', 'name': 'title', 'release_date': 'release_date', 'genres': 'genre_ids', 'overview': 'overview',
+        'popularity': 'popularity', 'rating': 'vote_average', 'homepage': 'homepage', 'status': 'status',
+        'runtime': 'runtime'
+    },
+    TheMovieDBTVShowEntity: {
+        'id': 'id', 'name': 'name', 'release_date': 'first_air_date', 'genres': 'genre_ids', 'overview': 'overview',
+        'popularity': 'popularity', 'rating': 'vote_average', 'status': 'status', 'seasons': 'seasons',
+        'number_of_episodes': 'number_of_episodes', 'homepage': 'homepage'
+    }
+}
+
+
+class DictEntity:
+    """
+    The previous layout of the entities, the attributes are kept in a per-instance __dict__.
+    """
+
+
+def tv_shows_payloads():
+    return [
+        {
+            'id': _id,
+            'name': f'Show {_id}',
+            'first_air_date': f'{2000 + _id % 20}-01-{1 + _id % 28:02d}',
+            'genre_ids': [18, 10765],
+            'overview': f'overview of {_id}',
+            'popularity': float(_id % 97),
+            'vote_average': float(_id % 10),
+        } for _id in range(1, RESULTS + 1)
+    ]
+
+
+def results_of(payloads):
+    return (payloads * (RESULTS // len(payloads) + 1))[:RESULTS]
+
+
+def build_dict_entities(attributes, payloads):
+    """
+    Builds a result list of the previous layout out of TMDB payloads, the values of the payloads are shared.
+    """
+    results = []
+    for payload in payloads:
+        instance = DictEntity()
+        for attribute, key in attributes.items():
+            setattr(instance, attribute, payload.get(key))
+        results.append(instance)
+    return results
+
+
+def build_slotted_entities(entities):
+    return [copy.copy(entity) for entity in entities]  # copies the slots as they are, lazy fields stay raw.
+
+
+def measure(build, *args):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    results = build(*args)
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    shallow = sys.getsizeof(results[0]) + (sys.getsizeof(results[0].__dict__) if hasattr(results[0], '__dict__') else 0)
+    return allocated, shallow
+
+
+def report(name, entity_class, payloads):
+    dict_list_bytes, dict_entity_bytes = measure(build_dict_entities, DICT_ATTRIBUTES[entity_class], payloads)
+    entities = [entity_class.decode(payload) for payload in payloads]
+    slots_list_bytes, slots_entity_bytes = measure(build_slotted_entities, entities)
+    print(name)
+    print(f'  {"__dict__ (before)":<20} per entity={dict_entity_bytes}B per {RESULTS} results={dict_list_bytes}B')
+    print(f'  {"__slots__ (after)":<20} per entity={slots_entity_bytes}B per {RESULTS} results={slots_list_bytes}B')
+    print(f'  saved: {1 - slots_list_bytes / dict_list_bytes:.0%}')
+
+
+def main():
+    with open(SEARCH_MOVIES_RESPONSE) as search_movies_response:
+        movies = results_of([result for page in json.load(search_movies_response) for result in page['results']])
+    tv_shows = results_of(tv_shows_payloads())
+
+    print(f'{RESULTS} entities, attribute values are shared so only the layout of the entities is measured')
+    report('movies', TheMovieDBMovieEntity, movies)
+    report('tv-shows', TheMovieDBTVShowEntity, tv_shows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Compares the per-page latency of a fresh connection per request against the pooled keep-alive session.
+
+Usage:
+    python -m benchmarks.http_session_benchmark
+"""
+import statistics
+import time
+
+import requests
+
+from mr_knowledge_bot.bot.clients.http_session import HTTPSession
+from mr_knowledge_bot.bot.tests.conftest import FakeTheMovieDBServer
+
+
+PAGES = 25
+ROUNDS = 20
+
+
+def measure(send, base_url):
+    latencies = []
+    for _ in range(ROUNDS):
+        for page in range(1, PAGES + 1):
+            start = time.perf_counter()
+            send('GET', f'{base_url}/search/movie', params={'query': 'batman', 'page': page}).json()
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def report(name, latencies):
+    print(
+        f'{name:<20} mean={statistics.mean(latencies) * 1000:.3f}ms '
+        f'median={statistics.median(latencies) * 1000:.3f}ms '
+        f'p95={sorted(latencies)[int(len(latencies) * 0.95)] * 1000:.3f}ms'
+    )
+
+
+def main():
+    server = FakeTheMovieDBServer().start()
+    session = HTTPSession()
+    try:
+        fresh_connection = measure(requests.request, server.base_url)
+        pooled_session = measure(session.request, server.base_url)
+    finally:
+        session.close()
+        server.stop()
+
+    print(f'{PAGES} pages x {ROUNDS} rounds against a local fake TMDB server')
+    report('requests.request', fresh_connection)
+    report('pooled session', pooled_session)
+    print(f'speedup (mean): {statistics.mean(fresh_connection) / statistics.mean(pooled_session):.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Compares how the previous services ranked the candidates of a command (sorting all of them with tuple keys)
+against the top-k stage of the result pipeline the services run now, whose null-safe numeric keys are computed
+once per entity and whose top entities are selected by a heap:
+ - search: the limit highest ranked records out of the limit * SEARCH_CANDIDATES_FACTOR most relevant ones.
+ - discover: the sort is pushed down to TMDB, so the first limit records are ranked.
+
+Usage:
+    python -m benchmarks.ranking_benchmark
+"""
+import statistics
+import time
+
+from mr_knowledge_bot.bot.entites.the_movie_db.movie_entity import TheMovieDBMovieEntity
+from mr_knowledge_bot.bot.services.the_movie_db.query_planner import QueryPlan
+from mr_knowledge_bot.bot.services.the_movie_db.ranking import SEARCH_CANDIDATES_FACTOR, search_top_k
+
+
+RECORDS = 1000
+LIMITS = (20, 100, 1000)
+ROUNDS = 200
+SORT_OPTIONS = {
+    'popularity': lambda movie: (movie.popularity, movie.popularity is not None),
+    'release_date': lambda movie: (movie.release_date, movie.release_date is not None),
+    'rating': lambda movie: (movie.rating, movie.rating is not None)
+}
+
+
+def sort_all(movies, limit, sort_by):
+    return sorted(movies, key=SORT_OPTIONS[sort_by], reverse=True)[:limit]
+
+
+def measure(select):
+    durations = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        select()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations) * 1000
+
+
+def load_movies():
+    # every record has all of its values, the previous services failed to compare missing values.
+    return TheMovieDBMovieEntity.from_response({'results': [
+        {
+            'id': _id,
+            'title': f'Movie {_id}',
+            'release_date': f'{2000 + _id % 20}-01-{1 + _id % 28:02d}',
+            'popularity': float(_id % 97),
+            'vote_average': float(_id % 10),
+        } for _id in range(1, RECORDS + 1)
+    ]})
+
+
+def main():
+    movies = load_movies()
+    print(f'{RECORDS} records, median of {ROUNDS} rounds')
+    for limit in LIMITS:
+        search_candidates = min(limit * SEARCH_CANDIDATES_FACTOR, RECORDS)
+        for sort_by in SORT_OPTIONS:
+            paths = {
+                'search': (search_candidates, lambda: search_top_k(limit, sort_by)(iter(movies))),
+                'discover': (limit, lambda: QueryPlan(limit, {}, [], sort_by=sort_by).top_k()(iter(movies)))
+            }
+            for path, (candidates, top_k) in paths.items():
+                before = measure(lambda: sort_all(movies[:candidates], limit, sort_by))
+                after = measure(top_k)
+                print(
+                    f'{path:<9} top {limit:<5} of {candidates:<5} {sort_by:<13} full sort={before:.3f}ms '
+                    f'top-k stage={after:.3f}ms ({before / after:.1f}x)'
+                )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Compares the not released filter of discover over 500 entities: parsing every release date by dateparser (the
+previous path) against the release ordinals that are parsed once, with an ISO fast path, when the entities are
+decoded.
+
+Usage:
+    python -m benchmarks.release_date_benchmark
+"""
+import statistics
+import time
+from datetime import datetime, date
+
+import dateparser
+
+from mr_knowledge_bot.bot.entites.the_movie_db.movie_entity import TheMovieDBMovieEntity
+from mr_knowledge_bot.bot.tests.conftest import FakeTheMovieDBServer
+
+
+PAGES = 25
+ROUNDS = 5
+
+
+def dateparser_path(responses):
+    movies = [movie for response in responses for movie in TheMovieDBMovieEntity.from_response(response)]
+    return [
+        movie for movie in movies if movie.release_date and
+        dateparser.parse(movie.release_date).strftime('%Y-%m-%d') < datetime.now().strftime('%Y-%m-%d')
+    ]
+
+
+def ordinal_path(responses):
+    movies = [movie for response in responses for movie in TheMovieDBMovieEntity.from_response(response)]
+    today = date.today().toordinal()
+    return [movie for movie in movies if movie.release_ordinal is not None and movie.release_ordinal < today]
+
+
+def measure(path, responses):
+    durations = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        path(responses)
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations) * 1000
+
+
+def main():
+    server = FakeTheMovieDBServer().start()
+    try:
+        responses = [server.page(page) for page in range(1, PAGES + 1)]
+    finally:
+        server.stop()
+    assert [movie.id for movie in dateparser_path(responses)] == [movie.id for movie in ordinal_path(responses)]
+
+    print(f'{PAGES * FakeTheMovieDBServer.page_size} entities (decode + not released filter), median of {ROUNDS}')
+    before, after = measure(dateparser_path, responses), measure(ordinal_path, responses)
+    print(f'{"dateparser per entity":<24} {before:.3f}ms')
+    print(f'{"release ordinals":<24} {after:.3f}ms ({before / after:.0f}x faster)')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,7 @@
 
 from mr_knowledge_bot.bot.clients.the_movie_db.movie_client import TheMovieDBMovieClient as MovieClient
 from mr_knowledge_bot.bot.clients.the_movie_db.tv_show_client import TheMovieDBTVShowsClient as TVShowsClient
+from mr_knowledge_bot.bot.clients.the_movie_db.async_movie_client import \
+    AsyncTheMovieDBMovieClient as AsyncMovieClient
+from mr_knowledge_bot.bot.clients.the_movie_db.async_tv_show_client import \
+    AsyncTheMovieDBTVShowsClient as AsyncTVShowsClient
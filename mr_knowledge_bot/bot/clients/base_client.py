@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
+import functools
 import logging
+import json
 from json.decoder import JSONDecodeError
 from mr_knowledge_bot.bot.entites.base_entity import BaseEntity
 from typing import Type, Optional
@@ -13,6 +15,91 @@ class ApiError(Exception):
     pass
 
 
+class ApiUnavailableError(ApiError):
+    """
+    The api answered with a server error (5xx) or kept rate limiting the requests (429).
+    """
+    pass
+
+
+def api_error(status_code, message):
+    """
+    Returns the error of a response that did not succeed, ApiUnavailableError if the api is unavailable and an
+    ApiError if the request itself was rejected (4xx).
+    """
+    if status_code >= 500 or status_code == 429:
+        return ApiUnavailableError(message)
+    return ApiError(message)
+
+
+try:
+    import orjson
+    json_loads = orjson.loads  # orjson.JSONDecodeError inherits from JSONDecodeError.
+except ImportError:
+    json_loads = json.loads
+
+
+def set_json_decoder(loads):
+    """
+    Replaces the function that decodes the bodies of the responses, orjson is used when it is installed and the
+    standard library otherwise.
+
+    Args:
+        loads (Callable): gets the body (bytes) and returns the decoded json, raises JSONDecodeError if it is invalid.
+    """
+    global json_loads
+    json_loads = loads
+
+
+def decode_json(http_response):
+    """
+    Decodes the json body (bytes) of the http response once, the decoded body is reused for the status check,
+    the keys extraction and the entities, and by the callers that share the response (see SingleFlight).
+    """
+    if (decoded_body := getattr(http_response, '_decoded_json', None)) is None:
+        body = http_response.content
+        # a response without a body that was read falls back to its own json decoding.
+        decoded_body = json_loads(body) if body is not None else http_response.json()
+        http_response._decoded_json = decoded_body
+    return decoded_body
+
+
+def validate_response_type(_class_type, response_type):
+    response_types = {'class', 'response', 'json'}
+    if response_type not in response_types:
+        raise ValueError(
+            f'Invalid response type ({response_type}) - should be one of ({",".join(response_types)})'
+        )
+
+    if response_type == 'class' and not _class_type:
+        raise ValueError('_class_type must be provided when "response_type" = class')
+
+
+def parse_response(
+    http_response,
+    _class_type: Optional[Type[BaseEntity]] = None,
+    expected_valid_code: int = 200,
+    response_type: str = 'class',
+    keys: Optional[list] = None
+):
+    """
+    Parses a single http response, see parse_http_response for the arguments.
+    """
+    if response_type == 'response' and http_response.status_code == expected_valid_code:
+        return http_response  # in case the entire response object is needed, the body is not decoded.
+    try:
+        response_as_json = decode_json(http_response)
+    except JSONDecodeError:
+        if http_response.status_code != expected_valid_code:
+            raise api_error(http_response.status_code, f'Error: ({http_response.text})')
+        raise
+    if http_response.status_code != expected_valid_code:
+        raise api_error(http_response.status_code, f'Error: ({response_as_json})')
+    if response_type == 'class':
+        return _class_type.from_response(response_as_json)
+    return dict_get_nested_fields(dictionary=response_as_json, keys=keys)
+
+
 def parse_http_response(
     _class_type: Optional[Type[BaseEntity]] = None,
     expected_valid_code: int = 200,
@@ -38,33 +125,48 @@ def parse_http_response(
     # response - return the complete response object.
     # json - return a dict/list containing the response.
 
-    response_types = {'class', 'response', 'json'}
-    if response_type not in response_types:
-        raise ValueError(
-            f'Invalid response type ({response_type}) - should be one of ({",".join(response_types)})'
-        )
-
-    if response_type == 'class' and not _class_type:
-        raise ValueError('_class_type must be provided when "response_type" = class')
+    validate_response_type(_class_type, response_type)
 
     def decorator(func):
+        @functools.wraps(func)
         def wrapper(self, *args, **kwargs):
             # response type will override the response of the class.
             logger.debug(f'Sending HTTP request using function {func.__name__} with {args=}, {kwargs=}')
             http_response = func(self, *args, **kwargs)
+            return parse_response(
+                http_response,
+                _class_type=_class_type,
+                expected_valid_code=expected_valid_code,
+                response_type=response_type,
+                keys=keys
+            )
+        return wrapper
+    return decorator
+
 
-            if http_response.status_code != expected_valid_code:
-                try:
-                    response_as_json = http_response.json()
-                except JSONDecodeError:
-                    raise ApiError(f'Error: ({http_response.text})')
-                raise ApiError(f'Error: ({response_as_json})')
-            if response_type == 'class':
-                return _class_type.from_response(http_response.json())
-            elif response_type == 'json':
-                return dict_get_nested_fields(dictionary=http_response.json(), keys=keys)
-            else:  # in case the entire response object is needed
-                return http_response
+def async_parse_http_response(
+    _class_type: Optional[Type[BaseEntity]] = None,
+    expected_valid_code: int = 200,
+    response_type: str = 'class',
+    keys: Optional[list] = None
+):
+    """
+    Parses the http response of a coroutine, has the same semantics as parse_http_response.
+    """
+    validate_response_type(_class_type, response_type)
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            logger.debug(f'Sending HTTP request using coroutine {func.__name__} with {args=}, {kwargs=}')
+            http_response = await func(self, *args, **kwargs)
+            return parse_response(
+                http_response,
+                _class_type=_class_type,
+                expected_valid_code=expected_valid_code,
+                response_type=response_type,
+                keys=keys
+            )
         return wrapper
     return decorator
 
@@ -79,3 +181,15 @@ class BaseClient(ABC):
     @abstractmethod
     def get(self, url, params=None):
         pass
+
+
+class AsyncBaseClient(ABC):
+
+    def __init__(self, token=None, base_url=None, verify=True):
+        self.token = token
+        self.base_url = base_url
+        self.verify = verify
+
+    @abstractmethod
+    async def get(self, url, params=None):
+        pass
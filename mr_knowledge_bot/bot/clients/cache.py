@@ -0,0 +1,70 @@
+import time
+import threading
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    A thread-safe, size bounded LRU cache where every entry expires after its own ttl.
+
+    Counts hits/misses/evictions so the cache can be sized by its real usage. Expired entries are not served
+    by get, but they are kept (until they are evicted) so they can be served by get_stale when the source of
+    the values is unavailable.
+
+    Args:
+        max_size (int): the maximum number of entries, the least recently used entry is evicted after that.
+    """
+    def __init__(self, max_size=1024):
+        self.max_size = max_size
+        self._entries = OrderedDict()  # key -> (value, expires_at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        with self._lock:
+            if (entry := self._entries.get(key)) is not None:
+                value, expires_at = entry
+                if time.monotonic() < expires_at:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+            self.misses += 1
+            return default
+
+    def get_stale(self, key, default=None):
+        """
+        Returns the value of the key even if it has already expired.
+        """
+        with self._lock:
+            if (entry := self._entries.get(key)) is not None:
+                self._entries.move_to_end(key)
+                return entry[0]
+            return default
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
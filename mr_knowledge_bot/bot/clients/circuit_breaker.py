@@ -0,0 +1,273 @@
+import os
+import time
+import asyncio
+import logging
+import threading
+import aiohttp
+import requests
+from concurrent.futures import ThreadPoolExecutor
+
+from mr_knowledge_bot.bot.clients.base_client import ApiUnavailableError
+from mr_knowledge_bot.bot.clients.deadline import DeadlineExceeded
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_SLOW_CALL_DURATION = 5.0  # seconds, a call that takes longer counts as a failure.
+DEFAULT_RESET_TIMEOUT = 30.0  # seconds the breaker stays open before it lets a probe call through.
+REFRESH_WORKERS = 2
+
+# errors that mean the api is unavailable (5xx/429, connection errors and timeouts), cached values can be served
+# instead. the errors of rejected requests (4xx) are a bug in the caller, so they propagate.
+UNAVAILABLE_ERRORS = (
+    ApiUnavailableError, requests.ConnectionError, requests.Timeout, aiohttp.ClientConnectionError,
+    asyncio.TimeoutError
+)
+
+
+class CircuitOpenError(ApiUnavailableError):
+    pass
+
+
+class CircuitBreaker:
+    """
+    A thread-safe circuit breaker around the calls to an api.
+
+    The breaker opens after failure_threshold consecutive failed (or slow) calls, while it is open calls are
+    rejected immediately with CircuitOpenError instead of waiting for an api that is down. After reset_timeout
+    seconds a single probe call is let through (half-open), if it succeeds the breaker closes, otherwise it
+    opens again.
+
+    Args:
+        failure_threshold (int): how many consecutive failed calls open the breaker.
+        slow_call_duration (float): seconds after which a call counts as a failure, even if it succeeded.
+        reset_timeout (float): how many seconds the breaker stays open before probing the api again.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, failure_threshold=None, slow_call_duration=None, reset_timeout=None):
+        self.failure_threshold = int(
+            failure_threshold or os.getenv('THE_MOVIE_DB_BREAKER_FAILURE_THRESHOLD', DEFAULT_FAILURE_THRESHOLD)
+        )
+        self.slow_call_duration = float(
+            slow_call_duration or os.getenv('THE_MOVIE_DB_BREAKER_SLOW_CALL_DURATION', DEFAULT_SLOW_CALL_DURATION)
+        )
+        self.reset_timeout = float(
+            reset_timeout or os.getenv('THE_MOVIE_DB_BREAKER_RESET_TIMEOUT', DEFAULT_RESET_TIMEOUT)
+        )
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._opened_at = None
+            self._probing = False
+            self.consecutive_failures = 0
+            self.failures = 0
+            self.slow_calls = 0
+            self.rejected_calls = 0
+            self.opened = 0
+            self.stale_served = 0
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def retry_after(self):
+        """
+        Returns how many seconds are left until the breaker lets a call through.
+        """
+        with self._lock:
+            if self._state != self.OPEN:
+                return 0.0
+            return max(self._opened_at + self.reset_timeout - time.monotonic(), 0.0)
+
+    def before_call(self):
+        """
+        Raises CircuitOpenError if the call should not reach the api.
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._state = self.HALF_OPEN
+            if self._state == self.HALF_OPEN and not self._probing:
+                self._probing = True  # only one probe call, the rest are rejected until it is done.
+                return
+            self.rejected_calls += 1
+        raise CircuitOpenError('The api is unavailable, the circuit breaker is open')
+
+    def record(self, duration, failed=False):
+        """
+        Records the outcome of a call that was let through by before_call.
+
+        Args:
+            duration (float): how many seconds the call took.
+            failed (bool): whether the call failed.
+        """
+        with self._lock:
+            if duration >= self.slow_call_duration:
+                self.slow_calls += 1
+                failed = True
+            self._probing = False
+
+            if not failed:
+                if self._state != self.CLOSED:
+                    logger.info('The api is available again, closing the circuit breaker')
+                self._state, self.consecutive_failures = self.CLOSED, 0
+                return
+
+            self.failures += 1
+            self.consecutive_failures += 1
+            if self._state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self.opened += 1
+                    logger.warning(
+                        f'Opening the circuit breaker after {self.consecutive_failures} failed calls to the api'
+                    )
+                self._state, self._opened_at = self.OPEN, time.monotonic()
+
+    def _abandon(self):
+        # the call was interrupted by something that says nothing about the api, another probe may be sent.
+        with self._lock:
+            self._probing = False
+
+    def call(self, func, is_failure=None):
+        """
+        Calls func through the breaker.
+
+        Args:
+            func (Callable): the call to the api.
+            is_failure (Callable): gets the result of the call and returns whether it is a failure.
+        """
+        self.before_call()
+        started = time.monotonic()
+        try:
+            result = func()
+        except DeadlineExceeded:
+            self._abandon()  # the caller ran out of time, that says nothing about the api.
+            raise
+        except UNAVAILABLE_ERRORS:
+            self.record(time.monotonic() - started, failed=True)
+            raise
+        except BaseException:
+            self._abandon()
+            raise
+        self.record(time.monotonic() - started, failed=bool(is_failure and is_failure(result)))
+        return result
+
+    async def async_call(self, coroutine_func, is_failure=None):
+        """
+        The asynchronous version of call, coroutine_func is a coroutine function.
+        """
+        self.before_call()
+        started = time.monotonic()
+        try:
+            result = await coroutine_func()
+        except DeadlineExceeded:
+            self._abandon()  # the caller ran out of time, that says nothing about the api.
+            raise
+        except UNAVAILABLE_ERRORS:
+            self.record(time.monotonic() - started, failed=True)
+            raise
+        except BaseException:
+            self._abandon()
+            raise
+        self.record(time.monotonic() - started, failed=bool(is_failure and is_failure(result)))
+        return result
+
+    def record_stale_serve(self):
+        with self._lock:
+            self.stale_served += 1
+
+    def stats(self):
+        state = self.state
+        with self._lock:
+            return {
+                'state': state,
+                'consecutive_failures': self.consecutive_failures,
+                'failures': self.failures,
+                'slow_calls': self.slow_calls,
+                'rejected_calls': self.rejected_calls,
+                'opened': self.opened,
+                'stale_served': self.stale_served
+            }
+
+
+class BackgroundRefresher:
+    """
+    Refreshes stale cached values in the background, a key is refreshed by at most one task at a time.
+
+    A refresh waits until the circuit breaker lets calls through, so it does not fail right away while the
+    api is known to be unavailable. A refresh that fails is dropped, the next stale serve submits a new one.
+
+    Args:
+        circuit_breaker (CircuitBreaker): the breaker of the api that the values are refreshed from.
+    """
+    def __init__(self, circuit_breaker):
+        self.circuit_breaker = circuit_breaker
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._tasks = set()  # keeps references to the asyncio tasks until they are done.
+        self._executor = None
+
+    def _claim(self, key):
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def _release(self, key):
+        with self._lock:
+            self._refreshing.discard(key)
+
+    def submit(self, key, func):
+        """
+        Calls func in a background thread, unless the key is already being refreshed.
+        """
+        if not self._claim(key):
+            return False
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=REFRESH_WORKERS, thread_name_prefix='refresh')
+        self._executor.submit(self._refresh, key, func)
+        return True
+
+    def _refresh(self, key, func):
+        try:
+            time.sleep(self.circuit_breaker.retry_after())
+            func()
+        except Exception as e:
+            logger.debug(f'Could not refresh {key} in the background, error: {e}')
+        finally:
+            self._release(key)
+
+    def submit_async(self, key, coroutine_func):
+        """
+        Awaits coroutine_func in a background task of the running event loop, unless the key is already being
+        refreshed.
+        """
+        if not self._claim(key):
+            return False
+        task = asyncio.get_running_loop().create_task(self._async_refresh(key, coroutine_func))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return True
+
+    async def _async_refresh(self, key, coroutine_func):
+        try:
+            await asyncio.sleep(self.circuit_breaker.retry_after())
+            await coroutine_func()
+        except Exception as e:
+            logger.debug(f'Could not refresh {key} in the background, error: {e}')
+        finally:
+            self._release(key)
@@ -0,0 +1,71 @@
+import time
+import contextvars
+
+from mr_knowledge_bot.bot.clients.base_client import ApiError
+
+
+_current_deadline = contextvars.ContextVar('deadline', default=None)
+
+
+class DeadlineExceeded(ApiError):
+    pass
+
+
+class Deadline:
+    """
+    A time budget for all the api calls of a single command.
+
+    Used as a context manager, the api calls that are made inside the block (including the calls of the
+    threads/tasks that query pages concurrently) read it by Deadline.current() and get the remaining budget as
+    their timeout. A deadline that is entered inside another deadline never outlives the outer one.
+
+    Args:
+        seconds (float): the budget of the command.
+    """
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+        self._token = None
+
+    @classmethod
+    def current(cls):
+        """
+        Returns the deadline of the running command, None if there is no deadline.
+        """
+        return _current_deadline.get()
+
+    def remaining(self):
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    @property
+    def expired(self):
+        return self.remaining() <= 0
+
+    def check(self):
+        if self.expired:
+            raise DeadlineExceeded(f'The deadline of {self.seconds} seconds was exceeded')
+
+    def timeout(self, timeout=None):
+        """
+        Returns the timeout bounded by the remaining budget.
+
+        Args:
+            timeout (float | tuple): a total timeout or a (connect, read) timeout.
+
+        Raises:
+            DeadlineExceeded: if there is no budget left.
+        """
+        self.check()
+        remaining = self.remaining()
+        if isinstance(timeout, tuple):
+            return tuple(min(_timeout, remaining) for _timeout in timeout)
+        return min(timeout, remaining) if timeout else remaining
+
+    def __enter__(self):
+        if (outer_deadline := self.current()) is not None:
+            self.expires_at = min(self.expires_at, outer_deadline.expires_at)
+        self._token = _current_deadline.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        _current_deadline.reset(self._token)
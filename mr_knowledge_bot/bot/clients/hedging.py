@@ -0,0 +1,200 @@
+import os
+import time
+import asyncio
+import logging
+import threading
+import contextvars
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_PERCENTILE = 95
+DEFAULT_MAX_HEDGE_RATIO = 0.05  # at most 5% more requests.
+DEFAULT_WINDOW = 200
+MIN_SAMPLES = 20
+HEDGING_WORKERS = 16
+
+
+class LatencyTracker:
+    """
+    Keeps the latencies of the recent requests, used to tell what a slow request is.
+
+    Args:
+        window (int): how many recent latencies to keep.
+    """
+    def __init__(self, window=DEFAULT_WINDOW):
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._latencies)
+
+    def record(self, latency):
+        with self._lock:
+            self._latencies.append(latency)
+
+    def percentile(self, percentile):
+        """
+        Returns the latency that the given percent of the recent requests answered within, None if there are no
+        latencies yet.
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+        if not latencies:
+            return None
+        return latencies[min(int(len(latencies) * percentile / 100), len(latencies) - 1)]
+
+
+class Hedger:
+    """
+    Hedges slow idempotent requests.
+
+    If a request did not answer within the given percentile of the recent latencies, a duplicate request is sent
+    (see call and async_call for which answer wins). The ratio of hedged requests is capped, so a slow api does
+    not make the process double its requests. Until enough latencies are known requests are not hedged.
+
+    Args:
+        enabled (bool): whether to hedge at all, when disabled requests are sent as is.
+        percentile (float): the percentile of the recent latencies to send the duplicate request after.
+        max_hedge_ratio (float): the maximum ratio of requests that can be hedged.
+        window (int): how many recent latencies to consider.
+    """
+    def __init__(self, enabled=None, percentile=None, max_hedge_ratio=None, window=None):
+        self.enabled = enabled if enabled is not None else os.getenv('THE_MOVIE_DB_HEDGING', '').lower() == 'true'
+        self.percentile = float(percentile or os.getenv('THE_MOVIE_DB_HEDGE_PERCENTILE', DEFAULT_PERCENTILE))
+        self.max_hedge_ratio = float(
+            max_hedge_ratio or os.getenv('THE_MOVIE_DB_HEDGE_MAX_RATIO', DEFAULT_MAX_HEDGE_RATIO)
+        )
+        self.latencies = LatencyTracker(window=int(window or os.getenv('THE_MOVIE_DB_HEDGE_WINDOW', DEFAULT_WINDOW)))
+        self._lock = threading.Lock()
+        self._executor = None
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.hedged = 0
+            self.hedge_wins = 0
+            self.capped = 0
+
+    def hedge_delay(self):
+        """
+        Returns how many seconds to wait for a request before hedging it, None if it should not be hedged.
+        """
+        if not self.enabled or len(self.latencies) < MIN_SAMPLES:
+            return None
+        return self.latencies.percentile(self.percentile)
+
+    def _take_hedge(self):
+        with self._lock:
+            if self.hedged + 1 > self.max_hedge_ratio * self.requests:
+                self.capped += 1
+                return False
+            self.hedged += 1
+            return True
+
+    def _count_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def _count_hedge_win(self):
+        with self._lock:
+            self.hedge_wins += 1
+
+    def _timed(self, func):
+        started = time.monotonic()
+        result = func()
+        self.latencies.record(time.monotonic() - started)
+        return result
+
+    async def _async_timed(self, coroutine_func):
+        started = time.monotonic()
+        result = await coroutine_func()
+        self.latencies.record(time.monotonic() - started)
+        return result
+
+    def _submit(self, func, context):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=HEDGING_WORKERS, thread_name_prefix='hedging')
+        # the request runs in (a copy of) the context of the caller, so it keeps its deadline. a context can only be
+        # entered by one thread at a time, so the original request and its hedge need their own copies.
+        return self._executor.submit(context.copy().run, self._timed, func)
+
+    def call(self, func, hedge_func=None):
+        """
+        Calls func on the hedging pool, if it did not answer within the hedge delay hedge_func (func by default) is
+        called as well. Whichever answers first (successfully) wins, and the request that lost is cancelled (if it
+        did not start yet, a running request can't be interrupted so its answer is just dropped).
+        """
+        if not self.enabled:
+            return func()
+        self._count_request()
+        if (delay := self.hedge_delay()) is None:
+            return self._timed(func)
+
+        context = contextvars.copy_context()
+        primary = self._submit(func, context=context)
+        done, _ = wait({primary}, timeout=delay)
+        if done or not self._take_hedge():
+            return primary.result()
+
+        hedge = self._submit(hedge_func or func, context=context)
+        pending = {primary, hedge}
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is None:
+                        if future is hedge:
+                            self._count_hedge_win()
+                        return future.result()
+            return primary.result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    async def async_call(self, coroutine_func, hedge_func=None):
+        """
+        The asynchronous version of call, both requests run on the event loop.
+        """
+        if not self.enabled:
+            return await coroutine_func()
+        self._count_request()
+        if (delay := self.hedge_delay()) is None:
+            return await self._async_timed(coroutine_func)
+
+        primary = asyncio.ensure_future(self._async_timed(coroutine_func))
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done or not self._take_hedge():
+            return await primary
+
+        hedge = asyncio.ensure_future(self._async_timed(hedge_func or coroutine_func))
+        pending = {primary, hedge}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self._count_hedge_win()
+                        return task.result()
+            return primary.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'hedge_delay': self.hedge_delay(),
+                'requests': self.requests,
+                'hedged': self.hedged,
+                'hedge_wins': self.hedge_wins,
+                'hedge_win_rate': self.hedge_wins / self.hedged if self.hedged else 0.0,
+                'capped': self.capped
+            }
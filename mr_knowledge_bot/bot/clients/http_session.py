@@ -0,0 +1,169 @@
+import os
+import asyncio
+import logging
+import threading
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from typing import Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_POOL_SIZE = 20
+DEFAULT_CONNECT_TIMEOUT = 3.05
+DEFAULT_READ_TIMEOUT = 10
+DNS_CACHE_TTL = 300
+
+
+class HTTPSession:
+    """
+    A process-wide pooled HTTP session with keep-alive connections.
+
+    All the clients that talk with the same api share one session, that way the TCP/TLS handshake (and the DNS
+    lookup of the host) is paid once per pooled connection instead of once per request.
+
+    Args:
+        pool_size (int): the maximum number of connections to keep open per host.
+        connect_timeout (float): how many seconds to wait for a connection to be established.
+        read_timeout (float): how many seconds to wait for the server to send a response.
+    """
+    def __init__(self, pool_size=None, connect_timeout=None, read_timeout=None):
+        self.pool_size = int(pool_size or os.getenv('HTTP_POOL_SIZE', DEFAULT_POOL_SIZE))
+        self.connect_timeout = float(connect_timeout or os.getenv('HTTP_CONNECT_TIMEOUT', DEFAULT_CONNECT_TIMEOUT))
+        self.read_timeout = float(read_timeout or os.getenv('HTTP_READ_TIMEOUT', DEFAULT_READ_TIMEOUT))
+        self._session = self._create_session()
+
+    @property
+    def timeout(self):
+        return self.connect_timeout, self.read_timeout
+
+    def _create_session(self):
+        session = requests.Session()
+        # connections (and the host resolution that came with them) are reused as long as they are kept alive.
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size, pool_block=False)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update({'Connection': 'keep-alive'})
+        return session
+
+    def request(self, method, url, timeout=None, **kwargs):
+        return self._session.request(method, url, timeout=timeout or self.timeout, **kwargs)
+
+    def close(self):
+        self._session.close()
+
+
+class AsyncHTTPSession(HTTPSession):
+    """
+    The asynchronous version of HTTPSession, backed by an aiohttp connection pool.
+
+    Responses are returned as (fully read) requests.Response objects, so they are parsed exactly like the
+    responses of the synchronous session. An aiohttp session is bound to an event loop, so a new one is created
+    when the session is used from a different event loop.
+    """
+    _loop = None
+
+    def _create_session(self):
+        return None
+
+    def _get_session(self):
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            self._close_previous_session()
+            self._loop = loop
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=self.pool_size, ttl_dns_cache=DNS_CACHE_TTL),
+                timeout=aiohttp.ClientTimeout(sock_connect=self.connect_timeout, sock_read=self.read_timeout),
+                headers={'Connection': 'keep-alive'}
+            )
+        return self._session
+
+    def _close_previous_session(self):
+        """
+        Closes the session of the previous event loop, on that loop if it is still running (in another thread),
+        otherwise on the current loop.
+        """
+        previous_session, previous_loop = self._session, self._loop
+        if previous_session is None or previous_session.closed:
+            return
+        if previous_loop is not None and previous_loop.is_running():
+            asyncio.run_coroutine_threadsafe(previous_session.close(), previous_loop)
+        else:
+            task = asyncio.get_running_loop().create_task(previous_session.close())
+            task.add_done_callback(lambda done: done.cancelled() or done.exception())  # already closed transports.
+
+    @staticmethod
+    def _to_query(params):
+        # aiohttp accepts only strings/numbers, list values are sent as repeated parameters like requests does.
+        query = []
+        for name, value in (params or {}).items():
+            for _value in (value if isinstance(value, (list, tuple)) else [value]):
+                if _value is not None:
+                    query.append((name, str(_value).lower() if isinstance(_value, bool) else str(_value)))
+        return query
+
+    async def request(self, method, url, params=None, timeout=None, verify=True, **kwargs):
+        if timeout is not None:
+            kwargs['timeout'] = aiohttp.ClientTimeout(total=timeout if isinstance(timeout, (int, float)) else None)
+        async with self._get_session().request(
+            method, url, params=self._to_query(params), ssl=None if verify else False, **kwargs
+        ) as response:
+            http_response = requests.Response()
+            http_response.status_code = response.status
+            http_response.headers = CaseInsensitiveDict(response.headers)
+            http_response.url = str(response.url)
+            http_response.encoding = response.charset or 'utf-8'
+            http_response._content = await response.read()
+            return http_response
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+
+_session: Optional[HTTPSession] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> HTTPSession:
+    """
+    Returns the process-wide http session, creates it on first use.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = HTTPSession()
+                logger.debug(
+                    f'Created a pooled http session with pool-size={_session.pool_size}, timeout={_session.timeout}'
+                )
+    return _session
+
+
+def reset_session():
+    """
+    Closes the process-wide http session, the next call to get_session will create a new one.
+    """
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+
+
+_async_session: Optional[AsyncHTTPSession] = None
+
+
+def get_async_session() -> AsyncHTTPSession:
+    """
+    Returns the process-wide asynchronous http session, creates it on first use.
+    """
+    global _async_session
+    if _async_session is None:
+        with _session_lock:
+            if _async_session is None:
+                _async_session = AsyncHTTPSession()
+    return _async_session
@@ -0,0 +1,105 @@
+import time
+import random
+import asyncio
+import threading
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+
+
+DEFAULT_BACKOFF = 1.0  # seconds, when a 429 response does not say how long to wait.
+MAX_BACKOFF = 30.0
+BACKOFF_JITTER = 0.25
+
+
+def retry_after_delay(http_response, attempt):
+    """
+    Returns how many seconds to wait before retrying a request that was rate limited (429).
+
+    Honors the Retry-After header (seconds or an http date), falls back to an exponential backoff by the
+    attempt number, the delay gets a random jitter so clients that were limited together don't retry together.
+    """
+    delay = None
+    if retry_after := http_response.headers.get('Retry-After'):
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                delay = (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                delay = None
+
+    if delay is None:
+        delay = DEFAULT_BACKOFF * 2 ** attempt
+
+    delay = min(max(delay, 0), MAX_BACKOFF)
+    return delay + random.uniform(0, BACKOFF_JITTER * max(delay, DEFAULT_BACKOFF))
+
+
+class TokenBucketRateLimiter:
+    """
+    A thread-safe token bucket rate limiter.
+
+    Every request reserves a token, when the bucket is empty the token is reserved from the future and the caller
+    waits until it is refilled, so waiting callers are served by their arrival order. The time callers spend
+    waiting is counted, a growing wait means the process throttles itself.
+
+    Args:
+        rate (float): how many tokens are added to the bucket every second.
+        burst (int): the maximum number of tokens in the bucket.
+    """
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self.acquired = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def reserve(self):
+        """
+        Takes a token, returns how many seconds to wait before it can be used.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            self._tokens -= 1
+
+            wait = max(-self._tokens / self.rate if self._tokens < 0 else 0.0, self._paused_until - now)
+            self.acquired += 1
+            if wait > 0:
+                self.throttled += 1
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+            return wait
+
+    def acquire(self):
+        if wait := self.reserve():
+            time.sleep(wait)
+        return wait
+
+    async def async_acquire(self):
+        if wait := self.reserve():
+            await asyncio.sleep(wait)
+        return wait
+
+    def pause(self, seconds):
+        """
+        Holds all the callers for the given seconds, used when the api says that we are rate limited.
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'acquired': self.acquired,
+                'throttled': self.throttled,
+                'total_wait': self.total_wait,
+                'average_wait': self.total_wait / self.throttled if self.throttled else 0.0,
+                'max_wait': self.max_wait
+            }
@@ -0,0 +1,230 @@
+import os
+import json
+import time
+import zlib
+import sqlite3
+import logging
+import threading
+import requests
+from urllib.parse import urlencode, urlsplit, urlunsplit, parse_qsl
+from requests.structures import CaseInsensitiveDict
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_TTLS = {
+    'search': 60 * 60,
+    'discover': 60 * 60,
+    'genres': 60 * 60 * 24,
+    'details': 60 * 60 * 24,
+    'seasons': 60 * 60 * 24,
+    'videos': 60 * 60 * 24
+}
+# the payload is stored decoded, so headers which describe how it was transferred are not kept.
+TRANSPORT_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection', 'keep-alive'}
+
+
+def endpoint_of(url):
+    """
+    Returns the kind of endpoint of a TMDB url, used to pick the ttl of its responses.
+    """
+    if url.startswith('/search/'):
+        return 'search'
+    if url.startswith('/discover/'):
+        return 'discover'
+    if url.startswith('/genre/'):
+        return 'genres'
+    if url.endswith('/videos'):
+        return 'videos'
+    if '/season/' in url:
+        return 'seasons'
+    return 'details'
+
+
+def conditional_headers(http_response):
+    """
+    Returns the headers that revalidate a cached response by its validators (ETag/Last-Modified).
+    """
+    headers = {}
+    if etag := http_response.headers.get('ETag'):
+        headers['If-None-Match'] = etag
+    if last_modified := http_response.headers.get('Last-Modified'):
+        headers['If-Modified-Since'] = last_modified
+    return headers
+
+
+def response_cache_key(url, params):
+    """
+    Returns the cache key of a request, secrets such as the api key are never part of the key.
+    """
+    params = sorted((name, value) for name, value in (params or {}).items() if name != 'api_key')
+    return f'{url}?{urlencode(params, doseq=True)}'
+
+
+def redact_url(url):
+    """
+    Returns the url without the api key, so it is never stored.
+    """
+    if not url:
+        return url
+    parts = urlsplit(url)
+    query = [(name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True) if name != 'api_key']
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+class SQLiteResponseCache:
+    """
+    A persistent cache of successful api responses in a single SQLite file, so a restarted process starts warm.
+
+    Payloads are stored compressed, every endpoint has its own ttl and once the payloads take more than
+    max_bytes the least recently used responses are evicted. Responses are stored with their validators
+    (ETag/Last-Modified headers) so once they expire they can be revalidated instead of downloaded again.
+
+    Args:
+        path (str): the path of the SQLite file.
+        max_bytes (int): the maximum total size of the (compressed) payloads.
+        ttls (dict): seconds each kind of endpoint (see endpoint_of) is valid.
+    """
+    def __init__(self, path, max_bytes=None, ttls=None):
+        self.path = path
+        self.max_bytes = int(max_bytes or os.getenv('THE_MOVIE_DB_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES))
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            'key TEXT PRIMARY KEY, endpoint TEXT, url TEXT, headers TEXT, body BLOB, size INTEGER, '
+            'stored_at REAL, expires_at REAL, accessed_at REAL)'
+        )
+        self._connection.execute('CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)')
+        self._total_bytes = self._connection.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.revalidations = 0
+
+    def get(self, key):
+        """
+        Returns the cached response of the key as a requests.Response, or None if it is missing or expired.
+        """
+        http_response, fresh = self.lookup(key)
+        return http_response if fresh else None
+
+    def lookup(self, key):
+        """
+        Returns the cached response of the key (None if it is missing) and whether it is still fresh.
+
+        Expired responses are kept until they are evicted, so they can be revalidated by their validators.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT url, headers, body, expires_at FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None or row[3] <= time.time():
+                self.misses += 1
+            else:
+                self.hits += 1
+            if row is not None:
+                self._connection.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (time.time(), key))
+
+        if row is None:
+            return None, False
+        url, headers, body, expires_at = row
+        return self._to_response(url=url, headers=headers, body=body), expires_at > time.time()
+
+    def refresh(self, key, url):
+        """
+        Marks an expired response as fresh again, used when the api says the response was not modified.
+        """
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                'UPDATE responses SET expires_at = ?, accessed_at = ? WHERE key = ?',
+                (now + self.ttls[endpoint_of(url)], now, key)
+            )
+            self.revalidations += 1
+
+    def set(self, key, url, http_response):
+        endpoint = endpoint_of(url)
+        body = self._compress(http_response.content)
+        headers = json.dumps({
+            name: value for name, value in http_response.headers.items() if name.lower() not in TRANSPORT_HEADERS
+        })
+        now = time.time()
+        with self._lock:
+            previous_size = self._connection.execute(
+                'SELECT size FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            self._connection.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (
+                    key, endpoint, redact_url(http_response.url), headers, body, len(body), now,
+                    now + self.ttls[endpoint], now
+                )
+            )
+            self._total_bytes += len(body) - (previous_size[0] if previous_size else 0)
+            self._evict()
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes:
+            row = self._connection.execute(
+                'SELECT key, size FROM responses ORDER BY accessed_at LIMIT 1'
+            ).fetchone()
+            if row is None:
+                break
+            self._connection.execute('DELETE FROM responses WHERE key = ?', (row[0],))
+            self._total_bytes -= row[1]
+            self.evictions += 1
+
+    @staticmethod
+    def _compress(content):
+        return zlib.compress(content)
+
+    @staticmethod
+    def _to_response(url, headers, body):
+        http_response = requests.Response()
+        http_response.status_code = 200
+        http_response.url = url
+        http_response.headers = CaseInsensitiveDict(json.loads(headers))
+        http_response.encoding = 'utf-8'
+        http_response._content = zlib.decompress(body)
+        http_response.from_cache = True
+        return http_response
+
+    def clear(self):
+        with self._lock:
+            self._connection.execute('DELETE FROM responses')
+            self._total_bytes = 0
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': self._connection.execute('SELECT COUNT(*) FROM responses').fetchone()[0],
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'revalidations': self.revalidations
+            }
+
+
+def response_cache_from_env():
+    """
+    Returns the response cache configured by THE_MOVIE_DB_CACHE_PATH, or None if it is not configured.
+    """
+    if path := os.getenv('THE_MOVIE_DB_CACHE_PATH'):
+        ttls = {
+            endpoint: float(os.getenv(f'THE_MOVIE_DB_CACHE_{endpoint.upper()}_TTL', ttl))
+            for endpoint, ttl in DEFAULT_TTLS.items()
+        }
+        logger.debug(f'Using a persistent response cache at {path}')
+        return SQLiteResponseCache(path=path, ttls=ttls)
+    return None
@@ -0,0 +1,54 @@
+import threading
+from concurrent.futures import Future, wait
+
+from mr_knowledge_bot.bot.clients.deadline import Deadline, DeadlineExceeded
+
+
+class SingleFlight:
+    """
+    Lets concurrent identical calls share one outstanding call.
+
+    The first caller of a key (the leader) executes the call, callers with the same key that arrive while it is
+    still running wait for it and receive its result (or its exception). Once the call is done the next caller
+    of that key executes a new call. A caller that waits for the call of another caller is bounded by its own
+    deadline (see Deadline).
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}  # key -> Future of the outstanding call.
+        self.calls = 0
+        self.shared_calls = 0
+
+    def do(self, key, func):
+        with self._lock:
+            if (call := self._calls.get(key)) is not None:
+                self.shared_calls += 1
+                is_leader = False
+            else:
+                call = self._calls[key] = Future()
+                self.calls += 1
+                is_leader = True
+
+        if not is_leader:
+            deadline = Deadline.current()
+            if deadline is not None and not wait([call], timeout=deadline.timeout()).done:
+                raise DeadlineExceeded(
+                    f'The deadline of {deadline.seconds} seconds was exceeded while waiting for an identical call'
+                )
+            return call.result()
+
+        try:
+            result = func()
+        except BaseException as e:
+            call.set_exception(e)
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def stats(self):
+        with self._lock:
+            return {'in_flight': len(self._calls), 'calls': self.calls, 'shared_calls': self.shared_calls}
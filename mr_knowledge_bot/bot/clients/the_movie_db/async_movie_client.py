@@ -0,0 +1,49 @@
+from abc import ABC
+from mr_knowledge_bot.bot.clients.base_client import async_parse_http_response
+from mr_knowledge_bot.bot.clients.the_movie_db.async_movie_db_base_client import AsyncTheMovieDBBaseClient
+from mr_knowledge_bot.bot.clients.the_movie_db.movie_db_base_client import (
+    async_poll_by_page_and_limit, cache_entity, cache_results
+)
+from mr_knowledge_bot.bot.entites.the_movie_db.movie_entity import TheMovieDBMovieEntity
+
+
+class AsyncTheMovieDBMovieClient(AsyncTheMovieDBBaseClient, ABC):
+
+    media_type = 'movie'
+    movie_entity = TheMovieDBMovieEntity
+
+    @cache_results(endpoint='search')
+    @async_poll_by_page_and_limit()
+    @async_parse_http_response(_class_type=movie_entity)
+    async def search(self, **kwargs):
+        """
+        Searches for movies with a specific name.
+
+        Keyword Arguments:
+            movie_name (str): the movie name. (required)
+            page (int): which page should be queried. (optional)
+        """
+        if movie_name := kwargs.get('movie_name'):
+            params = {'query': movie_name}
+            if page := kwargs.get('page'):
+                params['page'] = page
+            return await self.get(url='/search/movie', params=params)
+        raise ValueError('The "movie_name" argument must be provided')
+
+    @cache_results(endpoint='discover')
+    @async_poll_by_page_and_limit()
+    @async_parse_http_response(_class_type=movie_entity)
+    async def discover(self, **kwargs):
+        return await self.get(url='/discover/movie', params=kwargs)
+
+    @async_parse_http_response(_class_type=AsyncTheMovieDBBaseClient.genre_entity)
+    async def get_genres(self):
+        return await self.get(url='/genre/movie/list')
+
+    async def get_videos(self, _id, _type='movie', language=None):
+        return await super().get_videos(_id=_id, _type=_type, language=language)
+
+    @cache_entity(endpoint='details')
+    @async_parse_http_response(_class_type=movie_entity)
+    async def get_details(self, _id, _type='movie', language=None):
+        return await super().get_details(_id=_id, _type=_type, language=language)
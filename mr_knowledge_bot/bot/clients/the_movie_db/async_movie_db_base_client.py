@@ -0,0 +1,142 @@
+import os
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+
+from mr_knowledge_bot.bot.clients.base_client import AsyncBaseClient, async_parse_http_response
+from mr_knowledge_bot.bot.clients.http_session import get_async_session
+from mr_knowledge_bot.bot.clients.deadline import Deadline, DeadlineExceeded
+from mr_knowledge_bot.bot.clients.rate_limiter import retry_after_delay
+from mr_knowledge_bot.bot.clients.response_cache import response_cache_key, conditional_headers
+from mr_knowledge_bot.bot.clients.the_movie_db.movie_db_base_client import (
+    TheMovieDBBaseClient, cache_entity, async_serve_stale_on_failure, is_server_error, details_params,
+    MAX_RETRIES
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncTheMovieDBBaseClient(AsyncBaseClient, ABC):
+    """
+    The asynchronous version of TheMovieDBBaseClient, returns the same entities and shares the same caches.
+    """
+    BASE_URL = TheMovieDBBaseClient.BASE_URL
+    media_type = None
+    genre_entity = TheMovieDBBaseClient.genre_entity
+    video_entity = TheMovieDBBaseClient.video_entity
+    entity_cache = TheMovieDBBaseClient.entity_cache
+    results_cache = TheMovieDBBaseClient.results_cache
+    rate_limiter = TheMovieDBBaseClient.rate_limiter
+    response_cache = TheMovieDBBaseClient.response_cache
+    circuit_breaker = TheMovieDBBaseClient.circuit_breaker
+    stale_refresher = TheMovieDBBaseClient.stale_refresher
+    hedger = TheMovieDBBaseClient.hedger
+
+    def __init__(self, token=None, base_url=None, verify=True):
+        super().__init__(
+            token=token or os.getenv('THE_MOVIE_DB_API_TOKEN'), base_url=base_url or self.BASE_URL, verify=verify
+        )
+
+    @property
+    def session(self):
+        # all the asynchronous clients share the same aiohttp connection pool.
+        return get_async_session()
+
+    async def get(self, url, params=None):
+        params = {**(params or {}), 'api_key': self.token}
+        if self.response_cache is None:
+            return await self._send(url=url, params=params)
+
+        cache_key = response_cache_key(url, params)
+        cached_response, fresh = self.response_cache.lookup(cache_key)
+        if fresh:
+            return cached_response
+
+        async def revalidate():
+            http_response = await self._send(
+                url=url, params=params, headers=conditional_headers(cached_response) if cached_response else None
+            )
+            if http_response.status_code == 304 and cached_response is not None:
+                self.response_cache.refresh(cache_key, url=url)
+                return cached_response
+            if http_response.status_code == 200:
+                self.response_cache.set(cache_key, url=url, http_response=http_response)
+            return http_response
+
+        return await async_serve_stale_on_failure(
+            self, key=cache_key, fetch=revalidate, get_stale=lambda: cached_response
+        )
+
+    async def _send(self, url, params, headers=None):
+        deadline = Deadline.current()
+
+        async def request():
+            timeout = deadline.timeout() if deadline else None
+            try:
+                return await self.session.request(
+                    'GET', f'{self.base_url}{url}', params=params, headers=headers, timeout=timeout,
+                    verify=self.verify
+                )
+            except asyncio.TimeoutError as error:
+                if deadline and deadline.expired:
+                    raise DeadlineExceeded(f'The deadline was exceeded while querying {url}') from error
+                raise
+
+        async def hedge():
+            await self.rate_limiter.async_acquire()
+            return await request()
+
+        for attempt in range(MAX_RETRIES + 1):
+            await self.rate_limiter.async_acquire()
+            http_response = await self.circuit_breaker.async_call(
+                lambda: self.hedger.async_call(request, hedge_func=hedge), is_failure=is_server_error
+            )
+            if http_response.status_code != 429 or attempt == MAX_RETRIES:
+                return http_response
+            delay = retry_after_delay(http_response, attempt=attempt)
+            if deadline and delay >= deadline.remaining():
+                raise DeadlineExceeded(f'Rate limited by the api on {url}, the deadline does not allow to retry')
+            logger.warning(f'Rate limited by the api on {url}, retrying in {delay:.2f} seconds')
+            self.rate_limiter.pause(delay)
+
+    async def get_videos(self, _id, _type, language=None):
+        """
+        Returns the videos of a movie/tv-show, they are part of the (cached) details of the entity.
+        """
+        if _type not in ('movie', 'tv'):
+            raise ValueError(f'{_type} can be only "movie" or "tv"')
+        if (videos := (await self.get_details(_id=_id, _type=_type, language=language)).videos) is not None:
+            return videos
+        return await self._get_videos(_id=_id, _type=_type, language=language)
+
+    @cache_entity(endpoint='videos')
+    @async_parse_http_response(_class_type=video_entity)
+    async def _get_videos(self, _id, _type, language=None):
+        return await self.get(url=f'/{_type}/{_id}/videos', params={'language': language} if language else None)
+
+    async def get_details(self, _id, _type, language=None):
+        """
+        Returns the raw details response, subclasses parse (and cache) it with their own entity.
+        """
+        if _type not in ('movie', 'tv'):
+            raise ValueError(f'{_type} can be only "movie" or "tv"')
+        return await self.get(url=f'/{_type}/{_id}', params=details_params(language))
+
+    async def get_many_details(self, ids, language=None):
+        """
+        Queries the details of several ids as concurrent tasks, keeps the order of the ids.
+        """
+        return await asyncio.gather(*(self.get_details(_id=_id, language=language) for _id in ids))
+
+    @abstractmethod
+    async def search(self, **kwargs):
+        pass
+
+    @abstractmethod
+    async def get_genres(self):
+        pass
+
+    @abstractmethod
+    async def discover(self, **kwargs):
+        pass
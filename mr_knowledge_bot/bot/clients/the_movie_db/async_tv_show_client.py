@@ -0,0 +1,49 @@
+from abc import ABC
+from mr_knowledge_bot.bot.clients.base_client import async_parse_http_response
+from mr_knowledge_bot.bot.clients.the_movie_db.async_movie_db_base_client import AsyncTheMovieDBBaseClient
+from mr_knowledge_bot.bot.clients.the_movie_db.movie_db_base_client import (
+    async_poll_by_page_and_limit, cache_entity, cache_results
+)
+from mr_knowledge_bot.bot.entites.the_movie_db.tv_show_entity import TheMovieDBTVShowEntity
+
+
+class AsyncTheMovieDBTVShowsClient(AsyncTheMovieDBBaseClient, ABC):
+
+    media_type = 'tv'
+    tv_show_entity = TheMovieDBTVShowEntity
+
+    @cache_results(endpoint='search')
+    @async_poll_by_page_and_limit()
+    @async_parse_http_response(_class_type=tv_show_entity)
+    async def search(self, **kwargs):
+        """
+        Searches for tv-shows with a specific name.
+
+        Keyword Arguments:
+            tv_show_name (str): the TV-show name. (required)
+            page (int): which page should be queried. (optional)
+        """
+        if tv_show_name := kwargs.get('tv_show_name'):
+            params = {'query': tv_show_name}
+            if page := kwargs.get('page'):
+                params['page'] = page
+            return await self.get(url='/search/tv', params=params)
+        raise ValueError('The "tv_show_name" argument must be provided')
+
+    @cache_results(endpoint='discover')
+    @async_poll_by_page_and_limit()
+    @async_parse_http_response(_class_type=tv_show_entity)
+    async def discover(self, **kwargs):
+        return await self.get(url='/discover/tv', params=kwargs)
+
+    @async_parse_http_response(_class_type=AsyncTheMovieDBBaseClient.genre_entity)
+    async def get_genres(self):
+        return await self.get(url='/genre/tv/list')
+
+    @cache_entity(endpoint='details')
+    @async_parse_http_response(_class_type=tv_show_entity)
+    async def get_details(self, _id, _type='tv', language=None):
+        return await super().get_details(_id=_id, _type=_type, language=language)
+
+    async def get_videos(self, _id, _type='tv', language=None):
+        return await super().get_videos(_id=_id, _type=_type, language=language)
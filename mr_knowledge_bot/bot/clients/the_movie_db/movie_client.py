@@ -1,13 +1,17 @@
 from abc import ABC
 from mr_knowledge_bot.bot.clients.base_client import parse_http_response
-from mr_knowledge_bot.bot.clients.the_movie_db.movie_db_base_client import TheMovieDBBaseClient, poll_by_page_and_limit
+from mr_knowledge_bot.bot.clients.the_movie_db.movie_db_base_client import (
+    TheMovieDBBaseClient, poll_by_page_and_limit, cache_entity, cache_results
+)
 from mr_knowledge_bot.bot.entites.the_movie_db.movie_entity import TheMovieDBMovieEntity
 
 
 class TheMovieDBMovieClient(TheMovieDBBaseClient, ABC):
 
+    media_type = 'movie'
     movie_entity = TheMovieDBMovieEntity
 
+    @cache_results(endpoint='search')
     @poll_by_page_and_limit()
     @parse_http_response(_class_type=movie_entity)
     def search(self, **kwargs):
@@ -25,6 +29,7 @@ class TheMovieDBMovieClient(TheMovieDBBaseClient, ABC):
             return self.get(url='/search/movie', params=params)
         raise ValueError('The "movie_name" argument must be provided')
 
+    @cache_results(endpoint='discover')
     @poll_by_page_and_limit()
     @parse_http_response(_class_type=movie_entity)
     def discover(self, **kwargs):
@@ -37,9 +42,10 @@ class TheMovieDBMovieClient(TheMovieDBBaseClient, ABC):
     def get_genres(self):
         return self.get(url='/genre/movie/list')
 
-    def get_videos(self, _id, _type='movie'):
-        return super().get_videos(_id=_id, _type=_type)
+    def get_videos(self, _id, _type='movie', language=None):
+        return super().get_videos(_id=_id, _type=_type, language=language)
 
+    @cache_entity(endpoint='details')
     @parse_http_response(_class_type=movie_entity)
-    def get_details(self, _id, _type='movie'):
-        return super().get_details(_id=_id, _type=_type)
+    def get_details(self, _id, _type='movie', language=None):
+        return super().get_details(_id=_id, _type=_type, language=language)
@@ -1,61 +1,614 @@
 import os
+import math
+import logging
+import asyncio
+import functools
+import inspect
+import contextvars
 import requests
 from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 from mr_knowledge_bot.bot.clients.base_client import BaseClient
+from mr_knowledge_bot.bot.clients.cache import TTLCache
+from mr_knowledge_bot.bot.clients.deadline import Deadline, DeadlineExceeded
+from mr_knowledge_bot.bot.clients.circuit_breaker import CircuitBreaker, BackgroundRefresher, UNAVAILABLE_ERRORS
+from mr_knowledge_bot.bot.clients.hedging import Hedger
+from mr_knowledge_bot.bot.clients.http_session import get_session
+from mr_knowledge_bot.bot.clients.response_cache import (
+    response_cache_from_env, response_cache_key, conditional_headers
+)
+from mr_knowledge_bot.bot.clients.rate_limiter import TokenBucketRateLimiter, retry_after_delay
+from mr_knowledge_bot.bot.clients.single_flight import SingleFlight
 from mr_knowledge_bot.bot.entites.the_movie_db.genre_entity import GenreEntity
 from mr_knowledge_bot.bot.entites.the_movie_db.video_entity import VideoEntity
 from mr_knowledge_bot.bot.clients.base_client import parse_http_response
 
 
-def poll_by_page_and_limit(limit=500):
+MAX_PAGES = 500  # the api does not return pages after this one.
+PAGE_SIZE = 20  # records per page of the api.
+MAX_RECORDS = 500
+MAX_WORKERS = int(os.getenv('THE_MOVIE_DB_MAX_WORKERS', 8))
+ENTITY_CACHE_SIZE = int(os.getenv('THE_MOVIE_DB_ENTITY_CACHE_SIZE', 10000))
+ENTITY_CACHE_TTLS = {
+    'details': float(os.getenv('THE_MOVIE_DB_DETAILS_CACHE_TTL', 60 * 60 * 6)),
+    'videos': float(os.getenv('THE_MOVIE_DB_VIDEOS_CACHE_TTL', 60 * 60 * 12))
+}
+RESULTS_CACHE_SIZE = int(os.getenv('THE_MOVIE_DB_RESULTS_CACHE_SIZE', 1024))
+RESULTS_CACHE_TTL = float(os.getenv('THE_MOVIE_DB_RESULTS_CACHE_TTL', 60 * 10))
+RATE_LIMIT = float(os.getenv('THE_MOVIE_DB_RATE_LIMIT', 40))  # requests per second.
+RATE_LIMIT_BURST = int(os.getenv('THE_MOVIE_DB_RATE_LIMIT_BURST', 20))
+MAX_RETRIES = int(os.getenv('THE_MOVIE_DB_MAX_RETRIES', 3))  # of rate limited requests.
+# sub-resources that are queried within the details request, so later stages don't need another request.
+DETAILS_APPENDED_RESOURCES = ('videos',)
+
+
+logger = logging.getLogger(__name__)
+
+
+class PageIterator:
     """
+    Lazily iterates over the records of a paginated api endpoint.
+
+    The first wave (first_pages, one page by default) is queried to find out the "total_pages", after that the
+    pages are fetched in waves of at most max_workers concurrent pages. The size of each wave is estimated by how
+    many records are still wanted and how many records (that survived the filters of the entity) each page brought
+    so far, so no page is queried once there are enough records. Records keep the order of the pages and records
+    with an id that was already seen are dropped. If the deadline of the command (see Deadline) is exceeded the
+    iteration stops with the records of the pages that were already fetched.
+
     Args:
-        limit (int): the maximum number of records to query from the api.
+        fetch_page (Callable): a function that gets a page number and returns the entities of that page.
+        limit (int): the maximum number of records to return.
+        max_workers (int): the maximum number of pages to query at the same time.
+    """
+    def __init__(self, fetch_page, limit=MAX_RECORDS, max_workers=MAX_WORKERS):
+        self._fetch_page = fetch_page
+        self.limit = limit
+        self.max_workers = max_workers
+        self.wanted = None  # how many more records are needed, if not set the remainder of the limit is used.
+        self.first_pages = 1  # how many pages the first wave queries, before the number of pages is known.
+        self.estimated_pages = None  # how many pages a plan estimated for the query, bounds the waves up to them.
+        self.total_pages = None
+        self.total_results = None
+        self.fetched_pages = 0
+        self.returned_records = 0
+        self.deadline_exceeded = False
+        self._collected_records = 0
+        self._next_page = 1
+        self._records = deque()
+        self._seen_ids = set()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.returned_records >= self.limit:
+            raise StopIteration
+        while not self._records:
+            if not self._fetch_next_pages():
+                raise StopIteration
+        self.returned_records += 1
+        return self._records.popleft()
+
+    def prefetch(self):
+        """
+        Queries the first wave of pages (if it was not queried yet), so total_pages and total_results are known
+        before the records are consumed.
+        """
+        if self.total_pages is None and not self.exhausted:
+            self._fetch_next_pages()
+        return self
+
+    @property
+    def exhausted(self):
+        return self.deadline_exceeded or (self.total_pages is not None and self._next_page > self.total_pages)
+
+    def _pages_to_fetch(self):
+        if self.total_pages is None:
+            return range(1, min(self.first_pages, self.max_workers) + 1)
+
+        wanted = self.wanted if self.wanted is not None else self.limit - self.returned_records
+        records_per_page = max(self._collected_records / self.fetched_pages, 1)
+        needed_pages = max(math.ceil(wanted / records_per_page), 1)
+        if self.estimated_pages is not None and self._next_page <= self.estimated_pages:
+            # the waves don't go past the estimated pages, the pages after them are queried only if they were too few.
+            needed_pages = min(needed_pages, self.estimated_pages - self._next_page + 1)
+        return range(
+            self._next_page, min(self._next_page + min(needed_pages, self.max_workers), self.total_pages + 1)
+        )
+
+    def _fetch_next_pages(self):
+        if self.exhausted:
+            return False
+
+        pages = self._pages_to_fetch()
+        objects_by_pages, deadline_error = [], None
+        try:
+            if len(pages) == 1:
+                objects_by_pages.append(self._fetch_page(pages.start))
+            else:
+                with ThreadPoolExecutor(max_workers=len(pages)) as executor:
+                    # the pages are queried in the context of the caller, so they share its deadline.
+                    futures = [
+                        executor.submit(contextvars.copy_context().run, self._fetch_page, page) for page in pages
+                    ]
+                    for future in futures:  # keeps the pages order
+                        objects_by_pages.append(future.result())
+        except DeadlineExceeded as error:
+            deadline_error = error
+
+        # the pages that were fetched before the deadline was exceeded are kept as partial results.
+        if objects_by_pages:
+            self._collect(range(pages.start, pages.start + len(objects_by_pages)), objects_by_pages)
+        if deadline_error is not None:
+            self._stop_on_deadline(deadline_error)
+        return bool(objects_by_pages)
+
+    def _stop_on_deadline(self, error):
+        if self.fetched_pages == 0 and not self._records:
+            raise error  # there are no partial results to return.
+        logger.warning(f'The deadline was exceeded after {self.fetched_pages} pages, returning partial results')
+        self.deadline_exceeded = True
+
+    def _collect(self, pages, objects_by_pages):
+        if self.total_pages is None:
+            self.total_pages = min(getattr(objects_by_pages[0], 'total_pages', None) or 1, MAX_PAGES)
+            self.total_results = getattr(objects_by_pages[0], 'total_results', None)
+
+        for current_objects_by_page in objects_by_pages:
+            for _object in current_objects_by_page:
+                if _object.id not in self._seen_ids:
+                    self._seen_ids.add(_object.id)
+                    self._records.append(_object)
+                    self._collected_records += 1
+
+        self._next_page, self.fetched_pages = pages.stop, self.fetched_pages + len(pages)
+
+
+class AsyncPageIterator(PageIterator):
+    """
+    The asynchronous version of PageIterator, fetch_page is a coroutine function and each wave of pages is
+    queried as concurrent tasks.
+    """
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.returned_records >= self.limit:
+            raise StopAsyncIteration
+        while not self._records:
+            if not await self._fetch_next_pages():
+                raise StopAsyncIteration
+        self.returned_records += 1
+        return self._records.popleft()
+
+    async def prefetch(self):
+        if self.total_pages is None and not self.exhausted:
+            await self._fetch_next_pages()
+        return self
+
+    async def _fetch_next_pages(self):
+        if self.exhausted:
+            return False
+
+        pages = self._pages_to_fetch()
+        objects_by_pages, deadline_error = [], None
+        for page_objects in await asyncio.gather(*(self._fetch_page(page) for page in pages), return_exceptions=True):
+            if isinstance(page_objects, DeadlineExceeded):
+                deadline_error = page_objects
+                break
+            if isinstance(page_objects, BaseException):
+                raise page_objects
+            objects_by_pages.append(page_objects)
+
+        if objects_by_pages:
+            self._collect(range(pages.start, pages.start + len(objects_by_pages)), objects_by_pages)
+        if deadline_error is not None:
+            self._stop_on_deadline(deadline_error)
+        return bool(objects_by_pages)
+
+
+def serve_stale_on_failure(client, key, fetch, get_stale):
+    """
+    Calls fetch, if the api is unavailable (or the circuit breaker is open) serves the stale cached value instead
+    and refreshes it in the background. Fails only if there is no cached value.
+
+    Args:
+        client (TheMovieDBBaseClient): the client that fetches the value.
+        key (Hashable): the cache key of the value, a key is refreshed by one background task at a time.
+        fetch (Callable): queries (and caches) the value.
+        get_stale (Callable): returns the cached value even if it has expired, None if there is no such value.
+    """
+    try:
+        return fetch()
+    except UNAVAILABLE_ERRORS as error:
+        if (stale := get_stale()) is None:
+            raise
+        logger.warning(f'Serving a stale value of {key}, error: {error}')
+        client.circuit_breaker.record_stale_serve()
+        client.stale_refresher.submit(key, fetch)
+        return stale
+
+
+async def async_serve_stale_on_failure(client, key, fetch, get_stale):
+    """
+    The asynchronous version of serve_stale_on_failure, fetch is a coroutine function.
+    """
+    try:
+        return await fetch()
+    except UNAVAILABLE_ERRORS as error:
+        if (stale := get_stale()) is None:
+            raise
+        logger.warning(f'Serving a stale value of {key}, error: {error}')
+        client.circuit_breaker.record_stale_serve()
+        client.stale_refresher.submit_async(key, fetch)
+        return stale
+
+
+def cache_entity(endpoint):
     """
+    Caches the entity returned by the decorated function in the entity cache that is shared by all the clients.
+
+    The cache key is made of the endpoint, the media type, the id and the language of the entity. If the api
+    is unavailable an expired entity is served (see serve_stale_on_failure).
+    Can decorate both functions and coroutine functions.
+
+    Args:
+        endpoint (str): the endpoint of the entity, one of the keys of ENTITY_CACHE_TTLS.
+    """
+    ttl = ENTITY_CACHE_TTLS[endpoint]
+
     def decorator(func):
+        signature = inspect.signature(func)
+
+        def cache_key(self, *args, **kwargs):
+            arguments = signature.bind(self, *args, **kwargs)
+            arguments.apply_defaults()
+            return (
+                endpoint, arguments.arguments['_type'], str(arguments.arguments['_id']),
+                arguments.arguments.get('language')
+            )
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(self, *args, **kwargs):
+                key = cache_key(self, *args, **kwargs)
+                if (entity := self.entity_cache.get(key)) is not None:
+                    return entity
+
+                async def fetch():
+                    _entity = await func(self, *args, **kwargs)
+                    self.entity_cache.set(key, _entity, ttl=ttl)
+                    return _entity
+
+                return await async_serve_stale_on_failure(
+                    self, key=key, fetch=fetch, get_stale=lambda: self.entity_cache.get_stale(key)
+                )
+
+            return async_wrapper
+
+        @functools.wraps(func)
         def wrapper(self, *args, **kwargs):
-            objects, page = [], 1
-            kwargs['page'] = page
+            key = cache_key(self, *args, **kwargs)
+            if (entity := self.entity_cache.get(key)) is not None:
+                return entity
+
+            def fetch():
+                _entity = func(self, *args, **kwargs)
+                self.entity_cache.set(key, _entity, ttl=ttl)
+                return _entity
+
+            return serve_stale_on_failure(
+                self, key=key, fetch=fetch, get_stale=lambda: self.entity_cache.get_stale(key)
+            )
+
+        return wrapper
+    return decorator
+
+
+def canonical_query(query: dict):
+    """
+    Returns a hashable canonical form of query parameters, so equivalent queries share the same cache key.
+
+    Strings are folded to lower case with collapsed whitespaces, lists (such as genre ids) are sorted and the
+    parameters are sorted by their names. Pagination parameters and empty values are not part of the query.
+    """
+    canonical = []
+    for name, value in query.items():
+        if name in ('page', 'limit') or value is None:
+            continue
+        if isinstance(value, str):
+            value = ' '.join(value.split()).casefold()
+        elif isinstance(value, (list, tuple, set)):
+            value = tuple(sorted(value))
+        canonical.append((name, value))
+    return tuple(sorted(canonical))
+
+
+def get_cached_results(client, key, limit, stale=False):
+    """
+    Returns the cached entities of a query if the cache can serve the limit, otherwise None.
+
+    Args:
+        stale (bool): whether expired results can be returned.
+    """
+    get = client.results_cache.get_stale if stale else client.results_cache.get
+    get_entity = client.entity_cache.get_stale if stale else client.entity_cache.get
+    if (cached_results := get(key)) is not None:
+        ids, exhausted = cached_results
+        if exhausted or len(ids) >= limit:
+            entities = [get_entity(('summary', client.media_type, _id, None)) for _id in ids[:limit]]
+            if None not in entities:  # some of the entities might have been evicted already.
+                return entities
+    return None
+
+
+def set_cached_results(client, key, limit, entities):
+    if (deadline := Deadline.current()) is not None and deadline.expired:
+        return  # the pagination was cut by the deadline, the results might be partial.
+    for entity in entities:
+        client.entity_cache.set(('summary', client.media_type, str(entity.id), None), entity, ttl=RESULTS_CACHE_TTL)
+    client.results_cache.set(
+        key, ([str(entity.id) for entity in entities], len(entities) < limit), ttl=RESULTS_CACHE_TTL
+    )
+
+
+def cache_results(endpoint):
+    """
+    Caches the results of a paginated query (search/discover) by the canonical form of its parameters.
+
+    Only the ids of the records are kept in the results cache, the entities themselves are kept in the entity
+    cache and are rehydrated from it. A cached query can serve any limit up to the number of ids it holds, or
+    any limit at all if the api had no more records for it. If the api is unavailable expired results are served
+    (see serve_stale_on_failure). Lazy queries are not cached.
+    Can decorate both functions and coroutine functions.
+
+    Args:
+        endpoint (str): the endpoint of the query, e.g. search/discover.
+    """
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(self, *args, lazy=False, **kwargs):
+                if lazy:
+                    return await func(self, *args, lazy=lazy, **kwargs)
+
+                limit = min(kwargs.get('limit') or MAX_RECORDS, MAX_RECORDS)
+                key = (endpoint, self.media_type, canonical_query(kwargs))
+                if (entities := get_cached_results(self, key, limit)) is not None:
+                    return entities
+
+                async def fetch():
+                    _entities = await func(self, *args, **kwargs)
+                    set_cached_results(self, key, limit, _entities)
+                    return _entities
+
+                return await async_serve_stale_on_failure(
+                    self, key=key, fetch=fetch, get_stale=lambda: get_cached_results(self, key, limit, stale=True)
+                )
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(self, *args, lazy=False, **kwargs):
+            if lazy:
+                return func(self, *args, lazy=lazy, **kwargs)
+
+            limit = min(kwargs.get('limit') or MAX_RECORDS, MAX_RECORDS)
+            key = (endpoint, self.media_type, canonical_query(kwargs))
+            if (entities := get_cached_results(self, key, limit)) is not None:
+                return entities
+
+            def fetch():
+                _entities = func(self, *args, **kwargs)
+                set_cached_results(self, key, limit, _entities)
+                return _entities
+
+            return serve_stale_on_failure(
+                self, key=key, fetch=fetch, get_stale=lambda: get_cached_results(self, key, limit, stale=True)
+            )
+
+        return wrapper
+    return decorator
+
+
+def max_limit(limit, lazy):
+    """
+    Returns the maximum number of records a paginated query can ask for. A lazy query queries pages only while its
+    consumer wants more records, so it is bounded by the records the api paginates at all instead of the limit of
+    the decorator.
+    """
+    return MAX_PAGES * PAGE_SIZE if lazy else limit
+
+
+def poll_by_page_and_limit(limit=MAX_RECORDS, max_workers=MAX_WORKERS):
+    """
+    Queries the api page by page (see PageIterator) until there are enough records.
+
+    The decorated function accepts two additional keyword arguments:
+        limit (int): how many records the caller needs, can't exceed the limit of the decorator (or the records the
+            api paginates at all, for lazy queries, see max_limit).
+        lazy (bool): whether to return a lazy PageIterator instead of a list.
+
+    Args:
+        limit (int): the maximum number of records to query from the api.
+        max_workers (int): the maximum number of pages to query at the same time.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, lazy=False, **kwargs):
+            requested_limit = kwargs.pop('limit', None)
+
+            def fetch_page(page):
+                return func(self, *args, **{**kwargs, 'page': page})
 
-            while current_objects_by_page := func(self, *args, **kwargs):
-                objects.extend(current_objects_by_page)
-                if len(objects) > limit:
-                    break
-                page += 1
-                kwargs['page'] = page
-            return objects[:limit]
+            pages = PageIterator(
+                fetch_page=fetch_page,
+                limit=min(requested_limit or limit, max_limit(limit, lazy)),
+                max_workers=max_workers
+            )
+            return pages if lazy else list(pages)
 
         return wrapper
     return decorator
 
 
+def async_poll_by_page_and_limit(limit=MAX_RECORDS, max_workers=MAX_WORKERS):
+    """
+    The asynchronous version of poll_by_page_and_limit (see AsyncPageIterator), the lazy keyword argument
+    returns the AsyncPageIterator itself instead of awaiting all the records.
+
+    Args:
+        limit (int): the maximum number of records to query from the api.
+        max_workers (int): the maximum number of pages to query at the same time.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, *args, lazy=False, **kwargs):
+            requested_limit = kwargs.pop('limit', None)
+
+            async def fetch_page(page):
+                return await func(self, *args, **{**kwargs, 'page': page})
+
+            pages = AsyncPageIterator(
+                fetch_page=fetch_page,
+                limit=min(requested_limit or limit, max_limit(limit, lazy)),
+                max_workers=max_workers
+            )
+            return pages if lazy else [_object async for _object in pages]
+
+        return wrapper
+    return decorator
+
+
+def details_params(language=None):
+    params = {'append_to_response': ','.join(DETAILS_APPENDED_RESOURCES)}
+    if language:
+        params['language'] = language
+    return params
+
+
+def is_server_error(http_response):
+    return http_response.status_code >= 500
+
+
 class TheMovieDBBaseClient(BaseClient, ABC):
     BASE_URL = os.getenv('THE_MOVIE_DB_BASE_URL')
     genre_entity = GenreEntity
     video_entity = VideoEntity
+    media_type = None
+    entity_cache = TTLCache(max_size=ENTITY_CACHE_SIZE)  # shared by all the clients of the process.
+    results_cache = TTLCache(max_size=RESULTS_CACHE_SIZE)
+    single_flight = SingleFlight()
+    rate_limiter = TokenBucketRateLimiter(rate=RATE_LIMIT, burst=RATE_LIMIT_BURST)
+    response_cache = response_cache_from_env()  # an optional persistent cache of the raw responses.
+    circuit_breaker = CircuitBreaker()
+    stale_refresher = BackgroundRefresher(circuit_breaker=circuit_breaker)
+    hedger = Hedger()  # optional, see THE_MOVIE_DB_HEDGING.
 
     def __init__(self, token=None, base_url=None, verify=True):
         super().__init__(
             token=token or os.getenv('THE_MOVIE_DB_API_TOKEN'), base_url=base_url or self.BASE_URL, verify=verify
         )
 
+    @property
+    def session(self):
+        # all the clients share the same pooled keep-alive session.
+        return get_session()
+
     def get(self, url, params=None):
-        if not params:
-            params = {}
-        params.update({'api_key': self.token})
-        return requests.request('GET', f'{self.base_url}{url}', params=params, verify=self.verify)
+        params = {**(params or {}), 'api_key': self.token}
+        # concurrent identical requests share one outstanding request and its response.
+        request_key = (
+            f'{self.base_url}{url}',
+            tuple(sorted((name, tuple(value) if isinstance(value, list) else value) for name, value in params.items()))
+        )
+        return self.single_flight.do(request_key, lambda: self._get(url=url, params=params))
 
-    @parse_http_response(_class_type=video_entity)
-    def get_videos(self, _id, _type):
+    def _get(self, url, params):
+        if self.response_cache is None:
+            return self._send(url=url, params=params)
+
+        cache_key = response_cache_key(url, params)
+        cached_response, fresh = self.response_cache.lookup(cache_key)
+        if fresh:
+            return cached_response
+
+        def revalidate():
+            # an expired response is revalidated, if it was not modified the api answers with an empty 304.
+            http_response = self._send(
+                url=url, params=params, headers=conditional_headers(cached_response) if cached_response else None
+            )
+            if http_response.status_code == 304 and cached_response is not None:
+                self.response_cache.refresh(cache_key, url=url)
+                return cached_response
+            if http_response.status_code == 200:
+                self.response_cache.set(cache_key, url=url, http_response=http_response)
+            return http_response
+
+        return serve_stale_on_failure(self, key=cache_key, fetch=revalidate, get_stale=lambda: cached_response)
+
+    def _send(self, url, params, headers=None):
+        deadline = Deadline.current()
+
+        def request():
+            # every request gets the remaining budget of the command as its timeout.
+            timeout = deadline.timeout(self.session.timeout) if deadline else None
+            try:
+                return self.session.request(
+                    'GET', f'{self.base_url}{url}', params=params, headers=headers, timeout=timeout,
+                    verify=self.verify
+                )
+            except requests.Timeout as error:
+                if deadline and deadline.expired:
+                    raise DeadlineExceeded(f'The deadline was exceeded while querying {url}') from error
+                raise
+
+        def hedge():
+            # a duplicate of a slow request, it is rate limited like any other request.
+            self.rate_limiter.acquire()
+            return request()
+
+        for attempt in range(MAX_RETRIES + 1):
+            self.rate_limiter.acquire()
+            http_response = self.circuit_breaker.call(
+                lambda: self.hedger.call(request, hedge_func=hedge), is_failure=is_server_error
+            )
+            if http_response.status_code != 429 or attempt == MAX_RETRIES:
+                return http_response
+            # rate limited by the api, hold all the requests of the process and retry.
+            delay = retry_after_delay(http_response, attempt=attempt)
+            if deadline and delay >= deadline.remaining():
+                raise DeadlineExceeded(f'Rate limited by the api on {url}, the deadline does not allow to retry')
+            logger.warning(f'Rate limited by the api on {url}, retrying in {delay:.2f} seconds')
+            self.rate_limiter.pause(delay)
+
+    def get_videos(self, _id, _type, language=None):
+        """
+        Returns the videos of a movie/tv-show, they are part of the (cached) details of the entity.
+        """
         if _type not in ('movie', 'tv'):
             raise ValueError(f'{_type} can be only "movie" or "tv"')
-        return self.get(url=f'/{_type}/{_id}/videos')
+        if (videos := self.get_details(_id=_id, _type=_type, language=language).videos) is not None:
+            return videos
+        return self._get_videos(_id=_id, _type=_type, language=language)
+
+    @cache_entity(endpoint='videos')
+    @parse_http_response(_class_type=video_entity)
+    def _get_videos(self, _id, _type, language=None):
+        return self.get(url=f'/{_type}/{_id}/videos', params={'language': language} if language else None)
+
+    def get_details(self, _id, _type, language=None):
+        """
+        Returns the raw details response, subclasses parse (and cache) it with their own entity.
 
-    def get_details(self, _id, _type):
+        The sub-resources of DETAILS_APPENDED_RESOURCES (e.g. the videos) are part of the response.
+        """
         if _type not in ('movie', 'tv'):
             raise ValueError(f'{_type} can be only "movie" or "tv"')
-        return self.get(url=f'/{_type}/{_id}')
+        return self.get(url=f'/{_type}/{_id}', params=details_params(language))
 
     @abstractmethod
     def search(self, **kwargs):
@@ -1,13 +1,17 @@
 from abc import ABC
 from mr_knowledge_bot.bot.clients.base_client import parse_http_response
-from mr_knowledge_bot.bot.clients.the_movie_db.movie_db_base_client import TheMovieDBBaseClient, poll_by_page_and_limit
+from mr_knowledge_bot.bot.clients.the_movie_db.movie_db_base_client import (
+    TheMovieDBBaseClient, poll_by_page_and_limit, cache_entity, cache_results
+)
 from mr_knowledge_bot.bot.entites.the_movie_db.tv_show_entity import TheMovieDBTVShowEntity
 
 
 class TheMovieDBTVShowsClient(TheMovieDBBaseClient, ABC):
 
+    media_type = 'tv'
     tv_show_entity = TheMovieDBTVShowEntity
 
+    @cache_results(endpoint='search')
     @poll_by_page_and_limit()
     @parse_http_response(_class_type=tv_show_entity)
     def search(self, **kwargs):
@@ -25,6 +29,7 @@ class TheMovieDBTVShowsClient(TheMovieDBBaseClient, ABC):
             return self.get(url='/search/tv', params=params)
         raise ValueError('The "tv_show_name" argument must be provided')
 
+    @cache_results(endpoint='discover')
     @poll_by_page_and_limit()
     @parse_http_response(_class_type=tv_show_entity)
     def discover(self, **kwargs):
@@ -34,9 +39,10 @@ class TheMovieDBTVShowsClient(TheMovieDBBaseClient, ABC):
     def get_genres(self):
         return self.get(url='/genre/tv/list')
 
+    @cache_entity(endpoint='details')
     @parse_http_response(_class_type=tv_show_entity)
-    def get_details(self, _id, _type='tv'):
-        return super().get_details(_id=_id, _type=_type)
+    def get_details(self, _id, _type='tv', language=None):
+        return super().get_details(_id=_id, _type=_type, language=language)
 
-    def get_videos(self, _id, _type='tv'):
-        return super().get_videos(_id, _type)
+    def get_videos(self, _id, _type='tv', language=None):
+        return super().get_videos(_id=_id, _type=_type, language=language)
@@ -2,6 +2,7 @@ from abc import ABC
 from telegram import Update
 from telegram.ext import CallbackContext
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.constants import MAX_MESSAGE_LENGTH
 
 
 class Conversation(ABC):
@@ -37,6 +38,21 @@ class Conversation(ABC):
                   self._update.effective_message or self._update.message.reply_to_message
         return message.message_id
 
+    def reply_with_names(self, title, names):
+        """
+        Replies with a title followed by a name per line, split into as many messages as the length limit of a
+        telegram message requires.
+        """
+        messages, text = [], f'{title}\n'
+        for name in names:
+            if len(text) + len(name) + 1 > MAX_MESSAGE_LENGTH:
+                messages.append(text)
+                text = ''
+            text = f'{text}\n{name}' if text else name
+        messages.append(text)
+        for text in messages:
+            self._update.effective_message.reply_text(text=text, reply_to_message_id=self._update.message.message_id)
+
     @staticmethod
     def get_yes_or_no_keyboard():
         return InlineKeyboardMarkup(
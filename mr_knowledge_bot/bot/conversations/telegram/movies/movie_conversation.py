@@ -77,11 +77,7 @@ class TelegramMovieConversation(Conversation, ABC):
     def display_movies(self, movies):
         if movies:
             self._context.user_data['movies'] = movies  # save the found movies for next stages in the conversation.
-            movie_names = '\n'.join([movie.name for movie in movies])
-            self._update.effective_message.reply_text(
-                text=f'Found the following movies for you 😀\n\n{movie_names}',
-                reply_to_message_id=self._update.message.message_id
-            )
+            self.reply_with_names('Found the following movies for you 😀', [movie.name for movie in movies])
             next_stage = self.yes_or_no_movie_details()
         else:
             self._update.effective_message.reply_text(
@@ -75,11 +75,7 @@ class TelegramTVShowConversation(Conversation, ABC):
     def display_tv_shows(self, tv_shows):
         if tv_shows:
             self._context.user_data['tv_shows'] = tv_shows  # save the found movies for next stages in the conversation.
-            tv_shows_names = '\n'.join([tv_show.name for tv_show in tv_shows])
-            self._update.effective_message.reply_text(
-                text=f'Found the following tv-shows for you 😀\n\n{tv_shows_names}',
-                reply_to_message_id=self._update.message.message_id
-            )
+            self.reply_with_names('Found the following tv-shows for you 😀', [tv_show.name for tv_show in tv_shows])
             next_stage = self.yes_or_no_tv_show_details()
         else:
             self._update.effective_message.reply_text(
@@ -2,6 +2,7 @@ from abc import abstractmethod
 
 
 class BaseEntity:
+    __slots__ = ()
 
     @abstractmethod
     def to_dict(self):
@@ -1,25 +1,142 @@
 from abc import ABC
-from typing import Union
+from typing import Union, NamedTuple, Optional, Callable
 from mr_knowledge_bot.bot.entites.base_entity import BaseEntity
 
 
+class LazyField:
+    """
+    An attribute of an entity that is derived from a raw value of the response (e.g. genres, runtime, seasons).
+
+    Assigning the attribute keeps the raw value (in the "_<name>" slot of the entity), it is decoded on the first
+    access only, list views that read only the names of the entities never pay for it.
+
+    Args:
+        decode (Callable): gets the raw value and returns the value of the attribute.
+    """
+    _count = 0
+
+    def __init__(self, decode):
+        self.decode = decode
+        self.bit = 1 << LazyField._count  # marks in the entity's _decoded whether the raw value was decoded.
+        LazyField._count += 1
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.slot = owner.__dict__[f'_{name}']  # the member descriptor of the "_<name>" slot.
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        if instance._decoded & self.bit:
+            return self.slot.__get__(instance)
+        value = self.decode(self.slot.__get__(instance))
+        self.slot.__set__(instance, value)
+        instance._decoded |= self.bit
+        return value
+
+    def __set__(self, instance, raw_value):
+        self.slot.__set__(instance, raw_value)
+        instance._decoded &= ~self.bit
+
+
+class Field(NamedTuple):
+    """
+    Maps a key of a TMDB response to an attribute of an entity.
+
+    Args:
+        key (str | tuple): the key in the response, a tuple of keys means the first of them that has a value.
+        attribute (str): the attribute of the entity, the key by default.
+        converter (Callable): converts the value of the response, the value is kept as is by default.
+    """
+    key: Union[str, tuple]
+    attribute: Optional[str] = None
+    converter: Optional[Callable] = None
+
+
+def compile_decoder(entity_class):
+    """
+    Generates the function that decodes a single result of a response into an entity by the response_fields of
+    the entity class. The function assigns the attributes directly (without calling __init__) and raw values of
+    LazyFields are kept in their "_<name>" slots.
+    """
+    namespace = {'new': object.__new__, 'entity_class': entity_class}
+    lines = ['def decode(response):', '    entity = new(entity_class)', '    get = response.get']
+    for index, field in enumerate(entity_class.response_fields):
+        keys = field.key if isinstance(field.key, tuple) else (field.key,)
+        value = ' or '.join(f'get({key!r})' for key in keys)
+        if field.converter is not None:
+            namespace[f'convert_{index}'] = field.converter
+            value = f'convert_{index}({value})'
+        attribute = field.attribute or keys[0]
+        if isinstance(getattr(entity_class, attribute, None), LazyField):
+            attribute = f'_{attribute}'
+        lines.append(f'    entity.{attribute} = {value}')
+    lines += ['    entity._decoded = 0', '    return entity']
+    exec('\n'.join(lines), namespace)
+    return namespace['decode']
+
+
 class TheMovieDBBaseEntity(BaseEntity, ABC):
+    """
+    The base of the TMDB entities.
+
+    Entities are slotted (no per-instance __dict__), since many of them are kept per conversation. Every subclass
+    declares its own attributes in __slots__, a LazyField is declared by a "_<name>" slot. _fields holds the
+    (public) attributes of the whole class hierarchy.
+
+    Every entity declares how it is decoded from a response by its response_fields (see Field), the decoder is
+    generated once per class (see compile_decoder) and serves both single responses and lists of results.
+    """
+    __slots__ = ('id', 'name', '_decoded')
+    _fields = ('id', 'name')
+    response_fields = (Field('id'), Field('name'))
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._fields = tuple(
+            slot.lstrip('_') for klass in reversed(cls.__mro__) for slot in klass.__dict__.get('__slots__', ())
+            if not slot.startswith('_') or isinstance(getattr(cls, slot.lstrip('_'), None), LazyField)
+        )
+        cls.decode = staticmethod(compile_decoder(cls))
 
     def __init__(self, _id, name):
         self.id = _id
         self.name = name
+        self._decoded = 0  # no LazyField was decoded yet, subclasses keep their raw values in the "_<name>" slots.
 
     def to_dict(self):
-        return self.__dict__
+        return {
+            attr_name: [
+                value.to_dict() if isinstance(value, BaseEntity) else value for value in attr_value
+            ] if isinstance(attr_value, list) else attr_value
+            for attr_name, attr_value in ((field, getattr(self, field, None)) for field in self._fields)
+        }
 
     @classmethod
     def from_response(cls, response: Union[dict, list]):
         if isinstance(response, dict):
-            return cls(_id=response.get('id'), name=response.get('name'))
-        return [
-            cls(_id=result.get('id'), name=result.get('name')) for result in response
-        ]
+            return cls.decode(response)
+        return list(map(cls.decode, response))
 
     def __str__(self):
         return ", ".join([f'{attr_name}={attr_value}' for attr_name, attr_value in self.to_dict().items()])
 
+
+class TheMovieDBResults(list):
+    """
+    A list of entities of a single page from the api, keeps the pagination details of the response.
+    """
+    def __init__(self, entities=(), page=None, total_pages=None, total_results=None):
+        super().__init__(entities)
+        self.page = page
+        self.total_pages = total_pages
+        self.total_results = total_results
+
+    @classmethod
+    def from_response(cls, response: dict, entities):
+        return cls(
+            entities,
+            page=response.get('page'),
+            total_pages=response.get('total_pages'),
+            total_results=response.get('total_results')
+        )
@@ -1,8 +1,102 @@
+import threading
+
 from mr_knowledge_bot.bot.entites.the_movie_db.base import TheMovieDBBaseEntity
 
 
 class GenreEntity(TheMovieDBBaseEntity):
+    __slots__ = ()
 
     @classmethod
     def from_response(cls, response: dict):
-        return super().from_response(response.get('genres') or [])
+        return genre_table.resolve(response.get('genres') or [])
+
+
+class GenreTable:
+    """
+    The table of the interned genres of the process, shared by the movies and the tv-shows (TMDB genre ids are
+    unique across both of them).
+
+    Every genre id is interned into a single GenreEntity (a flyweight, whose name is filled once the genres are
+    loaded) and gets its own bit, so the genres of an entity are kept as a bitmask and filtering by genres is a
+    bit operation. The bits are assigned in the order the genres are seen, so masks are valid within the process
+    only.
+    """
+    def __init__(self):
+        self._genres = {}  # genre id -> GenreEntity
+        self._bits = {}  # genre id -> the bit of the genre
+        self._by_bit = []  # the genres by the index of their bit
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._genres)
+
+    def clear(self):
+        with self._lock:
+            self._genres, self._bits, self._by_bit = {}, {}, []
+
+    def intern(self, _id, name=None) -> GenreEntity:
+        """
+        Returns the interned genre of the id, a name that is given replaces the current name of the genre.
+        """
+        if (genre := self._genres.get(_id)) is None:
+            with self._lock:
+                if (genre := self._genres.get(_id)) is None:
+                    genre = GenreEntity(_id=_id, name=name)
+                    self._bits[_id] = 1 << len(self._by_bit)
+                    self._by_bit.append(genre)
+                    self._genres[_id] = genre
+        if name is not None and genre.name != name:
+            genre.name = name
+        return genre
+
+    def resolve(self, genres) -> list:
+        """
+        Returns the interned genres of the genres of a response (genre ids or genre dicts).
+        """
+        return [
+            self.intern(genre.get('id'), genre.get('name')) if isinstance(genre, dict) else self.intern(genre)
+            for genre in genres
+        ]
+
+    def bit(self, _id) -> int:
+        if (bit := self._bits.get(_id)) is None:
+            bit = self._bits[self.intern(_id).id]
+        return bit
+
+    def mask(self, genres) -> int:
+        """
+        Returns the bitmask of genres (genre ids, genre dicts or genre entities), 0 if there are no genres.
+        """
+        mask = 0
+        for genre in genres or ():
+            mask |= self.bit(genre.get('id') if isinstance(genre, dict) else getattr(genre, 'id', genre))
+        return mask
+
+    def genres(self, mask) -> list:
+        """
+        Returns the interned genres of a bitmask.
+        """
+        genres, index = [], 0
+        while mask:
+            if mask & 1:
+                genres.append(self._by_bit[index])
+            mask >>= 1
+            index += 1
+        return genres
+
+
+genre_table = GenreTable()
+
+
+def decode_genres(genres):
+    try:
+        return genre_table.resolve(genres) if genres else genres
+    except (TypeError, AttributeError):
+        return genres
+
+
+def matches_genres(genre_mask, with_genres_mask=0, without_genres_mask=0):
+    """
+    Returns whether a genre bitmask has all the genres of with_genres_mask and none of without_genres_mask.
+    """
+    return genre_mask & with_genres_mask == with_genres_mask and not genre_mask & without_genres_mask
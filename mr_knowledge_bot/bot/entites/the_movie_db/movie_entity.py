@@ -1,58 +1,63 @@
 
-from mr_knowledge_bot.bot.entites.the_movie_db.base import TheMovieDBBaseEntity
-from mr_knowledge_bot.bot.entites.the_movie_db.genre_entity import GenreEntity
+from mr_knowledge_bot.bot.entites.the_movie_db.base import TheMovieDBBaseEntity, TheMovieDBResults, LazyField, Field
+from mr_knowledge_bot.bot.entites.the_movie_db.genre_entity import decode_genres, genre_table
+from mr_knowledge_bot.bot.entites.the_movie_db.video_entity import decode_videos
+from mr_knowledge_bot.utils import date_ordinal
 import datetime
-from mr_knowledge_bot.utils import is_english_letters_movie
+
+
+def decode_runtime(runtime):
+    return str(datetime.timedelta(minutes=runtime)) if runtime else None
 
 
 class TheMovieDBMovieEntity(TheMovieDBBaseEntity):
+    __slots__ = (
+        'release_date', 'release_ordinal', '_genres', '_genre_mask', 'overview', 'popularity', 'rating', 'homepage',
+        'status', '_runtime', '_videos'
+    )
+    genres = LazyField(decode_genres)
+    genre_mask = LazyField(genre_table.mask)  # the bitmask of the genres (see GenreTable).
+    runtime = LazyField(decode_runtime)
+    videos = LazyField(decode_videos)
+    response_fields = (
+        Field('id'),
+        Field('title', 'name'),
+        Field('release_date'),
+        Field('release_date', 'release_ordinal', converter=date_ordinal),
+        Field(('genre_ids', 'genres'), 'genres'),
+        Field(('genre_ids', 'genres'), 'genre_mask'),
+        Field('overview'),
+        Field('popularity'),
+        Field('vote_average', 'rating'),
+        Field('homepage'),
+        Field('status'),
+        Field('runtime'),
+        Field('videos')
+    )
 
-    def __init__(self, _id, name, release_date, genres, overview, popularity, rating, homepage, status, runtime):
+    def __init__(
+        self, _id, name, release_date, genres, overview, popularity, rating, homepage, status, runtime, videos=None
+    ):
+        # genres (genre ids or genres), runtime (minutes) and videos (the videos response) are the raw values of
+        # the response, they are kept as is and decoded on first access (see LazyField).
         super().__init__(_id, name)
         self.release_date = release_date
-        try:
-            self.genres = [GenreEntity.from_response(genre) for genre in genres]
-        except (TypeError, AttributeError):
-            self.genres = genres
+        self.release_ordinal = date_ordinal(release_date)  # the release date parsed once, for filters.
+        self._genres = genres
+        self._genre_mask = genres
         self.overview = overview
         self.popularity = popularity
         self.rating = rating
         self.homepage = homepage
         self.status = status
-        if runtime:
-            self.runtime = str(datetime.timedelta(minutes=runtime))
-        else:
-            self.runtime = None
+        self._runtime = runtime
+        self._videos = videos
 
     @classmethod
     def from_response(cls, response: dict):
         if 'results' not in response:
-            return cls(
-                _id=response.get('id'),
-                name=response.get('title'),
-                release_date=response.get('release_date'),
-                genres=response.get('genre_ids') or response.get('genres'),
-                overview=response.get('overview'),
-                popularity=response.get('popularity'),
-                rating=response.get('vote_average'),
-                homepage=response.get('homepage'),
-                status=response.get('status'),
-                runtime=response.get('runtime')
-            )
-
-        results = response.get('results') or []
-
-        return [
-            cls(
-                _id=result.get('id'),
-                name=result.get('title'),
-                release_date=result.get('release_date'),
-                genres=result.get('genre_ids') or result.get('genres'),
-                overview=result.get('overview'),
-                popularity=result.get('popularity'),
-                rating=result.get('vote_average'),
-                homepage=result.get('homepage'),
-                status=result.get('status'),
-                runtime=result.get('runtime')
-            ) for result in results if is_english_letters_movie(result.get('title'))
-        ]
+            return cls.decode(response)
+
+        return TheMovieDBResults.from_response(
+            response, entities=list(map(cls.decode, response.get('results') or []))
+        )
@@ -1,11 +1,42 @@
 
-from mr_knowledge_bot.bot.entites.the_movie_db.base import TheMovieDBBaseEntity
-from mr_knowledge_bot.bot.entites.the_movie_db.genre_entity import GenreEntity
+from mr_knowledge_bot.bot.entites.the_movie_db.base import TheMovieDBBaseEntity, TheMovieDBResults, LazyField, Field
+from mr_knowledge_bot.bot.entites.the_movie_db.genre_entity import decode_genres, genre_table
+from mr_knowledge_bot.bot.entites.the_movie_db.video_entity import decode_videos
+from mr_knowledge_bot.utils import date_ordinal
 from mr_knowledge_bot.bot.entites.the_movie_db.tv_show_season_entity import TVShowSeasonEntity
-from mr_knowledge_bot.utils import is_english_letters_movie
+
+
+def decode_seasons(seasons):
+    return [
+        TVShowSeasonEntity.from_response(response) for response in seasons if response.get('season_number')
+    ] if seasons else None
 
 
 class TheMovieDBTVShowEntity(TheMovieDBBaseEntity):
+    __slots__ = (
+        'release_date', 'release_ordinal', '_genres', '_genre_mask', 'overview', 'popularity', 'rating', 'status',
+        '_seasons', 'number_of_episodes', 'homepage', '_videos'
+    )
+    genres = LazyField(decode_genres)
+    genre_mask = LazyField(genre_table.mask)  # the bitmask of the genres (see GenreTable).
+    seasons = LazyField(decode_seasons)
+    videos = LazyField(decode_videos)
+    response_fields = (
+        Field('id'),
+        Field('name'),
+        Field('first_air_date', 'release_date'),
+        Field('first_air_date', 'release_ordinal', converter=date_ordinal),
+        Field(('genre_ids', 'genres'), 'genres'),
+        Field(('genre_ids', 'genres'), 'genre_mask'),
+        Field('overview'),
+        Field('popularity'),
+        Field('vote_average', 'rating'),
+        Field('status'),
+        Field('seasons'),
+        Field('number_of_episodes'),
+        Field('homepage'),
+        Field('videos')
+    )
 
     def __init__(
         self,
@@ -19,55 +50,30 @@ class TheMovieDBTVShowEntity(TheMovieDBBaseEntity):
         status,
         seasons,
         number_of_episodes,
-        homepage
+        homepage,
+        videos=None
     ):
+        # genres (genre ids or genres), seasons and videos (the videos response) are the raw values of the
+        # response, they are kept as is and decoded on first access (see LazyField).
         super().__init__(_id, name)
         self.release_date = release_date
-        try:
-            self.genres = [GenreEntity.from_response(genre) for genre in genres]
-        except (TypeError, AttributeError):
-            self.genres = genres
+        self.release_ordinal = date_ordinal(release_date)  # the release date parsed once, for filters.
+        self._genres = genres
+        self._genre_mask = genres
         self.overview = overview
         self.popularity = popularity
         self.rating = rating
         self.status = status
-        self.seasons = [
-            TVShowSeasonEntity.from_response(response) for response in seasons if response.get('season_number')
-        ] if seasons else None
+        self._seasons = seasons
         self.number_of_episodes = number_of_episodes
         self.homepage = homepage
+        self._videos = videos
 
     @classmethod
     def from_response(cls, response: dict):
         if 'results' not in response:
-            return cls(
-                _id=response.get('id'),
-                name=response.get('name'),
-                release_date=response.get('first_air_date'),
-                genres=response.get('genre_ids') or response.get('genres'),
-                overview=response.get('overview'),
-                popularity=response.get('popularity'),
-                rating=response.get('vote_average'),
-                status=response.get('status'),
-                seasons=response.get('seasons'),
-                number_of_episodes=response.get('number_of_episodes'),
-                homepage=response.get('homepage')
-            )
-
-        results = response.get('results') or []
+            return cls.decode(response)
 
-        return [
-            cls(
-                _id=result.get('id'),
-                name=result.get('name'),
-                release_date=result.get('first_air_date'),
-                genres=result.get('genre_ids') or result.get('genres'),
-                overview=result.get('overview'),
-                popularity=result.get('popularity'),
-                rating=result.get('vote_average'),
-                status=result.get('status'),
-                seasons=result.get('seasons'),
-                number_of_episodes=result.get('number_of_episodes'),
-                homepage=result.get('homepage')
-            ) for result in results if is_english_letters_movie(result.get('name'))
-        ]
+        return TheMovieDBResults.from_response(
+            response, entities=list(map(cls.decode, response.get('results') or []))
+        )
@@ -1,9 +1,18 @@
 
 
-from mr_knowledge_bot.bot.entites.the_movie_db.base import TheMovieDBBaseEntity
+from mr_knowledge_bot.bot.entites.the_movie_db.base import TheMovieDBBaseEntity, Field
 
 
 class TVShowSeasonEntity(TheMovieDBBaseEntity):
+    __slots__ = ('overview', 'episode_count', 'release_date', 'season_number')
+    response_fields = (
+        Field('id'),
+        Field('name'),
+        Field('overview'),
+        Field('episode_count'),
+        Field('air_date', 'release_date'),
+        Field('season_number')
+    )
 
     def __init__(self, _id, name, overview, episode_count, release_date, season_number):
         super().__init__(_id, name)
@@ -14,11 +23,4 @@ class TVShowSeasonEntity(TheMovieDBBaseEntity):
 
     @classmethod
     def from_response(cls, response):
-        return cls(
-            name=response.get('name'),
-            _id=response.get('id'),
-            overview=response.get('overview'),
-            episode_count=response.get('episode_count'),
-            release_date=response.get('air_date'),
-            season_number=response.get('season_number'),
-        )
+        return cls.decode(response)
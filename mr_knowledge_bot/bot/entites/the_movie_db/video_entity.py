@@ -1,7 +1,21 @@
-from mr_knowledge_bot.bot.entites.the_movie_db.base import TheMovieDBBaseEntity
+from mr_knowledge_bot.bot.entites.the_movie_db.base import TheMovieDBBaseEntity, Field
+
+
+def lower(value):
+    return value.lower() if value else value
 
 
 class VideoEntity(TheMovieDBBaseEntity):
+    __slots__ = ('type', 'key', 'published_at', 'site', 'is_official')
+    response_fields = (
+        Field('id'),
+        Field('name'),
+        Field('type', converter=lower),
+        Field('key'),
+        Field('published_at'),
+        Field('site', converter=lower),
+        Field('official', 'is_official')
+    )
 
     def __init__(self, _id, name, _type, key, published_at, site, is_official):
         super().__init__(_id, name)
@@ -13,18 +27,7 @@ class VideoEntity(TheMovieDBBaseEntity):
 
     @classmethod
     def from_response(cls, response):
-        results = response.get('results') or []
-        return [
-            cls(
-                name=result.get('name'),
-                _id=result.get('id'),
-                _type=result.get('type'),
-                key=result.get('key'),
-                published_at=result.get('published_at'),
-                site=result.get('site'),
-                is_official=result.get('official')
-            ) for result in results
-        ]
+        return list(map(cls.decode, response.get('results') or []))
 
     def __str__(self):
         if self.type in ('trailer', 'teaser') and self.site == 'youtube':
@@ -32,4 +35,6 @@ class VideoEntity(TheMovieDBBaseEntity):
         return ''
 
 
-
+def decode_videos(videos):
+    # only the details have the videos, see DETAILS_APPENDED_RESOURCES.
+    return VideoEntity.from_response(videos) if videos is not None else None
@@ -1,12 +1,26 @@
 from abc import ABC
 from mr_knowledge_bot.bot.services.base_movie_tv_show_service import BaseMoviesTVShowsService
+from mr_knowledge_bot.bot.services.the_movie_db.genre_registry import GenreRegistry
+from mr_knowledge_bot.bot.entites.the_movie_db.genre_entity import genre_table, matches_genres
+from mr_knowledge_bot.bot.services.the_movie_db.pipeline import Filter
+from mr_knowledge_bot.bot.services.the_movie_db.partitioning import partitioned_discover
+from mr_knowledge_bot.bot.services.the_movie_db.query_planner import QueryPlanner
+from mr_knowledge_bot.bot.clients.the_movie_db.movie_db_base_client import (
+    MAX_RECORDS, canonical_query, get_cached_results, set_cached_results, serve_stale_on_failure
+)
 
 
 class TheMovieDBBaseService(BaseMoviesTVShowsService, ABC):
 
+    genre_registry: GenreRegistry = None  # shared by all the instances of the service.
+    query_planner: QueryPlanner = None
+
     def __init__(self, client=None):
         self._client = client
-        self.genres = self._client.get_genres()
+
+    @property
+    def genres(self):
+        return self.genre_registry.genres
 
     def find_by_name(self, **kwargs):
         return self._client.search(**kwargs)
@@ -14,6 +28,50 @@ class TheMovieDBBaseService(BaseMoviesTVShowsService, ABC):
     def discover(self, **kwargs):
         return self._client.discover(**kwargs)
 
+    def cached_results(self, endpoint, query, limit, run):
+        """
+        Returns the results of a command from the results cache of the client, runs the command (usually a
+        ResultPipeline over lazy pages, which the client does not cache) only on a miss.
+
+        The final ids are cached by the canonical form of the command (see canonical_query) and its limit, the
+        query must hold every argument that changes the results, including the local filters and the sort option.
+
+        Args:
+            endpoint (str): the endpoint of the command, e.g. search/discover.
+            query (dict): the arguments of the command.
+            limit (int): how many records the command returns.
+            run (Callable): runs the command and returns its entities.
+        """
+        client = self._client
+        key = ('pipeline', endpoint, client.media_type, canonical_query(query), limit)
+        if (entities := get_cached_results(client, key, limit)) is not None:
+            return entities
+
+        def fetch():
+            _entities = run()
+            set_cached_results(client, key, limit, _entities)
+            return _entities
+
+        return serve_stale_on_failure(
+            client, key=key, fetch=fetch, get_stale=lambda: get_cached_results(client, key, limit, stale=True)
+        )
+
+    def discover_pages(self, query_plan):
+        """
+        Returns the lazy pages of a discover command by its plan. Commands that need more records than a single
+        query returns (MAX_RECORDS) are partitioned by their date window and its windows are queried concurrently (see
+        partitioned_discover).
+        """
+        if query_plan.limit > MAX_RECORDS:
+            return partitioned_discover(self._client.discover, query_plan, date_field=self.query_planner.date_field)
+        pages = self._client.discover(**query_plan.params, lazy=True)
+        pages.first_pages = query_plan.first_pages()
+        pages.prefetch()
+        # the first wave is sized by the estimate of the plan, the waves after it are bounded by the estimate of the
+        # plan for the known number of records (see PageIterator.estimated_pages).
+        pages.estimated_pages = query_plan.estimate_pages(pages.total_results)
+        return pages
+
     def get_details(self, _id):
         return self._client.get_details(_id)
 
@@ -24,5 +82,32 @@ class TheMovieDBBaseService(BaseMoviesTVShowsService, ABC):
         pass
 
     def genre_names_to_ids(self, requested_genres):
-        names_to_ids = {genre.name: genre.id for genre in self.genres}
-        return [names_to_ids.get(genre) for genre in requested_genres if names_to_ids.get(genre)]
+        return self.genre_registry.names_to_ids(requested_genres)
+
+    def genre_names_to_mask(self, requested_genres):
+        return genre_table.mask(self.genre_names_to_ids(requested_genres))
+
+    def genres_filter(self, with_genres=None, without_genres=None):
+        """
+        Returns a pipeline stage that keeps the entities that have all the genres of with_genres and none of the
+        genres of without_genres, None if there are no known genres to filter by.
+
+        Args:
+            with_genres (list[str]): genres names the entities must have.
+            without_genres (list[str]): genres names the entities must not have.
+        """
+        with_genres_mask = self.genre_names_to_mask(with_genres) if with_genres else 0
+        without_genres_mask = self.genre_names_to_mask(without_genres) if without_genres else 0
+        if not with_genres_mask and not without_genres_mask:
+            return None
+        return Filter(
+            'genres', lambda entity: matches_genres(entity.genre_mask, with_genres_mask, without_genres_mask)
+        )
+
+    def filter_by_genres(self, entities, with_genres=None, without_genres=None):
+        """
+        Keeps the entities that have all the genres of with_genres and none of the genres of without_genres.
+        """
+        if (genres_filter := self.genres_filter(with_genres, without_genres)) is None:
+            return entities
+        return list(genres_filter(entities))
@@ -0,0 +1,114 @@
+import os
+import time
+import logging
+import threading
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_GENRES_TTL = 60 * 60 * 24  # genres rarely change, once a day is enough.
+
+
+class GenreRegistry:
+    """
+    A thread-safe registry of the genres of a media type, shared by all the services of the process.
+
+    The genres are loaded once (on start or on first use) and refreshed in the background after they expire,
+    while a refresh is running (or if it fails) the previous genres keep being served.
+
+    Args:
+        client_class (Type[TheMovieDBBaseClient]): the client class to query the genres with.
+        ttl (float): how many seconds the loaded genres are valid.
+    """
+    def __init__(self, client_class, ttl=None):
+        self._client_class = client_class
+        self.ttl = float(ttl or os.getenv('THE_MOVIE_DB_GENRES_TTL', DEFAULT_GENRES_TTL))
+        self._genres = []
+        self._names_to_ids = {}
+        self._loaded_at = None
+        self._load_lock = threading.Lock()
+        self._first_load_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()  # held while a refresh is running.
+        self._stop_refreshing = threading.Event()
+
+    @property
+    def loaded(self):
+        return self._loaded_at is not None
+
+    @property
+    def expired(self):
+        return not self.loaded or time.monotonic() - self._loaded_at >= self.ttl
+
+    def load(self):
+        """
+        Queries the genres from the api and replaces the current ones.
+        """
+        genres = self._client_class().get_genres()
+        # build the lookup table before swapping so readers never see a half built registry.
+        names_to_ids = {genre.name.casefold(): genre.id for genre in genres}
+        with self._load_lock:
+            self._genres, self._names_to_ids, self._loaded_at = genres, names_to_ids, time.monotonic()
+        logger.debug(f'loaded {len(genres)} genres using {self._client_class.__name__}')
+
+    def start(self):
+        """
+        Loads the genres and keeps refreshing them in the background every ttl seconds. If the api is unavailable
+        the genres are loaded on first use instead, so the bot still starts.
+        """
+        try:
+            self.load()
+        except Exception as e:
+            logger.error(f'Could not load the genres using {self._client_class.__name__}, error:\n{e}')
+        threading.Thread(target=self._refresh_periodically, daemon=True).start()
+
+    def stop(self):
+        self._stop_refreshing.set()
+
+    def _refresh_periodically(self):
+        while not self._stop_refreshing.wait(self.ttl):
+            if self._refresh_lock.acquire(blocking=False):
+                self._refresh()
+
+    def _refresh(self):
+        """
+        Reloads the genres, the caller must hold the refresh lock, it is released once the refresh is done.
+        """
+        try:
+            self.load()
+        except Exception as e:
+            logger.error(f'Could not refresh the genres using {self._client_class.__name__}, error:\n{e}')
+        finally:
+            self._refresh_lock.release()
+
+    def _refresh_in_background(self):
+        # acquiring the lock without blocking both checks and marks that a refresh is running, so only one of
+        # concurrent callers starts a refresh.
+        if self._refresh_lock.acquire(blocking=False):
+            threading.Thread(target=self._refresh, daemon=True).start()
+
+    def _ensure_loaded(self):
+        if not self.loaded:
+            with self._first_load_lock:
+                if not self.loaded:
+                    self.load()
+        elif self.expired:
+            self._refresh_in_background()
+
+    @property
+    def genres(self):
+        self._ensure_loaded()
+        return self._genres
+
+    def names_to_ids(self, names):
+        """
+        Returns the ids of the genres by their names, names that are not a known genre are ignored.
+
+        Args:
+            names (list[str]): genres names (case-insensitive).
+        """
+        self._ensure_loaded()
+        names_to_ids = self._names_to_ids
+        return [
+            names_to_ids[name.strip().casefold()] for name in names if name.strip().casefold() in names_to_ids
+        ]
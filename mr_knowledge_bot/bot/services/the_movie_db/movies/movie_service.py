@@ -1,8 +1,10 @@
-import dateparser
 import logging
-from datetime import datetime
 from mr_knowledge_bot.bot.clients import MovieClient
 from mr_knowledge_bot.bot.services.the_movie_db.base_movie_db_service import TheMovieDBBaseService
+from mr_knowledge_bot.bot.services.the_movie_db.genre_registry import GenreRegistry
+from mr_knowledge_bot.bot.services.the_movie_db.pipeline import ResultPipeline, Dedupe, english_names
+from mr_knowledge_bot.bot.services.the_movie_db.ranking import search_top_k
+from mr_knowledge_bot.bot.services.the_movie_db.query_planner import QueryPlanner
 from abc import ABC
 from telegram.ext import CallbackContext
 
@@ -12,6 +14,14 @@ logger = logging.getLogger(__name__)
 
 class TheMovieDBMovieService(TheMovieDBBaseService, ABC):
 
+    genre_registry = GenreRegistry(client_class=MovieClient)
+    query_planner = QueryPlanner(
+        date_field='primary_release_date',
+        sort_values={
+            'popularity': 'popularity.desc', 'release_date': 'release_date.desc', 'rating': 'vote_average.desc'
+        }
+    )
+
     def __init__(self, movies=None):
         super().__init__(client=MovieClient())
         self.movies = movies
@@ -24,23 +34,15 @@ class TheMovieDBMovieService(TheMovieDBBaseService, ABC):
         """
         Find movies by name.
         """
-        if sort_by == 'rating':
-            sort_by = 'vote_average'
-
-        movies = super().find_by_name(movie_name=movie_name, limit=limit, sort_by=sort_by)
-        if len(movies) > limit:
-            if sort_by == 'popularity':
-                movies = sorted(
-                    movies, key=lambda movie: (movie.release_date, movie.release_date is not None), reverse=True
-                )
-            elif sort_by == 'release_date':
-                movies = sorted(
-                    movies, key=lambda movie: (movie.release_date, movie.release_date is not None), reverse=True
-                )
-            elif sort_by == 'rating':
-                movies = sorted(movies, key=lambda movie: (movie.rating, movie.rating is not None), reverse=True)
-
-            movies = movies[:limit]
+        pages = super().find_by_name(movie_name=movie_name, lazy=True)  # queried only on a cache miss.
+
+        def search():
+            pipeline = ResultPipeline(stages=[english_names(), Dedupe()], top_k=search_top_k(limit, sort_by))
+            return pipeline.run(pages)
+
+        movies = self.cached_results(
+            endpoint='search', query={'query': movie_name, 'sort_by': sort_by}, limit=limit, run=search
+        )
 
         logger.debug(f'found the following movies: {movies}')
         return movies
@@ -61,63 +63,31 @@ class TheMovieDBMovieService(TheMovieDBBaseService, ABC):
         """
         Find movies by filter parameters.
         """
-        def _set_up_body_reqeust():
-            _filters = {'page': page}
-            if sort_by:
-                if sort_by == 'popularity':
-                    sort_by_value = 'popularity.desc'
-                elif sort_by == 'release_date':
-                    sort_by_value = 'release_date.desc'
-                else:  # sort_by == 'rating'
-                    sort_by_value = 'vote_average.desc'
-                _filters['sort_by'] = sort_by_value
-
-            if before_date:
-                if parsed_before_data := dateparser.parse(before_date):
-                    # log out what the date is before and after parsing
-                    _filters['primary_release_date.lte'] = parsed_before_data.strftime('%Y-%m-%d')
-
-            if after_date:
-                if parsed_after_date := dateparser.parse(after_date):
-                    # log out what the date is before and after parsing
-                    _filters['primary_release_date.gte'] = parsed_after_date.strftime('%Y-%m-%d')
-
-            if with_genres and (genre_ids := self.genre_names_to_ids(with_genres)):
-                _filters['with_genres'] = genre_ids
-
-            if without_genres and (genre_ids := self.genre_names_to_ids(without_genres)):
-                _filters['without_genres'] = genre_ids
-
-            if before_runtime:
-                _filters['with_runtime.lte'] = before_runtime
-
-            if after_runtime:
-                _filters['with_runtime.gte'] = after_runtime
-
-            return _filters
-
-        movies = super().discover(**_set_up_body_reqeust())
-        if not not_released:  # remove movies which were not released yet or don't have any release-date
-            movies = [
-                movie for movie in movies if movie.release_date and
-                dateparser.parse(movie.release_date).strftime('%Y-%m-%d') < datetime.now().strftime('%Y-%m-%d')
-            ]
-
-        if sort_by == 'popularity':
-            movies = sorted(
-                movies, key=lambda movie: (movie.release_date, movie.release_date is not None), reverse=True
-            )
-        elif sort_by == 'release_date':
-            movies = sorted(
-                movies, key=lambda movie: (movie.release_date, movie.release_date is not None), reverse=True
-            )
-        elif sort_by == 'rating':
-            movies = sorted(
-                movies, key=lambda movie: (movie.rating, movie.rating is not None), reverse=True
-            )
-
-        if len(movies) > limit:
-            movies = movies[:limit]
+        query_plan = self.query_planner.plan(
+            self,
+            limit=limit,
+            sort_by=sort_by,
+            before_date=before_date,
+            after_date=after_date,
+            with_genres=with_genres,
+            without_genres=without_genres,
+            before_runtime=before_runtime,
+            after_runtime=after_runtime,
+            not_released=not_released
+        )
+
+        def discover():
+            pages = self.discover_pages(query_plan)
+            results = query_plan.pipeline().run(pages)
+            logger.debug(f'queried {pages.fetched_pages} pages for {pages.total_results} records')
+            return results
+
+        movies = self.cached_results(
+            endpoint='discover',
+            query={**query_plan.params, 'sort_by': sort_by, 'not_released': not_released},
+            limit=limit,
+            run=discover
+        )
 
         logger.debug(f'found the following movies: {movies}')
         return movies
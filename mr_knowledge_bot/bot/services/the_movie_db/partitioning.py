@@ -0,0 +1,172 @@
+import os
+import math
+import heapq
+import logging
+import contextvars
+from datetime import date, timedelta
+from typing import NamedTuple, Optional
+from concurrent.futures import ThreadPoolExecutor
+
+from mr_knowledge_bot.bot.clients.the_movie_db.movie_db_base_client import MAX_PAGES, MAX_RECORDS, PAGE_SIZE
+
+
+logger = logging.getLogger(__name__)
+
+
+MAX_PARTITIONS = int(os.getenv('THE_MOVIE_DB_MAX_PARTITIONS', 16))
+PARTITION_RECORDS = MAX_RECORDS  # a window is split until its share of the needed records fits a single query.
+EARLIEST_DATE = date(1874, 1, 1)  # the open start of a date window is split from this date.
+FUTURE_DAYS = 365 * 10  # the open end of a date window is split up to this many days from today.
+
+
+class DateWindow(NamedTuple):
+    """
+    A range of release dates (both ends included), None is an open end.
+    """
+    after: Optional[date] = None
+    before: Optional[date] = None
+
+    def split(self, parts):
+        """
+        Returns (at most) parts consecutive windows of the same length that cover the window, the first and the
+        last windows keep the open ends of the window.
+        """
+        first = self.after or EARLIEST_DATE
+        last = self.before or date.today() + timedelta(days=FUTURE_DAYS)
+        days = (last - first).days + 1
+        if (parts := min(parts, days)) < 2:
+            return [self]
+        bounds = [first + timedelta(days=days * part // parts) for part in range(parts + 1)]
+        return [
+            DateWindow(
+                after=self.after if part == 0 else bounds[part],
+                before=self.before if part == parts - 1 else bounds[part + 1] - timedelta(days=1)
+            ) for part in range(parts)
+        ]
+
+    def params(self, date_field):
+        params = {}
+        if self.after:
+            params[f'{date_field}.gte'] = self.after.isoformat()
+        if self.before:
+            params[f'{date_field}.lte'] = self.before.isoformat()
+        return params
+
+    def __str__(self):
+        return f'{self.after or "..."} - {self.before or "..."}'
+
+
+class PartitionedPages:
+    """
+    The records of the partitions of a query as one stream, merged by the order TMDB returns them in (a k-way
+    merge of the partitions, each of them is already sorted). Behaves like a lazy PageIterator for a
+    ResultPipeline.
+
+    Args:
+        partitions (list[PageIterator]): the lazy pages of every partition.
+        key (Callable): the key of the order of the records (descending).
+    """
+    def __init__(self, partitions, key):
+        self.partitions = partitions
+        self.key = key
+        self._wanted = None
+
+    @property
+    def wanted(self):
+        return self._wanted
+
+    @wanted.setter
+    def wanted(self, wanted):
+        # every partition is asked for its share of the wanted records by the records it holds, a partition the
+        # merge takes more records out of just queries its next pages in smaller waves.
+        self._wanted = wanted
+        total_results = self.total_results
+        for partition in self.partitions:
+            if wanted is None or not total_results:
+                partition.wanted = wanted
+            else:
+                partition.wanted = max(math.ceil(wanted * (partition.total_results or 0) / total_results), 1)
+
+    @property
+    def fetched_pages(self):
+        return sum(partition.fetched_pages for partition in self.partitions)
+
+    @property
+    def total_results(self):
+        return sum(partition.total_results or 0 for partition in self.partitions)
+
+    def __iter__(self):
+        return heapq.merge(*self.partitions, key=self.key, reverse=True)
+
+
+def query_concurrently(query, windows):
+    if len(windows) == 1:
+        return [query(windows[0])]
+    with ThreadPoolExecutor(max_workers=len(windows)) as executor:
+        # the windows are queried in the context of the caller, so they share its deadline.
+        futures = [executor.submit(contextvars.copy_context().run, query, window) for window in windows]
+        return [future.result() for future in futures]
+
+
+def partitioned_discover(discover, query_plan, date_field, max_partitions=MAX_PARTITIONS):
+    """
+    Queries a discover command that needs more records than a single query returns (MAX_RECORDS), or than TMDB
+    paginates for a single query (MAX_PAGES).
+
+    The first page of the date window of the command is queried, if the window holds more records than
+    PARTITION_RECORDS and the command needs them, it is split into sub-windows sized (by the number of its records)
+    so that the share of the needed records of each of them (by the records it holds) fits a single query. The
+    sub-windows are queried concurrently and split again until every window fits or there are max_partitions
+    windows. The records of the windows are merged by the pushed down sort option, so a ResultPipeline consumes
+    them as if they were the records of a single query.
+
+    Args:
+        discover (Callable): the discover of the client, called with the parameters of a window (lazy).
+        query_plan (QueryPlan): the plan of the command.
+        date_field (str): the release date parameter of the media type (primary_release_date/first_air_date).
+        max_partitions (int): the maximum number of windows to query.
+    """
+    reachable_records = MAX_PAGES * PAGE_SIZE
+    needed_records = math.ceil(query_plan.limit / query_plan.selectivity)
+    params = query_plan.params
+    total_records = None  # the records of the date window of the command, known once its first page arrives.
+
+    def query(window):
+        pages = discover(
+            **{**params, **window.params(date_field)}, limit=min(needed_records, reachable_records), lazy=True
+        )
+        # a window that might be split is probed by its first page alone, its other pages might never be needed.
+        pages.first_pages = 1 if needed_records > PARTITION_RECORDS else query_plan.first_pages()
+        return pages.prefetch()
+
+    def parts(window_records):
+        needed_share = min(math.ceil(needed_records * window_records / total_records), window_records)
+        return math.ceil(needed_share / PARTITION_RECORDS)
+
+    window = DateWindow(
+        after=date.fromisoformat(after) if (after := params.get(f'{date_field}.gte')) else None,
+        before=date.fromisoformat(before) if (before := params.get(f'{date_field}.lte')) else None
+    )
+    pending, partitions = [window], []
+    while pending:
+        windows, pending = pending, []
+        for index, (window, pages) in enumerate(zip(windows, query_concurrently(query, windows))):
+            if pages.total_results == 0:  # empty windows don't take a partition.
+                continue
+            if total_records is None:
+                total_records = pages.total_results or 0
+            if not total_records or parts(pages.total_results or 0) <= 1:
+                partitions.append((window, pages))
+                continue
+            # the windows that are left (including this one) can be split up to the remaining partitions.
+            budget = max_partitions - len(partitions) - len(pending) - (len(windows) - index - 1)
+            sub_windows = window.split(min(parts(pages.total_results), budget))
+            if len(sub_windows) > 1:
+                logger.debug(f'{window} holds {pages.total_results} records, split into {len(sub_windows)} windows')
+                pending.extend(sub_windows)
+            else:
+                logger.warning(f'{window} holds {pages.total_results} records, but it can not be split any further')
+                partitions.append((window, pages))
+
+    logger.info(f'discover partitioned into {len(partitions)} windows: {", ".join(str(w) for w, _ in partitions)}')
+    return PartitionedPages(partitions=[pages for _, pages in partitions], key=query_plan.order_key())
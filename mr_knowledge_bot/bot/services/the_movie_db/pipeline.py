@@ -0,0 +1,177 @@
+import math
+import heapq
+import logging
+from abc import ABC, abstractmethod
+from itertools import islice
+from operator import attrgetter
+
+from mr_knowledge_bot.utils import is_english_letters_movie
+
+
+logger = logging.getLogger(__name__)
+
+
+MIN_PASS_RATE = 0.05  # bounds the number of pages that are asked for when almost every record is dropped.
+HEAP_SELECTION_RATIO = 16  # the top-k stage selects by a heap out of at least this many times k candidates.
+
+
+class Stage(ABC):
+    """
+    A streaming stage of a ResultPipeline, gets the records of the previous stage and yields the records that
+    passed it.
+
+    Args:
+        name (str): the name of the stage in the stats of the pipeline.
+    """
+    def __init__(self, name):
+        self.name = name
+        self.received = 0
+        self.dropped = 0
+
+    @abstractmethod
+    def __call__(self, records):
+        pass
+
+
+class Filter(Stage):
+    """
+    Drops the records the predicate returns False for.
+    """
+    def __init__(self, name, predicate):
+        super().__init__(name)
+        self.predicate = predicate
+
+    def __call__(self, records):
+        predicate = self.predicate
+        for record in records:
+            self.received += 1
+            if predicate(record):
+                yield record
+            else:
+                self.dropped += 1
+
+
+class Dedupe(Stage):
+    """
+    Drops the records whose key (the id by default) was already seen.
+    """
+    def __init__(self, name='duplicates', key=attrgetter('id')):
+        super().__init__(name)
+        self.key = key
+
+    def __call__(self, records):
+        seen, key = set(), self.key
+        for record in records:
+            self.received += 1
+            if (record_key := key(record)) in seen:
+                self.dropped += 1
+                continue
+            seen.add(record_key)
+            yield record
+
+
+class TopK(Stage):
+    """
+    The last stage of a pipeline, selects the k records with the largest keys out of the first candidates records,
+    or the first k records if there is no key (the records are already in the order of the api).
+
+    Args:
+        k (int): how many records to select.
+        key (Callable): the key to rank the records by.
+        candidates (int): how many records to rank, all the records by default, k if there is no key.
+    """
+    def __init__(self, k, key=None, candidates=None, name='top-k'):
+        super().__init__(name)
+        self.k = k
+        self.key = key
+        self.candidates = candidates if candidates is not None or key is not None else k
+
+    @property
+    def remaining(self):
+        """
+        How many more records the stage needs, None if it needs all of them.
+        """
+        return None if self.candidates is None else max(self.candidates - self.received, 0)
+
+    def __call__(self, records):
+        candidates = []
+        for record in records if self.candidates is None else islice(records, self.remaining):
+            self.received += 1
+            candidates.append(record)
+        if self.key is None:
+            selected = candidates[:self.k]
+        elif self.k * HEAP_SELECTION_RATIO <= len(candidates):  # a heap only pays off for a few out of many.
+            selected = heapq.nlargest(self.k, candidates, key=self.key)
+        else:
+            selected = sorted(candidates, key=self.key, reverse=True)[:self.k]
+        self.dropped = len(candidates) - len(selected)
+        return selected
+
+
+class ResultPipeline:
+    """
+    Streams the records of a query through its stages: decode (the records of the pages) -> filter -> dedupe ->
+    top-k, no stage builds an intermediate list.
+
+    While the records are consumed the pipeline tells a lazy PageIterator how many more records it wants, by the
+    records the top-k stage still needs and the ratio of records that survived the stages so far (the estimated
+    pass rate until the first records arrive), so pages are queried only while the pipeline still needs records.
+
+    Args:
+        stages (list[Stage]): the streaming stages (filters/dedupe) in the order they run.
+        top_k (TopK): the stage that selects the results.
+        pass_rate (float): the estimated ratio of records that survive the stages, e.g. by a QueryPlan.
+    """
+    def __init__(self, stages, top_k, pass_rate=1.0):
+        self.stages = stages
+        self.top_k = top_k
+        self.pass_rate = pass_rate
+        self.decoded = 0
+
+    def _wanted(self):
+        if (remaining := self.top_k.remaining) is None:
+            return None
+        pass_rate = self.top_k.received / self.decoded if self.decoded else self.pass_rate
+        return math.ceil(remaining / max(pass_rate, MIN_PASS_RATE))
+
+    def _decode(self, records):
+        pages = records if hasattr(records, 'wanted') else None
+        records = iter(records)
+        while True:
+            if pages is not None:
+                pages.wanted = self._wanted()
+            try:
+                record = next(records)
+            except StopIteration:
+                return
+            self.decoded += 1
+            yield record
+
+    def run(self, records):
+        """
+        Returns the selected records.
+
+        Args:
+            records (Iterable): the decoded records, usually a lazy PageIterator.
+        """
+        stream = self._decode(records)
+        for stage in self.stages:
+            stream = stage(stream)
+        results = self.top_k(stream)
+        logger.debug(f'result pipeline: {self.stats()}')
+        return results
+
+    def stats(self):
+        """
+        Returns how many records were decoded and how many records each stage dropped.
+        """
+        return {
+            'decoded': self.decoded, **{stage.name: stage.dropped for stage in (*self.stages, self.top_k)}
+        }
+
+
+def english_names():
+    """
+    Returns a filter of the records whose names are not in english letters.
+    """
+    return Filter('non english names', lambda record: bool(record.name) and is_english_letters_movie(record.name))
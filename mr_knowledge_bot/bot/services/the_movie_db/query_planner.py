@@ -0,0 +1,200 @@
+import math
+import logging
+from datetime import date, timedelta
+
+import dateparser
+
+from mr_knowledge_bot.bot.clients.the_movie_db.movie_db_base_client import MAX_WORKERS, PAGE_SIZE
+from mr_knowledge_bot.bot.services.the_movie_db.pipeline import ResultPipeline, Filter, Dedupe, TopK, english_names
+from mr_knowledge_bot.bot.services.the_movie_db.ranking import ranking_key
+
+
+logger = logging.getLogger(__name__)
+
+
+# the estimated ratio of records that pass each local filter, the ratio that was observed replaces it once the
+# first pages arrive (see ResultPipeline).
+SELECTIVITY = {
+    'non english names': 0.9,
+    'not released': 1.0,  # the release date is pushed down, only records without a release date are dropped.
+    'genres': 1.0,  # the genres are pushed down, the bitmasks only verify them.
+}
+DEFAULT_SORT = 'popularity'  # the sort of discover if no sort option is sent.
+TV_STATUS_CODES = {
+    'returning series': 0,
+    'planned': 1,
+    'in production': 2,
+    'ended': 3,
+    'cancelled': 4,
+    'pilot': 5
+}
+
+
+class QueryPlan:
+    """
+    How a discover command is executed: the parameters that are pushed down to TMDB, the local filters of the
+    result pipeline (with their estimated selectivity) and how many records are ranked.
+
+    Args:
+        limit (int): how many records the command returns.
+        params (dict): the parameters of the query that are sent to TMDB.
+        filters (list[tuple[Filter, float]]): the local filters and their estimated selectivity.
+        sort_by (str): the sort option of the command.
+    """
+    def __init__(self, limit, params, filters, sort_by=None):
+        self.limit = limit
+        self.params = params
+        self.filters = filters
+        self.sort_by = sort_by
+
+    @property
+    def selectivity(self):
+        return math.prod(selectivity for _, selectivity in self.filters)
+
+    @property
+    def stages(self):
+        return [_filter for _filter, _ in self.filters] + [Dedupe()]
+
+    def pipeline(self):
+        """
+        Returns the result pipeline of the plan, it asks for pages by the estimated selectivity of the plan until it
+        observes its own pass rate.
+        """
+        return ResultPipeline(stages=self.stages, top_k=self.top_k(), pass_rate=self.selectivity)
+
+    def top_k(self):
+        """
+        The sort option is pushed down to TMDB, so the records arrive ranked and only the first limit records that
+        pass the filters are ranked (the local ranking only moves records without a value to the end).
+        """
+        return TopK(self.limit, key=ranking_key(self.sort_by), candidates=self.limit)
+
+    def order_key(self):
+        """
+        Returns the key of the order TMDB returns the records in (by the pushed down sort option, or by popularity
+        which is the default sort of discover).
+        """
+        return ranking_key(self.sort_by if 'sort_by' in self.params else DEFAULT_SORT)
+
+    def estimate_pages(self, total_results=None):
+        """
+        Returns how many pages are needed for the limit, by the selectivity of the local filters and the number of
+        records of the query (if known).
+        """
+        pages = math.ceil(self.limit / (PAGE_SIZE * self.selectivity))
+        if total_results is not None:
+            pages = min(pages, math.ceil(total_results / PAGE_SIZE))
+        return max(pages, 1)
+
+    def first_pages(self):
+        """
+        Returns how many pages to query concurrently before the number of records of the query is known.
+        """
+        return min(self.estimate_pages(), MAX_WORKERS)
+
+    def __str__(self):
+        local_filters = ', '.join(f'{_filter.name} ({selectivity:.0%})' for _filter, selectivity in self.filters)
+        return (
+            f'pushed down: {self.params}, local filters: {local_filters or None}, ranked by: {self.sort_by}, '
+            f'estimated pages: {self.estimate_pages()}'
+        )
+
+
+class QueryPlanner:
+    """
+    Decides which constraints of a discover command are sent to TMDB and which run as local filters.
+
+    Everything TMDB can filter by is pushed down (dates, the release cut, genres, runtimes, sort and statuses),
+    so no page is queried for records that are dropped anyway. Only what TMDB can't filter by runs locally
+    (english names), in addition to checks that are cheap to repeat (the release dates and the genres bitmasks).
+
+    Args:
+        date_field (str): the release date parameter of the media type (primary_release_date/first_air_date).
+        sort_values (dict): the TMDB sort value of every sort option.
+    """
+    def __init__(self, date_field, sort_values):
+        self.date_field = date_field
+        self.sort_values = sort_values
+
+    def _date(self, value):
+        if parsed_date := dateparser.parse(value):
+            return parsed_date.strftime('%Y-%m-%d')
+        logger.warning(f'could not parse the date {value}, it is not part of the query')
+        return None
+
+    @staticmethod
+    def status_codes(with_status):
+        """
+        Returns the TMDB codes of tv-show statuses (case-insensitive), unknown statuses are ignored.
+
+        Args:
+            with_status (str | list[str]): statuses names.
+        """
+        statuses = [with_status] if isinstance(with_status, str) else with_status or []
+        return [
+            TV_STATUS_CODES[status.strip().casefold()] for status in statuses
+            if status.strip().casefold() in TV_STATUS_CODES
+        ]
+
+    def plan(
+        self,
+        service,
+        limit,
+        sort_by=None,
+        before_date=None,
+        after_date=None,
+        with_genres=None,
+        without_genres=None,
+        before_runtime=None,
+        after_runtime=None,
+        with_status=None,
+        not_released=None
+    ) -> QueryPlan:
+        """
+        Returns the plan of a discover command, see the discover of the services for the arguments.
+        """
+        params = {}
+        filters = [(english_names(), SELECTIVITY['non english names'])]
+
+        if sort_by in self.sort_values:
+            params['sort_by'] = self.sort_values[sort_by]
+
+        if before_date and (before := self._date(before_date)):
+            params[f'{self.date_field}.lte'] = before
+
+        if not not_released:  # the unreleased records are not queried at all.
+            latest_release_date = (date.today() - timedelta(days=1)).isoformat()
+            if params.get(f'{self.date_field}.lte', latest_release_date) >= latest_release_date:
+                params[f'{self.date_field}.lte'] = latest_release_date
+            today = date.today().toordinal()
+            filters.append((Filter('not released', lambda record: (
+                record.release_ordinal is not None and record.release_ordinal < today
+            )), SELECTIVITY['not released']))
+
+        if after_date and (after := self._date(after_date)):
+            params[f'{self.date_field}.gte'] = after
+
+        # TMDB matches all the genres of a comma separated list, the genres bitmasks verify them locally.
+        if with_genres and (genre_ids := service.genre_names_to_ids(with_genres)):
+            params['with_genres'] = ','.join(map(str, sorted(set(genre_ids))))
+
+        if without_genres and (genre_ids := service.genre_names_to_ids(without_genres)):
+            params['without_genres'] = ','.join(map(str, sorted(set(genre_ids))))
+
+        if genres_filter := service.genres_filter(with_genres=with_genres, without_genres=without_genres):
+            filters.append((genres_filter, SELECTIVITY['genres']))
+
+        if before_runtime:
+            params['with_runtime.lte'] = before_runtime
+
+        if after_runtime:
+            params['with_runtime.gte'] = after_runtime
+
+        # the results of discover don't hold the status, so it can only be filtered by TMDB (any of the statuses).
+        if with_status and (status_codes := self.status_codes(with_status)):
+            params['with_status'] = '|'.join(map(str, status_codes))
+
+        query_plan = QueryPlan(limit=limit, params=params, filters=filters, sort_by=sort_by)
+        logger.info(f'query plan: {query_plan}')
+        return query_plan
+
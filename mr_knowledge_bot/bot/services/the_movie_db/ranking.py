@@ -0,0 +1,47 @@
+import os
+import math
+from operator import attrgetter
+
+from mr_knowledge_bot.bot.services.the_movie_db.pipeline import TopK
+
+
+# the attribute every sort option ranks by, release dates are ranked by their ordinals (see date_ordinal).
+RANKING_ATTRIBUTES = {
+    'popularity': 'popularity',
+    'release_date': 'release_ordinal',
+    'first_air_date': 'release_ordinal',
+    'rating': 'rating',
+    'vote_average': 'rating'
+}
+
+# how many times the limit of the most relevant search results are ranked by a sort option.
+SEARCH_CANDIDATES_FACTOR = int(os.getenv('THE_MOVIE_DB_SEARCH_CANDIDATES_FACTOR', 2))
+
+
+def ranking_key(sort_by):
+    """
+    Returns a null-safe numeric key of a sort option (entities without a value are ranked last), None if the
+    option is not known.
+
+    Args:
+        sort_by (str): popularity/release_date/first_air_date/rating.
+    """
+    if (attribute := RANKING_ATTRIBUTES.get(sort_by)) is None:
+        return None
+    get_value = attrgetter(attribute)
+
+    def key(entity):
+        value = get_value(entity)
+        return -math.inf if value is None else value
+
+    return key
+
+
+def search_top_k(limit, sort_by):
+    """
+    Returns the top-k stage of a search, the search has no sort option so the records arrive by relevance: the
+    limit highest ranked records by the sort option are selected out of the limit * SEARCH_CANDIDATES_FACTOR most
+    relevant records, or the first limit records if there is no sort option.
+    """
+    key = ranking_key(sort_by)
+    return TopK(limit, key=key, candidates=limit * SEARCH_CANDIDATES_FACTOR if key is not None else None)
@@ -1,12 +1,14 @@
-import dateparser
 import logging
-from datetime import datetime
 
 from telegram.ext import CallbackContext
 
 from mr_knowledge_bot.bot.clients import TVShowsClient
 from abc import ABC
 from mr_knowledge_bot.bot.services.the_movie_db.base_movie_db_service import TheMovieDBBaseService
+from mr_knowledge_bot.bot.services.the_movie_db.genre_registry import GenreRegistry
+from mr_knowledge_bot.bot.services.the_movie_db.pipeline import ResultPipeline, Dedupe, english_names
+from mr_knowledge_bot.bot.services.the_movie_db.ranking import search_top_k
+from mr_knowledge_bot.bot.services.the_movie_db.query_planner import QueryPlanner
 
 
 logger = logging.getLogger(__name__)
@@ -14,6 +16,17 @@ logger = logging.getLogger(__name__)
 
 class TheMovieDBTVShowService(TheMovieDBBaseService, ABC):
 
+    genre_registry = GenreRegistry(client_class=TVShowsClient)
+    query_planner = QueryPlanner(
+        date_field='first_air_date',
+        sort_values={
+            'popularity': 'popularity.desc',
+            'first_air_date': 'first_air_date.desc',
+            'release_date': 'first_air_date.desc',
+            'rating': 'vote_average.desc'
+        }
+    )
+
     def __init__(self, tv_shows=None):
         super().__init__(client=TVShowsClient())
         self.tv_shows = tv_shows
@@ -26,24 +39,15 @@ class TheMovieDBTVShowService(TheMovieDBBaseService, ABC):
         """
         Find TV shows by name.
         """
-        tv_shows = super().find_by_name(tv_show_name=tv_show_name, limit=limit, sort_by=sort_by)
-
-        if len(tv_shows) > limit:
-            if sort_by == 'popularity':
-                tv_shows = sorted(
-                    tv_shows, key=lambda tv_show: (tv_show.popularity, tv_show.popularity is not None), reverse=True
-                )
-            elif sort_by == 'release_date':
-                tv_shows = sorted(
-                    tv_shows, key=lambda tv_show: (tv_show.release_date, tv_show.release_date is not None),
-                    reverse=True
-                )
-            elif sort_by == 'tv_shows':
-                tv_shows = sorted(
-                    tv_shows, key=lambda tv_show: (tv_show.rating, tv_show.rating is not None), reverse=True
-                )
-
-            tv_shows = tv_shows[:limit]
+        pages = super().find_by_name(tv_show_name=tv_show_name, lazy=True)  # queried only on a cache miss.
+
+        def search():
+            pipeline = ResultPipeline(stages=[english_names(), Dedupe()], top_k=search_top_k(limit, sort_by))
+            return pipeline.run(pages)
+
+        tv_shows = self.cached_results(
+            endpoint='search', query={'query': tv_show_name, 'sort_by': sort_by}, limit=limit, run=search
+        )
 
         logger.debug(f'found the following TV-shows: {tv_shows}')
         return tv_shows
@@ -62,64 +66,32 @@ class TheMovieDBTVShowService(TheMovieDBBaseService, ABC):
         with_status=None,
         not_released=None
     ):
-        def _set_up_body_request():
-            _filters = {'page': page}
-            if sort_by:
-                if sort_by == 'popularity':
-                    sort_by_value = 'popularity.desc'
-                elif sort_by == 'first_air_date':
-                    sort_by_value = 'first_air_date.desc'
-                else:  # sort_by == 'rating'
-                    sort_by_value = 'vote_average.desc'
-                _filters['sort_by'] = sort_by_value
-
-            if before_date:
-                if parsed_before_data := dateparser.parse(before_date):
-                    # log out what the date is before and after parsing
-                    _filters['first_air_date.lte'] = parsed_before_data.strftime('%Y-%m-%d')
-
-            if after_date:
-                if parsed_after_date := dateparser.parse(after_date):
-                    # log out what the date is before and after parsing
-                    _filters['first_air_date.gte'] = parsed_after_date.strftime('%Y-%m-%d')
-
-            if with_genres and (genre_ids := self.genre_names_to_ids(with_genres)):
-                _filters['with_genres'] = genre_ids
-
-            if without_genres and (genre_ids := self.genre_names_to_ids(without_genres)):
-                _filters['without_genres'] = genre_ids
-
-            if before_runtime:
-                _filters['with_runtime.lte'] = before_runtime
-
-            if after_runtime:
-                _filters['with_runtime.gte'] = after_runtime
-
-            return _filters
-
-        tv_shows = super().discover(**_set_up_body_request())
-
-        if not not_released:  # remove tv-shows which were not released yet or don't have any release-date.
-            tv_shows = [
-                tv_show for tv_show in tv_shows if tv_show.release_date and
-                dateparser.parse(tv_show.release_date).strftime('%Y-%m-%d') < datetime.now().strftime('%Y-%m-%d')
-            ]
-
-        if sort_by == 'popularity':
-            tv_shows = sorted(
-                tv_shows, key=lambda tv_show: (tv_show.release_date, tv_show.release_date is not None), reverse=True
-            )
-        elif sort_by == 'first_air_date':
-            tv_shows = sorted(
-                tv_shows, key=lambda tv_show: (tv_show.release_date, tv_show.release_date is not None), reverse=True
-            )
-        elif sort_by == 'rating':
-            tv_shows = sorted(
-                tv_shows, key=lambda tv_show: (tv_show.rating, tv_show.rating is not None), reverse=True
-            )
-
-        if len(tv_shows) > limit:
-            tv_shows = tv_shows[:limit]
+        query_plan = self.query_planner.plan(
+            self,
+            limit=limit,
+            sort_by=sort_by,
+            before_date=before_date,
+            after_date=after_date,
+            with_genres=with_genres,
+            without_genres=without_genres,
+            before_runtime=before_runtime,
+            after_runtime=after_runtime,
+            with_status=with_status,
+            not_released=not_released
+        )
+
+        def discover():
+            pages = self.discover_pages(query_plan)
+            results = query_plan.pipeline().run(pages)
+            logger.debug(f'queried {pages.fetched_pages} pages for {pages.total_results} records')
+            return results
+
+        tv_shows = self.cached_results(
+            endpoint='discover',
+            query={**query_plan.params, 'sort_by': sort_by, 'not_released': not_released},
+            limit=limit,
+            run=discover
+        )
 
         logger.debug(f'found the following TV-shows: {tv_shows}')
         return tv_shows
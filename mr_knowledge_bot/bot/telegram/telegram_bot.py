@@ -9,12 +9,21 @@ from telegram import Update, ParseMode, ReplyKeyboardRemove
 from mr_knowledge_bot.bot.telegram.telegram_click.decorator import command
 from mr_knowledge_bot.bot.telegram.telegram_click.argument import Argument, Selection, Flag
 from mr_knowledge_bot.bot.conversations import MovieConversation, TVShowConversation
+from mr_knowledge_bot.bot.services import MovieService, TVShowService
+from mr_knowledge_bot.bot.clients.deadline import Deadline
 from mr_knowledge_bot.bot.telegram.telegram_click import generate_command_list
 
 
 logger = logging.getLogger(__name__)
 
 
+# seconds that the api calls of a single command may take, after that the command answers with what it has.
+SEARCH_DEADLINE = float(os.getenv('TELEGRAM_SEARCH_DEADLINE', 8))
+DETAILS_DEADLINE = float(os.getenv('TELEGRAM_DETAILS_DEADLINE', 5))
+# discover commands past the records of a single query (MAX_RECORDS) are partitioned by their release dates.
+MAX_DISCOVER_LIMIT = int(os.getenv('TELEGRAM_MAX_DISCOVER_LIMIT', 1000))
+
+
 def error_handler(func):
     def wrapper(self, update: Update, context: CallbackContext, *args, **kwargs):
         try:
@@ -32,6 +41,21 @@ def error_handler(func):
     return wrapper
 
 
+def with_deadline(seconds):
+    """
+    Bounds the time that the api calls of the decorated command may take, see Deadline.
+
+    Args:
+        seconds (float): the budget of the command.
+    """
+    def decorator(func):
+        def wrapper(self, update: Update, context: CallbackContext, *args, **kwargs):
+            with Deadline(seconds=seconds):
+                return func(self, update, context, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
 class TelegramBot(BaseBot, ABC):
 
     def __init__(self, token=None):
@@ -102,11 +126,19 @@ class TelegramBot(BaseBot, ABC):
             for handler in handlers:
                 self._updater.dispatcher.add_handler(handler, group=group)
 
+    @staticmethod
+    def load_genres():
+        # genres are loaded once and refreshed in the background instead of being queried on every update.
+        MovieService.genre_registry.start()
+        TVShowService.genre_registry.start()
+
     def start(self):
+        self.load_genres()
         self._updater.start_polling()
         self._updater.idle()
 
     def start_webhook(self):
+        self.load_genres()
         self._updater.start_webhook(
             listen='0.0.0.0',
             port=int(os.getenv('PORT', 5000)),
@@ -173,6 +205,7 @@ class TelegramBot(BaseBot, ABC):
         ]
     )
     @error_handler
+    @with_deadline(seconds=SEARCH_DEADLINE)
     def find_movies_by_name_command(
         self, update: Update, context: CallbackContext, name: str, limit: int, sort_by: str
     ):
@@ -186,8 +219,8 @@ class TelegramBot(BaseBot, ABC):
         arguments=[
             Argument(
                 name=['limit', 'l'],
-                description='The maximum amount of movies to return, maximum is 100.',
-                validator=lambda x: 100 >= x > 0,
+                description=f'The maximum amount of movies to return, maximum is {MAX_DISCOVER_LIMIT}.',
+                validator=lambda x: MAX_DISCOVER_LIMIT >= x > 0,
                 optional=True,
                 type=int,
                 example='-l "80"',
@@ -257,6 +290,7 @@ class TelegramBot(BaseBot, ABC):
         ]
     )
     @error_handler
+    @with_deadline(seconds=SEARCH_DEADLINE)
     def discover_movies_command(
         self,
         update: Update,
@@ -288,6 +322,7 @@ class TelegramBot(BaseBot, ABC):
         return self._movie_conversation(update, context).query_movie_details()
 
     @error_handler
+    @with_deadline(seconds=DETAILS_DEADLINE)
     def display_movie_details(self, update: Update, context: CallbackContext):
         return self._movie_conversation(update, context).display_movie_details()
 
@@ -296,6 +331,7 @@ class TelegramBot(BaseBot, ABC):
         return self._movie_conversation(update, context).query_movie_trailer()
 
     @error_handler
+    @with_deadline(seconds=DETAILS_DEADLINE)
     def display_movie_trailer(self, update: Update, context: CallbackContext):
         return self._movie_conversation(update, context).display_movie_trailer()
 
@@ -332,6 +368,7 @@ class TelegramBot(BaseBot, ABC):
         ]
     )
     @error_handler
+    @with_deadline(seconds=SEARCH_DEADLINE)
     def find_tv_shows_by_name_command(
         self, update: Update, context: CallbackContext, name: str, limit: int, sort_by: str
     ):
@@ -345,8 +382,8 @@ class TelegramBot(BaseBot, ABC):
         arguments=[
             Argument(
                 name=['limit', 'l'],
-                description='The maximum amount of tv-shows to return, maximum is 100.',
-                validator=lambda x: 100 >= x > 0,
+                description=f'The maximum amount of tv-shows to return, maximum is {MAX_DISCOVER_LIMIT}.',
+                validator=lambda x: MAX_DISCOVER_LIMIT >= x > 0,
                 optional=True,
                 type=int,
                 example='-l "80"',
@@ -424,6 +461,7 @@ class TelegramBot(BaseBot, ABC):
         ]
     )
     @error_handler
+    @with_deadline(seconds=SEARCH_DEADLINE)
     def discover_tv_shows_command(
         self,
         update: Update,
@@ -457,6 +495,7 @@ class TelegramBot(BaseBot, ABC):
         return self._tv_show_conversation(update, context).query_tv_show_details()
 
     @error_handler
+    @with_deadline(seconds=DETAILS_DEADLINE)
     def display_tv_show_details(self, update: Update, context: CallbackContext):
         return self._tv_show_conversation(update, context).display_tv_show_details()
 
@@ -465,19 +504,23 @@ class TelegramBot(BaseBot, ABC):
         return self._tv_show_conversation(update, context).query_specific_tv_show_season()
 
     @error_handler
+    @with_deadline(seconds=DETAILS_DEADLINE)
     def display_tv_show_season(self, update: Update, context: CallbackContext):
         return self._tv_show_conversation(update, context).display_tv_show_season()
 
     @error_handler
+    @with_deadline(seconds=DETAILS_DEADLINE)
     def display_tv_show_trailer(self, update: Update, context: CallbackContext):
         return self._tv_show_conversation(update, context).display_tv_show_trailer()
 
     @command(name='get_movie_genres', description='Retrieves the available movies genres.')
     @error_handler
+    @with_deadline(seconds=DETAILS_DEADLINE)
     def get_movie_genres_command(self, update: Update, context: CallbackContext):
         return self._movie_conversation(update, context).get_genres()
 
     @command(name='get_tv_shows_genres', description='Retrieves the available TV-shows genres.')
     @error_handler
+    @with_deadline(seconds=DETAILS_DEADLINE)
     def get_tv_shows_genres_command(self, update: Update, context: CallbackContext):
         return self._tv_show_conversation(update, context).get_genres()
@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from mr_knowledge_bot.bot.clients import AsyncMovieClient, AsyncTVShowsClient
+from mr_knowledge_bot.bot.clients.base_client import ApiError
+from mr_knowledge_bot.bot.clients.http_session import get_async_session
+
+
+@pytest.fixture()
+def async_movie_client(fake_the_movie_db_server) -> AsyncMovieClient:
+    return AsyncMovieClient(token='token', base_url=fake_the_movie_db_server.base_url)
+
+
+def run(coroutine):
+    async def run_and_close_session():
+        try:
+            return await coroutine
+        finally:
+            await get_async_session().close()
+    return asyncio.run(run_and_close_session())
+
+
+def test_async_search_fetches_needed_pages_concurrently(fake_the_movie_db_server, async_movie_client):
+    """
+    Given:
+     - an api with 500 records over 25 pages, where every page takes a while to be answered.
+
+    When:
+     - searching for 100 movies with the asynchronous client.
+
+    Then:
+     - make sure only the 5 needed pages were queried.
+     - make sure the records keep the order of the pages.
+    """
+    fake_the_movie_db_server.latency = 0.05
+
+    movies = run(async_movie_client.search(movie_name='movie', limit=100))
+
+    assert [movie.id for movie in movies] == list(range(1, 101))
+    assert fake_the_movie_db_server.count('/search/movie') == 5
+
+
+def test_async_get_many_details(mocker, fake_the_movie_db_server):
+    """
+    Given:
+     - several tv-show ids.
+
+    When:
+     - querying all their details at once with the asynchronous client.
+
+    Then:
+     - make sure the details are returned in the order of the ids.
+     - make sure an api error is raised the same way as the synchronous client does.
+    """
+    client = AsyncTVShowsClient(token='token', base_url=fake_the_movie_db_server.base_url)
+
+    tv_shows = run(client.get_many_details(ids=[3, 1, 2]))
+    assert [tv_show.id for tv_show in tv_shows] == [3, 1, 2]
+
+    mocker.patch.object(fake_the_movie_db_server, 'respond', return_value=(404, {'status_message': 'not found'}))
+    with pytest.raises(ApiError, match='not found'):
+        run(client.get_details(_id=4))
+
+
+def test_session_of_a_previous_event_loop_is_closed(fake_the_movie_db_server, async_movie_client):
+    """
+    Given:
+     - an asynchronous session that was used by a previous event loop.
+
+    When:
+     - querying from a new event loop.
+
+    Then:
+     - make sure the session of the previous event loop was closed instead of leaked.
+    """
+    asyncio.run(async_movie_client.get_details(_id=1))
+    previous_session = get_async_session()._session
+
+    run(async_movie_client.get_details(_id=2))
+
+    assert previous_session.closed
@@ -0,0 +1,40 @@
+import json
+
+import pytest
+import requests
+
+from mr_knowledge_bot.bot.clients import base_client
+from mr_knowledge_bot.bot.clients.base_client import parse_response, ApiError
+from mr_knowledge_bot.bot.entites.the_movie_db.genre_entity import GenreEntity
+
+
+def http_response(status_code, body):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = body
+    return response
+
+
+def test_response_body_is_decoded_once_by_the_json_decoder(mocker):
+    """
+    Given:
+     - a json decoder that is set instead of the default one.
+     - a genres response and an error response whose body is not json.
+
+    When:
+     - parsing the genres response into entities and then into json, and parsing the error response.
+
+    Then:
+     - make sure the body of the genres response was decoded once, by the json decoder that was set.
+     - make sure the error response raises an ApiError with the body.
+    """
+    loads = mocker.Mock(wraps=json.loads)
+    mocker.patch.object(base_client, 'json_loads', loads)
+    response = http_response(200, b'{"genres": [{"id": 28, "name": "Action"}]}')
+
+    assert [genre.name for genre in parse_response(response, _class_type=GenreEntity)] == ['Action']
+    assert parse_response(response, response_type='json', keys=['genres', 0, 'id']) == 28
+    loads.assert_called_once_with(response.content)
+
+    with pytest.raises(ApiError, match='Bad Gateway'):
+        parse_response(http_response(502, b'Bad Gateway'), _class_type=GenreEntity)
@@ -0,0 +1,29 @@
+from mr_knowledge_bot.bot.clients.cache import TTLCache
+
+
+def test_ttl_cache_evicts_least_recently_used_and_expired_entries():
+    """
+    Given:
+     - a cache that holds at most two entries.
+
+    When:
+     - adding three entries after reading the first one, and adding an entry that expires immediately.
+
+    Then:
+     - make sure the least recently used entry was evicted.
+     - make sure the expired entry is not returned, but is kept as a stale entry.
+    """
+    cache = TTLCache(max_size=2)
+    cache.set('a', 1, ttl=60)
+    cache.set('b', 2, ttl=60)
+    assert cache.get('a') == 1
+    cache.set('c', 3, ttl=60)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+
+    cache.set('d', 4, ttl=0)
+    assert cache.get('d') is None
+    assert cache.get_stale('d') == 4
+    assert cache.stats() == {'size': 2, 'max_size': 2, 'hits': 3, 'misses': 2, 'evictions': 2}
@@ -0,0 +1,106 @@
+import time
+
+import pytest
+
+from mr_knowledge_bot.bot.clients import MovieClient
+from mr_knowledge_bot.bot.clients.base_client import ApiError
+from mr_knowledge_bot.bot.clients.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+
+def test_circuit_breaker_opens_and_recovers():
+    """
+    Given:
+     - a circuit breaker that opens after two failed calls.
+
+    When:
+     - two calls fail, then a call is attempted while it is open, then a probe call succeeds after the reset timeout.
+
+    Then:
+     - make sure the breaker rejects calls while it is open.
+     - make sure the breaker closes once the probe call succeeds.
+     - make sure slow calls are counted as failures.
+    """
+    breaker = CircuitBreaker(failure_threshold=2, slow_call_duration=0.05, reset_timeout=0.1)
+    breaker.record(duration=0.01, failed=True)
+    breaker.record(duration=0.06)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: 'result')
+
+    time.sleep(0.1)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.call(lambda: 'result') == 'result'
+    assert breaker.stats() == {
+        'state': CircuitBreaker.CLOSED,
+        'consecutive_failures': 0,
+        'failures': 2,
+        'slow_calls': 1,
+        'rejected_calls': 1,
+        'opened': 1,
+        'stale_served': 0
+    }
+
+
+def test_stale_entities_are_served_while_the_api_is_down(mocker, fake_the_movie_db_server):
+    """
+    Given:
+     - a movie whose cached details have expired.
+     - an api that answers every request with an internal error.
+
+    When:
+     - querying the movie until the breaker opens, and querying a movie that was never cached.
+
+    Then:
+     - make sure the stale details are served and refreshed in the background.
+     - make sure the breaker opens and stops sending requests to the api.
+     - make sure the movie that was never cached fails.
+    """
+    mocker.patch.object(MovieClient, 'circuit_breaker', CircuitBreaker(failure_threshold=2, reset_timeout=60))
+    submit = mocker.patch.object(MovieClient.stale_refresher, 'submit')
+    client = MovieClient(token='token', base_url=fake_the_movie_db_server.base_url)
+    movie = client.get_details(_id=12)
+    MovieClient.entity_cache.set(('details', 'movie', '12', None), movie, ttl=0)
+
+    mocker.patch.object(fake_the_movie_db_server, 'respond', return_value=(500, {'status_code': 11}))
+    for _ in range(3):
+        assert client.get_details(_id=12) is movie
+
+    assert fake_the_movie_db_server.count('/movie/12') == 3
+    assert submit.call_args.args[0] == ('details', 'movie', '12', None)
+    assert client.circuit_breaker.stats()['state'] == CircuitBreaker.OPEN
+    assert client.circuit_breaker.stats()['stale_served'] == 3
+
+    with pytest.raises(CircuitOpenError):
+        client.get_details(_id=13)
+    assert fake_the_movie_db_server.count('/movie/13') == 0
+
+
+def test_client_errors_are_not_treated_as_unavailability(mocker, fake_the_movie_db_server):
+    """
+    Given:
+     - a movie whose cached details have expired.
+     - an api that rejects every request (401).
+
+    When:
+     - querying the movie more times than the breaker allows failures.
+
+    Then:
+     - make sure the error of the api is raised instead of serving the stale details.
+     - make sure the breaker stays closed.
+    """
+    mocker.patch.object(MovieClient, 'circuit_breaker', CircuitBreaker(failure_threshold=2, reset_timeout=60))
+    client = MovieClient(token='token', base_url=fake_the_movie_db_server.base_url)
+    movie = client.get_details(_id=12)
+    MovieClient.entity_cache.set(('details', 'movie', '12', None), movie, ttl=0)
+
+    mocker.patch.object(
+        fake_the_movie_db_server, 'respond', return_value=(401, {'status_code': 7, 'status_message': 'Invalid API key'})
+    )
+    for _ in range(3):
+        with pytest.raises(ApiError, match='Invalid API key'):
+            client.get_details(_id=12)
+
+    assert fake_the_movie_db_server.count('/movie/12') == 4
+    assert client.circuit_breaker.stats()['state'] == CircuitBreaker.CLOSED
+    assert client.circuit_breaker.stats()['stale_served'] == 0
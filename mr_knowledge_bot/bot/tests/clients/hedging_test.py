@@ -0,0 +1,94 @@
+import time
+
+from mr_knowledge_bot.bot.clients import MovieClient
+from mr_knowledge_bot.bot.clients.hedging import Hedger, MIN_SAMPLES
+
+
+def test_slow_requests_are_hedged(mocker, fake_the_movie_db_server):
+    """
+    Given:
+     - a hedger that already observed fast responses, and allows to hedge every request.
+     - an api that answers the first request of a movie after 1 second.
+
+    When:
+     - querying the movie.
+
+    Then:
+     - make sure a duplicate request was sent and its (fast) response was returned without waiting for the
+       original request.
+     - make sure the hedge win is counted.
+    """
+    hedger = Hedger(enabled=True, percentile=90, max_hedge_ratio=1)
+    for _ in range(MIN_SAMPLES):
+        hedger.latencies.record(0.01)
+    mocker.patch.object(MovieClient, 'hedger', hedger)
+
+    respond = fake_the_movie_db_server.respond
+
+    def slow_first_response(path, query):
+        if fake_the_movie_db_server.count(path) == 1:
+            time.sleep(1)
+        return respond(path, query)
+
+    mocker.patch.object(fake_the_movie_db_server, 'respond', side_effect=slow_first_response)
+    client = MovieClient(token='token', base_url=fake_the_movie_db_server.base_url)
+
+    start = time.monotonic()
+    movie = client.get_details(_id=5)
+
+    assert movie.id == 5
+    assert time.monotonic() - start < 0.5
+    assert fake_the_movie_db_server.count('/movie/5') == 2
+    assert hedger.stats()['hedge_wins'] == 1
+
+
+def test_hedge_ratio_is_capped():
+    """
+    Given:
+     - a hedger that can hedge at most 10% of the requests, with slow observed latencies.
+
+    When:
+     - calling 10 requests that are slower than the hedge delay.
+
+    Then:
+     - make sure only one request was hedged.
+    """
+    hedger = Hedger(enabled=True, percentile=50, max_hedge_ratio=0.1)
+    for _ in range(MIN_SAMPLES):
+        hedger.latencies.record(0.001)
+
+    for _ in range(10):
+        hedger.call(lambda: time.sleep(0.05))
+
+    assert hedger.stats()['requests'] == 10
+    assert hedger.stats()['hedged'] == 1
+
+
+def test_slow_request_that_succeeds_loses_to_the_hedge():
+    """
+    Given:
+     - a hedger that allows to hedge every request, with fast observed latencies.
+
+    When:
+     - calling a request that is slow (but succeeds) the first time and fast the second time.
+
+    Then:
+     - make sure the answer of the hedge is returned without waiting for the original request.
+     - make sure the hedge win is counted.
+    """
+    hedger = Hedger(enabled=True, percentile=50, max_hedge_ratio=1)
+    for _ in range(MIN_SAMPLES):
+        hedger.latencies.record(0.001)
+    calls = []
+
+    def request():
+        calls.append(len(calls))
+        if len(calls) == 1:
+            time.sleep(0.5)
+            return 'original'
+        return 'hedge'
+
+    start = time.monotonic()
+    assert hedger.call(request) == 'hedge'
+    assert time.monotonic() - start < 0.3
+    assert hedger.stats()['hedge_wins'] == 1
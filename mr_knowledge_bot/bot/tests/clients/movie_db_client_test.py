@@ -0,0 +1,318 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from mr_knowledge_bot.bot.clients import MovieClient, TVShowsClient
+from mr_knowledge_bot.bot.clients import http_session
+from mr_knowledge_bot.bot.clients.deadline import Deadline, DeadlineExceeded
+from mr_knowledge_bot.bot.clients.the_movie_db.movie_db_base_client import canonical_query, PageIterator
+from mr_knowledge_bot.bot.entites.the_movie_db.base import TheMovieDBResults
+from mr_knowledge_bot.bot.entites.the_movie_db.movie_entity import TheMovieDBMovieEntity
+
+
+@pytest.fixture()
+def movie_client(fake_the_movie_db_server) -> MovieClient:
+    http_session.reset_session()
+    yield MovieClient(token='token', base_url=fake_the_movie_db_server.base_url)
+    http_session.reset_session()
+
+
+def test_clients_share_pooled_session(fake_the_movie_db_server, movie_client):
+    """
+    Given:
+     - a movie client and a tv-show client.
+
+    When:
+     - sending requests from both clients.
+
+    Then:
+     - make sure both clients use the same process-wide session.
+     - make sure the requests are sent with the session's default timeout.
+    """
+    tv_shows_client = TVShowsClient(token='token', base_url=fake_the_movie_db_server.base_url)
+    assert movie_client.session is tv_shows_client.session
+
+    response = movie_client.get(url='/genre/movie/list')
+    assert response.status_code == 200
+    assert tv_shows_client.get(url='/genre/tv/list').status_code == 200
+    assert fake_the_movie_db_server.count() == 2
+    assert movie_client.session.timeout == (http_session.DEFAULT_CONNECT_TIMEOUT, http_session.DEFAULT_READ_TIMEOUT)
+
+
+def test_search_fetches_pages_concurrently_in_order(fake_the_movie_db_server, movie_client):
+    """
+    Given:
+     - an api with 500 records over 25 pages, where every page takes a while to be answered.
+
+    When:
+     - searching for movies.
+
+    Then:
+     - make sure all the pages were queried exactly once.
+     - make sure the records keep the order of the pages without duplicates.
+    """
+    fake_the_movie_db_server.latency = 0.05
+
+    movies = movie_client.search(movie_name='movie')
+
+    assert [movie.id for movie in movies] == list(range(1, 501))
+    assert fake_the_movie_db_server.count('/search/movie') == 25
+    assert sorted(int(query['page']) for _, query in fake_the_movie_db_server.requests) == list(range(1, 26))
+
+
+@pytest.mark.parametrize('limit, expected_pages', [(5, 1), (20, 1), (30, 2), (100, 5)])
+def test_search_stops_once_limit_is_satisfied(fake_the_movie_db_server, movie_client, limit, expected_pages):
+    """
+    Given:
+     - an api with 500 records over 25 pages.
+
+    When:
+     - searching for movies with a limit.
+
+    Then:
+     - make sure only the pages needed for the limit were queried.
+    """
+    movies = movie_client.search(movie_name='movie', limit=limit)
+
+    assert [movie.id for movie in movies] == list(range(1, limit + 1))
+    assert fake_the_movie_db_server.count('/search/movie') == expected_pages
+
+
+def test_details_and_videos_are_cached(fake_the_movie_db_server, movie_client):
+    """
+    Given:
+     - the details and videos of a movie which were already queried.
+
+    When:
+     - querying them again, from another client instance and with another language.
+
+    Then:
+     - make sure the videos were queried within the details request.
+     - make sure the cached entities are returned without querying the api again.
+     - make sure a different language is cached separately.
+     - make sure the cache counted the hits and misses.
+    """
+    details = movie_client.get_details(_id=10)
+    videos = movie_client.get_videos(_id=10)
+    assert [str(video) for video in videos] == ['https://www.youtube.com/watch?v=key-10']
+
+    another_client = MovieClient(token='token', base_url=fake_the_movie_db_server.base_url)
+    assert another_client.get_details(_id=10) is details
+    assert another_client.get_videos(_id=10) is videos
+    assert fake_the_movie_db_server.count() == 1
+
+    another_client.get_details(_id=10, language='de')
+    assert fake_the_movie_db_server.count('/movie/10') == 2
+
+    stats = MovieClient.entity_cache.stats()
+    assert stats['hits'] == 3
+    assert stats['misses'] == 2
+    assert stats['evictions'] == 0
+
+
+def test_equivalent_searches_are_served_from_results_cache(fake_the_movie_db_server, movie_client):
+    """
+    Given:
+     - a search for 40 movies that was already done.
+
+    When:
+     - searching again with a different case/whitespaces and a smaller limit.
+     - searching again with a bigger limit.
+
+    Then:
+     - make sure the equivalent search is rehydrated from the cache without querying the api.
+     - make sure the search with the bigger limit queries the api again.
+    """
+    movies = movie_client.search(movie_name='the  batman', limit=40)
+    assert fake_the_movie_db_server.count() == 2
+
+    cached_movies = movie_client.search(movie_name=' The Batman ', limit=20)
+    assert cached_movies == movies[:20]
+    assert fake_the_movie_db_server.count() == 2
+
+    assert len(movie_client.search(movie_name='the batman', limit=60)) == 60
+    assert fake_the_movie_db_server.count() == 5
+
+
+def test_canonical_query():
+    """
+    Given:
+     - two discover queries that differ only by the parameters order, genre ids order, case and page.
+
+    When:
+     - building their canonical form.
+
+    Then:
+     - make sure both queries have the same canonical form.
+    """
+    assert canonical_query({'sort_by': 'popularity.desc', 'with_genres': [28, 12], 'page': 1}) == canonical_query(
+        {'with_genres': [12, 28], 'sort_by': 'Popularity.desc ', 'page': 3}
+    )
+
+
+def test_concurrent_identical_requests_share_one_request(fake_the_movie_db_server, movie_client):
+    """
+    Given:
+     - an api which takes a while to answer.
+
+    When:
+     - querying the details of the same movie from several threads at the same time.
+
+    Then:
+     - make sure the api got only one request.
+     - make sure all the threads received the decoded movie.
+    """
+    fake_the_movie_db_server.latency = 0.2
+    barrier = threading.Barrier(10)
+
+    def get_details():
+        barrier.wait()
+        return movie_client.get_details(_id=7)
+
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        movies = list(executor.map(lambda _: get_details(), range(10)))
+
+    assert fake_the_movie_db_server.count('/movie/7') == 1
+    assert all(movie.id == 7 for movie in movies)
+    assert MovieClient.single_flight.stats()['in_flight'] == 0
+
+
+def test_waiting_for_an_identical_request_is_bounded_by_the_deadline(fake_the_movie_db_server, movie_client):
+    """
+    Given:
+     - an api which takes a second to answer, and a request of a movie that is already in flight.
+
+    When:
+     - querying the same movie with a deadline of 0.1 seconds.
+
+    Then:
+     - make sure the caller stops waiting for the request in flight once its deadline is exceeded.
+    """
+    fake_the_movie_db_server.latency = 1
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        leader = executor.submit(movie_client.get_details, _id=7)
+        while MovieClient.single_flight.stats()['in_flight'] == 0:
+            time.sleep(0.01)
+
+        start = time.monotonic()
+        with Deadline(seconds=0.1), pytest.raises(DeadlineExceeded):
+            movie_client.get_details(_id=7)
+        assert time.monotonic() - start < 0.5
+        assert leader.result().id == 7
+
+    assert fake_the_movie_db_server.count('/movie/7') == 1
+
+
+def test_rate_limited_request_is_retried_after_retry_after(mocker, fake_the_movie_db_server, movie_client):
+    """
+    Given:
+     - an api that rate limits the first request with a Retry-After header.
+
+    When:
+     - querying the details of a movie.
+
+    Then:
+     - make sure the request was retried after the Retry-After delay and the movie was returned.
+    """
+    respond = fake_the_movie_db_server.respond
+    mocker.patch.object(
+        fake_the_movie_db_server,
+        'respond',
+        side_effect=[(429, {'status_code': 25}, {'Retry-After': '0.2'}), respond('/movie/3', {})]
+    )
+
+    start = time.monotonic()
+    movie = movie_client.get_details(_id=3)
+
+    assert movie.id == 3
+    assert fake_the_movie_db_server.count('/movie/3') == 2
+    assert time.monotonic() - start >= 0.2
+
+
+def test_pagination_returns_partial_results_when_the_deadline_is_exceeded(fake_the_movie_db_server, movie_client):
+    """
+    Given:
+     - an api that takes 0.2 seconds to answer each page.
+     - a command deadline of 0.3 seconds.
+
+    When:
+     - searching for 100 movies (5 pages).
+
+    Then:
+     - make sure only the records of the first page are returned, without waiting for the rest of the pages.
+     - make sure the partial results are not cached.
+     - make sure a search without any budget left fails.
+    """
+    fake_the_movie_db_server.latency = 0.2
+    start = time.monotonic()
+    with Deadline(seconds=0.3):
+        movies = movie_client.search(movie_name='movie', limit=100)
+
+    assert [movie.id for movie in movies] == list(range(1, 21))
+    assert time.monotonic() - start < 0.4
+    assert len(movie_client.results_cache) == 0
+
+    with Deadline(seconds=0), pytest.raises(DeadlineExceeded):
+        movie_client.search(movie_name='movie', limit=100)
+
+
+def test_first_wave_keeps_the_pages_fetched_before_the_deadline():
+    """
+    Given:
+     - a first wave of 3 concurrent pages, where the deadline is exceeded while querying the second page.
+
+    When:
+     - iterating over the records.
+
+    Then:
+     - make sure the records of the first page are returned instead of failing.
+    """
+    def fetch_page(page):
+        if page > 1:
+            raise DeadlineExceeded('The deadline was exceeded')
+        return TheMovieDBResults(
+            [TheMovieDBMovieEntity.decode({'id': _id, 'title': f'Movie {_id}'}) for _id in range(1, 21)],
+            page=page, total_pages=5, total_results=100
+        )
+
+    pages = PageIterator(fetch_page=fetch_page, limit=100)
+    pages.first_pages = 3
+
+    assert [movie.id for movie in pages] == list(range(1, 21))
+    assert pages.deadline_exceeded
+
+
+def test_waves_are_bounded_by_the_estimated_pages():
+    """
+    Given:
+     - a query of 50 pages that a plan estimated 3 pages for, whose first wave queried a single page.
+
+    When:
+     - iterating over the records while more records than the estimated pages hold are wanted.
+
+    Then:
+     - make sure the second wave stops at the estimated pages, and only the waves after it go past them.
+    """
+    waves = []
+
+    def fetch_page(page):
+        waves.append(page)
+        ids = range(page * 20 - 19, page * 20 + 1)
+        return TheMovieDBResults(
+            [TheMovieDBMovieEntity.decode({'id': _id, 'title': f'Movie {_id}'}) for _id in ids],
+            page=page, total_pages=50, total_results=1000
+        )
+
+    pages = PageIterator(fetch_page=fetch_page, limit=1000).prefetch()
+    pages.estimated_pages = 3
+    pages.wanted = 200
+
+    records = iter(pages)
+    for _ in range(21):
+        next(records)
+    assert sorted(waves) == [1, 2, 3]
+    for _ in range(40):
+        next(records)
+    assert len(waves) > 3
@@ -0,0 +1,29 @@
+import time
+
+from mr_knowledge_bot.bot.clients.rate_limiter import TokenBucketRateLimiter
+
+
+def test_token_bucket_throttles_after_burst():
+    """
+    Given:
+     - a rate limiter of 20 requests per second with a burst of 2.
+
+    When:
+     - acquiring 4 tokens at once.
+
+    Then:
+     - make sure the first 2 tokens were acquired without waiting.
+     - make sure the rest waited for the bucket to refill and the wait was counted.
+    """
+    rate_limiter = TokenBucketRateLimiter(rate=20, burst=2)
+
+    start = time.monotonic()
+    waits = [rate_limiter.acquire() for _ in range(4)]
+
+    assert waits[:2] == [0, 0]
+    assert all(wait > 0 for wait in waits[2:])
+    assert time.monotonic() - start >= 0.09
+    stats = rate_limiter.stats()
+    assert stats['acquired'] == 4
+    assert stats['throttled'] == 2
+    assert stats['max_wait'] > 0
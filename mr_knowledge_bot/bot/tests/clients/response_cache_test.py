@@ -0,0 +1,103 @@
+import sqlite3
+
+import pytest
+
+from mr_knowledge_bot.bot.clients import MovieClient
+from mr_knowledge_bot.bot.clients.response_cache import SQLiteResponseCache
+
+
+@pytest.fixture()
+def cache_path(tmp_path):
+    return str(tmp_path / 'responses.sqlite')
+
+
+def cached_movie_url(cache_path):
+    with sqlite3.connect(cache_path) as connection:
+        return connection.execute("SELECT url FROM responses WHERE key LIKE '/movie/12%'").fetchone()[0]
+
+
+def test_responses_survive_a_restart(mocker, fake_the_movie_db_server, cache_path):
+    """
+    Given:
+     - a persistent response cache that was filled by a previous process.
+
+    When:
+     - a new process (new cache instance and empty in-memory caches) queries the same movie.
+
+    Then:
+     - make sure the movie is served from the persistent cache without querying the api.
+     - make sure the api key is not stored in the cache.
+    """
+    mocker.patch.object(MovieClient, 'response_cache', SQLiteResponseCache(path=cache_path))
+    client = MovieClient(token='secret-token', base_url=fake_the_movie_db_server.base_url)
+    movie = client.get_details(_id=12)
+
+    MovieClient.entity_cache.clear()
+    mocker.patch.object(MovieClient, 'response_cache', SQLiteResponseCache(path=cache_path))
+    cached_movie = client.get_details(_id=12)
+
+    assert cached_movie.to_dict() == movie.to_dict()
+    assert fake_the_movie_db_server.count('/movie/12') == 1
+    assert MovieClient.response_cache.stats()['hits'] == 1
+    for path in (cache_path, f'{cache_path}-wal'):  # the rows might still be in the write-ahead log.
+        with open(path, 'rb') as cache_file:
+            assert b'secret-token' not in cache_file.read()
+    assert 'secret-token' not in cached_movie_url(cache_path)
+
+
+def test_least_recently_used_responses_are_evicted_by_size(fake_the_movie_db_server, cache_path):
+    """
+    Given:
+     - a persistent response cache that can hold about two search pages.
+
+    When:
+     - storing three search pages, after reading the first one.
+
+    Then:
+     - make sure the least recently used page was evicted and the size is kept under the cap.
+    """
+    client = MovieClient(token='token', base_url=fake_the_movie_db_server.base_url)
+    responses = [client._send(url='/search/movie', params={'query': 'a', 'page': page}) for page in (1, 2, 3)]
+    max_bytes = max(len(SQLiteResponseCache._compress(response.content)) for response in responses) * 2 + 10
+    cache = SQLiteResponseCache(path=cache_path, max_bytes=max_bytes)
+
+    cache.set('1', url='/search/movie', http_response=responses[0])
+    cache.set('2', url='/search/movie', http_response=responses[1])
+    assert cache.get('1') is not None
+    cache.set('3', url='/search/movie', http_response=responses[2])
+
+    assert cache.get('2') is None
+    assert cache.get('1') is not None
+    assert cache.stats()['evictions'] == 1
+    assert cache.stats()['bytes'] <= max_bytes
+
+
+def test_expired_responses_are_revalidated(mocker, fake_the_movie_db_server, cache_path):
+    """
+    Given:
+     - a persistent response cache with an expired details response.
+
+    When:
+     - querying the same movie again, while the api says that it was not modified.
+
+    Then:
+     - make sure the request carried the ETag of the cached response and the cached body is served.
+     - make sure the response is fresh again, so the next query does not reach the api.
+    """
+    cache = SQLiteResponseCache(path=cache_path)
+    mocker.patch.object(MovieClient, 'response_cache', cache)
+    client = MovieClient(token='token', base_url=fake_the_movie_db_server.base_url)
+    movie = client.get_details(_id=12)
+
+    MovieClient.entity_cache.clear()
+    cache._connection.execute('UPDATE responses SET expires_at = 0')
+    send = mocker.spy(client, '_send')
+    revalidated_movie = client.get_details(_id=12)
+
+    assert revalidated_movie.to_dict() == movie.to_dict()
+    assert send.call_args.kwargs['headers']['If-None-Match']
+    assert cache.stats()['revalidations'] == 1
+
+    MovieClient.entity_cache.clear()
+    client.get_details(_id=12)
+    assert fake_the_movie_db_server.count('/movie/12') == 2
@@ -1,8 +1,26 @@
+import json
+import hashlib
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qsl
 from typing import cast
 import pytest
 from unittest.mock import MagicMock
 from telegram import Bot, Document, File, Message, PhotoSize, Update, User, CallbackQuery
 from telegram.ext import CallbackContext
+from mr_knowledge_bot.bot.clients.the_movie_db.movie_db_base_client import TheMovieDBBaseClient
+from mr_knowledge_bot.bot.entites.the_movie_db.genre_entity import genre_table
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    yield
+    TheMovieDBBaseClient.entity_cache.clear()
+    TheMovieDBBaseClient.results_cache.clear()
+    TheMovieDBBaseClient.circuit_breaker.reset()
+    genre_table.clear()
 
 
 @pytest.fixture(name="telegram_user")
@@ -41,3 +59,166 @@ def telegram_update(telegram_message: Message, callback_query: CallbackQuery) ->
 @pytest.fixture
 def telegram_context() -> CallbackContext:
     return cast(CallbackContext, MagicMock())
+
+
+class FakeTheMovieDBServer:
+    """
+    A local http server that mimics the parts of the TMDB api that the bot uses, counts the requests it gets.
+
+    Args:
+        total_results (int): how many records the search/discover endpoints hold.
+        latency (float): how many seconds to wait before answering each request.
+    """
+    page_size = 20
+
+    def __init__(self, total_results=500, latency=0.0):
+        self.total_results = total_results
+        self.latency = latency
+        self.requests = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._server.handle_error = lambda request, client_address: None  # clients that gave up on a response.
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address
+        return f'http://{host}:{port}'
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def count(self, path=None):
+        with self._lock:
+            return len([request_path for request_path, _ in self.requests if path is None or request_path == path])
+
+    def page(self, page, title_prefix='Movie'):
+        total_pages = -(-self.total_results // self.page_size)
+        first_id = (page - 1) * self.page_size + 1
+        last_id = min(page * self.page_size, self.total_results)
+        results = [
+            {
+                'id': _id,
+                'title': f'{title_prefix} {_id}',
+                'name': f'{title_prefix} {_id}',
+                'release_date': f'{2000 + _id % 20}-01-{1 + _id % 28:02d}',
+                'first_air_date': f'{2000 + _id % 20}-01-{1 + _id % 28:02d}',
+                'genre_ids': [28, 12],
+                'overview': f'overview of {_id}',
+                'popularity': float(_id % 97),
+                'vote_average': float(_id % 10),
+            } for _id in range(first_id, last_id + 1)
+        ] if page <= total_pages else []
+        return {'page': page, 'results': results, 'total_pages': total_pages, 'total_results': self.total_results}
+
+    @staticmethod
+    def videos(_id):
+        return {
+            'results': [
+                {
+                    'id': f'video-{_id}',
+                    'name': 'Official Trailer',
+                    'type': 'Trailer',
+                    'key': f'key-{_id}',
+                    'site': 'YouTube',
+                    'official': True,
+                    'published_at': '2020-01-01T00:00:00.000Z'
+                }
+            ]
+        }
+
+    def respond(self, path, query):
+        if path in ('/search/movie', '/discover/movie', '/search/tv', '/discover/tv'):
+            return 200, self.page(int(query.get('page', 1)))
+        if path in ('/genre/movie/list', '/genre/tv/list'):
+            return 200, {'genres': [{'id': 28, 'name': 'Action'}, {'id': 12, 'name': 'Adventure'}]}
+        parts = path.strip('/').split('/')
+        if len(parts) == 2 and parts[0] in ('movie', 'tv'):
+            details = {'id': int(parts[1]), 'title': f'Movie {parts[1]}', 'name': f'Movie {parts[1]}'}
+            if 'videos' in query.get('append_to_response', '').split(','):
+                details['videos'] = self.videos(int(parts[1]))
+            return 200, details
+        if len(parts) == 3 and parts[0] in ('movie', 'tv') and parts[2] == 'videos':
+            return 200, {'id': int(parts[1]), **self.videos(int(parts[1]))}
+        return 404, {'status_code': 34, 'status_message': 'The resource you requested could not be found.'}
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                parsed_url = urlparse(self.path)
+                query = dict(parse_qsl(parsed_url.query))
+                with server._lock:
+                    server.requests.append((parsed_url.path, query))
+                if server.latency:
+                    time.sleep(server.latency)
+                status, body, *headers = server.respond(parsed_url.path, query)
+                payload = json.dumps(body).encode()
+                etag = f'"{hashlib.md5(payload).hexdigest()}"'
+                if status == 200 and self.headers.get('If-None-Match') == etag:
+                    status, payload = 304, b''
+                self.send_response(status)
+                for name, value in (headers[0] if headers else {}).items():
+                    self.send_header(name, value)
+                self.send_header('ETag', etag)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+@pytest.fixture()
+def fake_the_movie_db_server() -> FakeTheMovieDBServer:
+    server = FakeTheMovieDBServer().start()
+    yield server
+    server.stop()
+
+
+def non_english_titles(response):
+    for result in response['results'][::2]:
+        result['title'] = 'סרט'
+
+
+def unreleased_movies(response):
+    response['results'][0]['release_date'] = (date.today() + timedelta(days=1)).isoformat()
+    response['results'][1]['release_date'] = ''
+
+
+PAGE_MUTATORS = {
+    'non english titles': non_english_titles,  # every second movie has a non english title.
+    'unreleased movies': unreleased_movies  # the first movie is released tomorrow, the second has no release date.
+}
+
+
+@pytest.fixture()
+def mutate_pages(mocker, fake_the_movie_db_server):
+    """
+    Returns a function that mutates every search/discover page of the fake api by the name of a mutator (see
+    PAGE_MUTATORS).
+    """
+    page = fake_the_movie_db_server.page
+
+    def _mutate_pages(mutator_name):
+        def mutated_page(page_number, *args, **kwargs):
+            response = page(page_number, *args, **kwargs)
+            PAGE_MUTATORS[mutator_name](response)
+            return response
+
+        mocker.patch.object(fake_the_movie_db_server, 'page', side_effect=mutated_page)
+
+    return _mutate_pages
@@ -0,0 +1,71 @@
+import pickle
+
+from mr_knowledge_bot.bot.entites.the_movie_db.genre_entity import genre_table
+from mr_knowledge_bot.bot.entites.the_movie_db.movie_entity import TheMovieDBMovieEntity
+from mr_knowledge_bot.bot.entites.the_movie_db.tv_show_entity import TheMovieDBTVShowEntity
+from mr_knowledge_bot.bot.entites.the_movie_db.video_entity import VideoEntity
+
+
+def test_derived_fields_are_decoded_on_first_access():
+    """
+    Given:
+     - a movie details response with a runtime and videos, and a tv-show response with seasons.
+
+    When:
+     - decoding the responses into entities.
+
+    Then:
+     - make sure no derived field was decoded before it was accessed.
+     - make sure the derived fields are decoded once accessed, and survive pickling (conversations keep entities).
+    """
+    movie = TheMovieDBMovieEntity.from_response(
+        {'id': 1, 'title': 'Movie', 'runtime': 90, 'videos': {'results': []}, 'genres': [28]}
+    )
+    tv_show = TheMovieDBTVShowEntity.from_response(
+        {'id': 2, 'name': 'Show', 'seasons': [{'id': 3, 'name': 'Season 1', 'season_number': 1}]}
+    )
+    assert movie._decoded == tv_show._decoded == 0
+
+    assert movie.runtime == '1:30:00'
+    assert movie.videos == []
+    assert [season.name for season in tv_show.seasons] == ['Season 1']
+    assert pickle.loads(pickle.dumps(movie)).to_dict() == movie.to_dict() == {
+        'id': 1,
+        'name': 'Movie',
+        'release_date': None,
+        'release_ordinal': None,
+        'genres': [{'id': 28, 'name': None}],
+        'genre_mask': genre_table.bit(28),
+        'overview': None,
+        'popularity': None,
+        'rating': None,
+        'homepage': None,
+        'status': None,
+        'runtime': '1:30:00',
+        'videos': []
+    }
+
+
+def test_generated_decoder_matches_the_constructor():
+    """
+    Given:
+     - a movie search result (genre ids) and a video whose site is missing.
+
+    When:
+     - decoding them by the generated decoders of the entities.
+
+    Then:
+     - make sure the entities equal the ones built by their constructors.
+     - make sure the converters of the video fields are null-safe.
+    """
+    movie = TheMovieDBMovieEntity.decode(
+        {'id': 1, 'title': 'Movie', 'release_date': '2020-01-01', 'genre_ids': [28], 'vote_average': 7.5}
+    )
+    assert movie._decoded == 0
+    assert movie.to_dict() == TheMovieDBMovieEntity(
+        _id=1, name='Movie', release_date='2020-01-01', genres=[28], overview=None, popularity=None, rating=7.5,
+        homepage=None, status=None, runtime=None
+    ).to_dict()
+
+    video = VideoEntity.decode({'id': 'a', 'name': 'Trailer', 'type': 'Trailer', 'key': 'k', 'official': True})
+    assert (video.type, video.site, video.is_official) == ('trailer', None, True)
@@ -58,7 +58,8 @@ def test_find_movies_by_name_command(mocker, movie_conversation_no_repeat):
      - executing the command '/find_movies_by-name',
 
     Then:
-     - make sure movies were found and that only 5 were returned.
+     - make sure movies were found and that only the 5 most popular movies of the 10 most relevant were returned.
+     - make sure only the first page was queried as it has enough candidates for the limit.
      - make sure the next stage in the conversation is the query movie details stage.
     """
     api_response = requests.Response()
@@ -69,13 +70,14 @@ def test_find_movies_by_name_command(mocker, movie_conversation_no_repeat):
         'json',
         side_effect=load_json('mr_knowledge_bot/bot/tests/movie/test_data/search_movies_response.json')
     )
-    mocker.patch.object(requests, 'request', return_value=api_response)
+    request_mock = mocker.patch.object(requests.Session, 'request', return_value=api_response)
 
     next_stage = movie_conversation_no_repeat.find_movies_by_name_command(name='escape', limit=5, sort_by='popularity')
     assert movie_conversation_no_repeat.update.effective_message.reply_text.called
     assert movie_conversation_no_repeat.update.effective_message.reply_text.call_args.kwargs['text'] == \
-           'Found the following movies for you 😀\n\nThe Great Escape\nThe Great Escape\nEscape from Alcatraz' \
-           '\nEscape from Alcatraz\nEscape from New York'
+           'Found the following movies for you 😀\n\nMadagascar: Escape 2 Africa\nEscape Room: Tournament of Champions' \
+           '\nEscape Plan 2: Hades\nEscape the Undertaker\nEscape Plan'
+    assert request_mock.call_count == 1
     assert movie_conversation_no_repeat.context.bot.send_message.called
     assert next_stage == movie_conversation_no_repeat.query_movie_details_stage
 
@@ -97,7 +99,7 @@ def test_find_movies_by_name_command_movies_not_found(mocker, movie_conversation
     api_response.status_code = 200
 
     mocker.patch.object(api_response, 'json', return_value={'results': []})
-    mocker.patch.object(requests, 'request', return_value=api_response)
+    mocker.patch.object(requests.Session, 'request', return_value=api_response)
 
     next_stage = movie_conversation_no_repeat.find_movies_by_name_command(name='escape', limit=5, sort_by='popularity')
     assert next_stage == ConversationHandler.END
@@ -182,7 +184,7 @@ def test_display_movie_with_valid_movie(mocker, movie_conversation_no_repeat):
         'json',
         return_value=load_json('mr_knowledge_bot/bot/tests/movie/test_data/movie_details_response.json')
     )
-    mocker.patch.object(requests, 'request', return_value=api_response)
+    mocker.patch.object(requests.Session, 'request', return_value=api_response)
 
     movie_conversation_no_repeat.update.message.text = 'Escape Plan 2: Hades'
     next_stage = movie_conversation_no_repeat.display_movie_details()
@@ -0,0 +1,151 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from mr_knowledge_bot.bot.clients import MovieClient
+from mr_knowledge_bot.bot.entites.the_movie_db.genre_entity import GenreEntity, genre_table
+from mr_knowledge_bot.bot.entites.the_movie_db.movie_entity import TheMovieDBMovieEntity
+from mr_knowledge_bot.bot.services import MovieService
+from mr_knowledge_bot.bot.services.the_movie_db.genre_registry import GenreRegistry
+
+
+@pytest.fixture()
+def genre_registry(mocker) -> GenreRegistry:
+    mocker.patch.object(
+        MovieClient,
+        'get_genres',
+        return_value=GenreEntity.from_response({'genres': [{'id': 878, 'name': 'Science Fiction'}]})
+    )
+    registry = GenreRegistry(client_class=MovieClient)
+    mocker.patch.object(MovieService, 'genre_registry', registry)
+    return registry
+
+
+def test_genres_are_loaded_once_for_all_services(genre_registry):
+    """
+    Given:
+     - a genre registry shared by the movie service.
+
+    When:
+     - creating several movie services and resolving genre names on each one of them.
+
+    Then:
+     - make sure the genres were queried only once.
+     - make sure the genre names are resolved case-insensitively.
+    """
+    for _ in range(5):
+        service = MovieService()
+        assert service.genre_names_to_ids([' science fiction', 'SCIENCE FICTION', 'Unknown']) == [878, 878]
+        assert service.get_genres() == ['Science Fiction']
+
+    assert MovieClient.get_genres.call_count == 1
+
+
+def test_expired_genres_are_refreshed_in_background(mocker, genre_registry):
+    """
+    Given:
+     - a registry whose genres already expired.
+
+    When:
+     - resolving genres names.
+
+    Then:
+     - make sure the expired genres are still served without waiting.
+     - make sure the genres are refreshed in the background.
+    """
+    genre_registry.load()
+    genre_registry.ttl = 0
+    refresh_mock = mocker.patch.object(genre_registry, '_refresh_in_background')
+
+    assert genre_registry.names_to_ids(['Science Fiction']) == [878]
+    assert refresh_mock.called
+
+
+def test_concurrent_callers_start_a_single_refresh(mocker, genre_registry):
+    """
+    Given:
+     - a registry whose genres already expired, and an api that takes a while to answer the genres.
+
+    When:
+     - resolving genres names from many threads at once.
+
+    Then:
+     - make sure the genres are refreshed only once.
+    """
+    genre_registry.load()
+    genre_registry.ttl = 0
+    get_genres = MovieClient.get_genres
+    refreshed = threading.Event()
+
+    def slow_get_genres():
+        time.sleep(0.1)
+        refreshed.set()
+        return get_genres()
+
+    mocker.patch.object(MovieClient, 'get_genres', side_effect=slow_get_genres)
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        list(executor.map(lambda _: genre_registry.names_to_ids(['Science Fiction']), range(64)))
+
+    assert refreshed.wait(1)
+    assert MovieClient.get_genres.call_count == 1
+
+
+def test_genres_are_interned_and_filtered_by_bitmasks(mocker, genre_registry):
+    """
+    Given:
+     - movies of a search response, whose genres are genre ids.
+     - a registry with the horror and science fiction genres.
+
+    When:
+     - filtering the movies by genres names.
+
+    Then:
+     - make sure the genres of the movies are the interned genres, named by the registry.
+     - make sure only the movies with all the requested genres (and none of the excluded ones) are kept.
+    """
+    MovieClient.get_genres.return_value = GenreEntity.from_response(
+        {'genres': [{'id': 27, 'name': 'Horror'}, {'id': 878, 'name': 'Science Fiction'}]}
+    )
+    movies = TheMovieDBMovieEntity.from_response({'results': [
+        {'id': 1, 'title': 'Alien', 'genre_ids': [27, 878]},
+        {'id': 2, 'title': 'Arrival', 'genre_ids': [878, 18]},
+        {'id': 3, 'title': 'Halloween', 'genre_ids': [27]}
+    ]})
+    service = MovieService()
+
+    assert movies[0].genres[1] is movies[1].genres[0] is genre_table.intern(878)
+    assert [genre.name for genre in genre_table.genres(movies[0].genre_mask)] == ['Science Fiction', 'Horror']
+    assert [movie.name for movie in service.filter_by_genres(movies, with_genres=['science fiction'])] == [
+        'Alien', 'Arrival'
+    ]
+    assert [
+        movie.name for movie in service.filter_by_genres(movies, with_genres=['Horror'], without_genres=['Sci-Fi'])
+    ] == ['Alien', 'Halloween']
+    assert [
+        movie.name
+        for movie in service.filter_by_genres(movies, with_genres=['science fiction'], without_genres=['horror'])
+    ] == ['Arrival']
+
+
+def test_start_does_not_fail_when_the_api_is_unavailable(mocker, genre_registry):
+    """
+    Given:
+     - an api that is unavailable when the bot starts.
+
+    When:
+     - starting the registry and resolving genres names once the api is back.
+
+    Then:
+     - make sure the registry starts without failing.
+     - make sure the genres are loaded on first use.
+    """
+    get_genres = MovieClient.get_genres.return_value
+    mocker.patch.object(MovieClient, 'get_genres', side_effect=ConnectionError('unavailable'))
+    genre_registry.start()
+    genre_registry.stop()
+    assert not genre_registry.loaded
+
+    mocker.patch.object(MovieClient, 'get_genres', return_value=get_genres)
+    assert genre_registry.names_to_ids(['Science Fiction']) == [878]
@@ -0,0 +1,26 @@
+from datetime import date, timedelta
+
+from mr_knowledge_bot.bot.clients import MovieClient
+from mr_knowledge_bot.bot.services import MovieService
+
+
+def test_discover_does_not_query_unreleased_movies(mocker, fake_the_movie_db_server, mutate_pages):
+    """
+    Given:
+     - an api whose first movie is released tomorrow and whose second movie has no release date.
+
+    When:
+     - discovering released movies before a date in the future.
+
+    Then:
+     - make sure the release date filter sent to the api is bounded by yesterday.
+     - make sure movies without a release date or with a future one are not returned.
+    """
+    mutate_pages('unreleased movies')
+    mocker.patch.object(MovieClient, 'BASE_URL', fake_the_movie_db_server.base_url)
+
+    movies = MovieService().discover(limit=5, before_date='in 2 years')
+    assert [movie.id for movie in movies] == [3, 4, 5, 6, 7]
+    assert movies[0].release_ordinal == date.fromisoformat(movies[0].release_date).toordinal()
+    _, query = fake_the_movie_db_server.requests[0]
+    assert query['primary_release_date.lte'] == (date.today() - timedelta(days=1)).isoformat()
@@ -0,0 +1,127 @@
+import math
+from datetime import date
+
+from mr_knowledge_bot.bot.clients import MovieClient
+from mr_knowledge_bot.bot.clients.the_movie_db import movie_db_base_client
+from mr_knowledge_bot.bot.services import MovieService
+from mr_knowledge_bot.bot.services.the_movie_db import base_movie_db_service, partitioning
+from mr_knowledge_bot.bot.services.the_movie_db.partitioning import DateWindow, PartitionedPages
+from mr_knowledge_bot.bot.telegram.telegram_bot import MAX_DISCOVER_LIMIT
+
+MAX_PAGES = 2
+
+
+def test_date_window_split():
+    """
+    Given:
+     - a date window of 10 days.
+
+    When:
+     - splitting it into 3 windows and into more windows than days.
+
+    Then:
+     - make sure the windows are consecutive, cover the window and don't overlap.
+    """
+    window = DateWindow(after=date(2020, 1, 1), before=date(2020, 1, 10))
+    assert window.split(3) == [
+        DateWindow(date(2020, 1, 1), date(2020, 1, 3)),
+        DateWindow(date(2020, 1, 4), date(2020, 1, 6)),
+        DateWindow(date(2020, 1, 7), date(2020, 1, 10))
+    ]
+    assert len(window.split(20)) == 10
+    assert DateWindow(before=date(2020, 1, 10)).split(2)[0].after is None
+
+
+def filter_by_release_dates(fake_the_movie_db_server, pages, max_pages=None):
+    """
+    Makes the api filter discover by the release dates of the query and sort it by popularity, returns the records.
+    """
+    records = [record for page in range(1, pages + 1) for record in fake_the_movie_db_server.page(page)['results']]
+
+    def respond(path, query):
+        matching = sorted((
+            record for record in records
+            if query.get('primary_release_date.gte', '0') <= record['release_date']
+            <= query.get('primary_release_date.lte', '9')
+        ), key=lambda record: -record['popularity'])
+        page = int(query.get('page', 1))
+        return 200, {
+            'page': page,
+            'results': matching[(page - 1) * 20:page * 20] if not max_pages or page <= max_pages else [],
+            'total_pages': math.ceil(len(matching) / 20),
+            'total_results': len(matching)
+        }
+
+    return records, respond
+
+
+def test_high_limit_discover_is_partitioned_past_the_page_cap(mocker, fake_the_movie_db_server):
+    """
+    Given:
+     - an api that filters discover by release dates, sorts it by popularity and paginates only 2 pages per query.
+
+    When:
+     - discovering the 60 most popular movies, more than a single query reaches.
+
+    Then:
+     - make sure the date window is partitioned and no query asks for a page past the cap.
+     - make sure the merged partitions return the most popular movies of all the movies.
+    """
+    records, respond = filter_by_release_dates(fake_the_movie_db_server, pages=25, max_pages=MAX_PAGES)
+    mocker.patch.object(fake_the_movie_db_server, 'respond', side_effect=respond)
+    mocker.patch.object(MovieClient, 'BASE_URL', fake_the_movie_db_server.base_url)
+    mocker.patch.object(movie_db_base_client, 'MAX_PAGES', MAX_PAGES)
+    mocker.patch.object(partitioning, 'MAX_PAGES', MAX_PAGES)
+    mocker.patch.object(partitioning, 'PARTITION_RECORDS', 20)
+    mocker.patch.object(base_movie_db_service, 'MAX_RECORDS', 20)
+
+    movies = MovieService().discover(limit=60, sort_by='popularity')
+    assert sorted(movie.popularity for movie in movies) == sorted(record['popularity'] for record in records)[-60:]
+    queries = [query for _, query in fake_the_movie_db_server.requests]
+    assert len({query.get('primary_release_date.gte') for query in queries}) > 1
+    assert all(int(query['page']) <= MAX_PAGES for query in queries)
+
+
+def test_discover_of_the_maximum_limit_is_partitioned(mocker, fake_the_movie_db_server):
+    """
+    Given:
+     - an api with 3000 movies that filters discover by release dates and sorts it by popularity.
+
+    When:
+     - discovering the maximum number of movies a telegram command allows.
+
+    Then:
+     - make sure the date window is split into windows that are queried concurrently.
+     - make sure the merged partitions return the most popular movies of all the movies.
+    """
+    fake_the_movie_db_server.total_results = 3000
+    records, respond = filter_by_release_dates(fake_the_movie_db_server, pages=150)
+    mocker.patch.object(fake_the_movie_db_server, 'respond', side_effect=respond)
+    mocker.patch.object(MovieClient, 'BASE_URL', fake_the_movie_db_server.base_url)
+
+    movies = MovieService().discover(limit=MAX_DISCOVER_LIMIT, sort_by='popularity')
+    assert len(movies) == MAX_DISCOVER_LIMIT
+    assert sorted(movie.popularity for movie in movies) == sorted(
+        record['popularity'] for record in records
+    )[-MAX_DISCOVER_LIMIT:]
+    queries = [query for _, query in fake_the_movie_db_server.requests]
+    assert len({query.get('primary_release_date.gte') for query in queries}) > 1
+
+
+def test_wanted_records_are_divided_between_the_partitions(mocker):
+    """
+    Given:
+     - two partitions, one holds three times the records of the other.
+
+    When:
+     - asking the merged pages for 100 records.
+
+    Then:
+     - make sure every partition is asked for its share of the records instead of all of them.
+    """
+    partitions = [mocker.Mock(total_results=300), mocker.Mock(total_results=100)]
+    pages = PartitionedPages(partitions=partitions, key=None)
+
+    pages.wanted = 100
+
+    assert [partition.wanted for partition in partitions] == [75, 25]
@@ -0,0 +1,102 @@
+from mr_knowledge_bot.bot.clients import MovieClient
+from mr_knowledge_bot.bot.entites.the_movie_db.movie_entity import TheMovieDBMovieEntity
+from mr_knowledge_bot.bot.services import MovieService
+from mr_knowledge_bot.bot.services.the_movie_db.pipeline import ResultPipeline, Dedupe, TopK, english_names
+
+
+def test_top_k_ranks_the_records_that_passed_the_stages():
+    """
+    Given:
+     - movies with a duplicate and a non english name.
+
+    When:
+     - selecting the two most popular movies.
+
+    Then:
+     - make sure the duplicate and the non english movie were dropped before the ranking.
+    """
+    movies = TheMovieDBMovieEntity.from_response({'results': [
+        {'id': 1, 'title': 'Heat', 'popularity': 5.0},
+        {'id': 2, 'title': 'סרט', 'popularity': 9.0},
+        {'id': 3, 'title': 'Ronin', 'popularity': 7.0},
+        {'id': 1, 'title': 'Heat', 'popularity': 5.0},
+        {'id': 4, 'title': 'Thief', 'popularity': 1.0}
+    ]})
+    result_pipeline = ResultPipeline(
+        stages=[english_names(), Dedupe()], top_k=TopK(2, key=lambda movie: movie.popularity)
+    )
+    assert [movie.id for movie in result_pipeline.run(movies)] == [3, 1]
+    assert result_pipeline.stats() == {'decoded': 5, 'non english names': 1, 'duplicates': 1, 'top-k': 1}
+
+
+def test_search_limit_counts_only_filtered_records(fake_the_movie_db_server, mutate_pages):
+    """
+    Given:
+     - an api where every second movie has a non english title.
+
+    When:
+     - running a pipeline of 20 movies over a lazy search.
+
+    Then:
+     - make sure the lazy iterator does not query any page before the pipeline consumes it.
+     - make sure 20 english titled movies are returned from the first two pages.
+     - make sure the pipeline reports the records it dropped.
+    """
+    mutate_pages('non english titles')
+    movie_client = MovieClient(token='token', base_url=fake_the_movie_db_server.base_url)
+
+    lazy_movies = movie_client.search(movie_name='movie', lazy=True)
+    assert fake_the_movie_db_server.count() == 0
+
+    result_pipeline = ResultPipeline(stages=[english_names(), Dedupe()], top_k=TopK(20))
+    movies = result_pipeline.run(lazy_movies)
+    assert len(movies) == 20
+    assert all(movie.id % 2 == 0 for movie in movies)
+    assert fake_the_movie_db_server.count('/search/movie') == 2
+    assert result_pipeline.stats() == {'decoded': 40, 'non english names': 20, 'duplicates': 0, 'top-k': 0}
+
+
+def test_pipeline_results_are_cached(mocker, fake_the_movie_db_server):
+    """
+    Given:
+     - a movie search that was already answered.
+
+    When:
+     - searching for the same movies again (with a different spacing and case).
+
+    Then:
+     - make sure the results are served from the results cache without querying the api.
+    """
+    mocker.patch.object(MovieClient, 'BASE_URL', fake_the_movie_db_server.base_url)
+
+    movies = MovieService().find_by_name(movie_name='Movie', limit=5, sort_by=None)
+    cached_movies = MovieService().find_by_name(movie_name=' movie ', limit=5, sort_by=None)
+
+    assert [movie.id for movie in cached_movies] == [movie.id for movie in movies]
+    assert fake_the_movie_db_server.count('/search/movie') == 1
+
+
+def test_pages_are_asked_for_by_the_estimated_pass_rate_until_it_is_observed():
+    """
+    Given:
+     - a pipeline whose plan estimates that half of the records pass its stages.
+
+    When:
+     - running it over lazy pages.
+
+    Then:
+     - make sure the pages are asked for twice the records the top-k stage needs before any record arrived.
+    """
+    class Pages(list):
+        wanted = None
+        wanted_history = []
+
+        def __iter__(self):
+            for record in super().__iter__():
+                self.wanted_history.append(self.wanted)
+                yield record
+
+    movies = Pages(TheMovieDBMovieEntity.from_response({'results': [{'id': 1, 'title': 'Heat'}]}))
+    ResultPipeline(stages=[english_names()], top_k=TopK(10), pass_rate=0.5).run(movies)
+
+    assert movies.wanted_history[0] == 20
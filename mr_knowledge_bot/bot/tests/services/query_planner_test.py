@@ -0,0 +1,23 @@
+from mr_knowledge_bot.bot.clients import TVShowsClient
+from mr_knowledge_bot.bot.services import TVShowService
+
+
+def test_discover_pushes_the_query_down_and_queries_the_estimated_pages(mocker, fake_the_movie_db_server):
+    """
+    Given:
+     - an api with 500 tv-shows.
+
+    When:
+     - discovering the 50 most popular ended/cancelled tv-shows.
+
+    Then:
+     - make sure the sort and the statuses (as TMDB codes) are sent to the api.
+     - make sure the pages the plan estimated are queried in the first wave, and no other page is queried.
+    """
+    mocker.patch.object(TVShowsClient, 'BASE_URL', fake_the_movie_db_server.base_url)
+
+    tv_shows = TVShowService().discover(limit=50, sort_by='popularity', with_status=['Ended', 'cancelled', 'unknown'])
+    assert len(tv_shows) == 50
+    queries = sorted(fake_the_movie_db_server.requests, key=lambda request: int(request[1]['page']))
+    assert [int(query['page']) for _, query in queries] == [1, 2, 3]
+    assert all(query['sort_by'] == 'popularity.desc' and query['with_status'] == '3|4' for _, query in queries)
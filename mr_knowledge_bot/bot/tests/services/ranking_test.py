@@ -0,0 +1,32 @@
+import pytest
+
+from mr_knowledge_bot.bot.entites.the_movie_db.tv_show_entity import TheMovieDBTVShowEntity
+from mr_knowledge_bot.bot.services.the_movie_db.pipeline import TopK
+from mr_knowledge_bot.bot.services.the_movie_db.ranking import ranking_key
+
+
+@pytest.mark.parametrize('sort_by, expected_ids', [
+    ('popularity', [2, 1]),
+    ('first_air_date', [3, 1]),
+    ('release_date', [3, 1]),
+    ('rating', [1, 3]),
+    (None, [1, 2])
+])
+def test_ranking_is_null_safe(sort_by, expected_ids):
+    """
+    Given:
+     - tv-shows that miss some of their popularity, first air date and rating.
+
+    When:
+     - ranking the top two tv-shows by each sort option.
+
+    Then:
+     - make sure the tv-shows without a value are ranked last instead of failing the comparison.
+     - make sure the tv-shows keep their order if there is no sort option.
+    """
+    tv_shows = TheMovieDBTVShowEntity.from_response({'results': [
+        {'id': 1, 'name': 'Fargo', 'popularity': 10.0, 'first_air_date': '2014-04-15', 'vote_average': 8.2},
+        {'id': 2, 'name': 'Dark', 'popularity': 50.0, 'first_air_date': None, 'vote_average': None},
+        {'id': 3, 'name': 'Severance', 'popularity': None, 'first_air_date': '2022-02-18', 'vote_average': 8.0}
+    ]})
+    assert [tv_show.id for tv_show in TopK(2, key=ranking_key(sort_by))(tv_shows)] == expected_ids
@@ -1,5 +1,8 @@
+import datetime
 from typing import Optional, Any
 
+import dateparser
+
 
 def is_english_letters_movie(name: str):
     try:
@@ -23,3 +26,24 @@ def dict_get_nested_fields(dictionary: dict, keys: Optional[list], default: Any
             result = default
 
     return result
+
+
+def parse_date(value: Optional[str]) -> Optional[datetime.date]:
+    """
+    Parses a date of the api, ISO dates (the format of TMDB) are parsed directly and only other formats fall back
+    to dateparser. Returns None if there is no date or it could not be parsed.
+    """
+    if not value:
+        return None
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        parsed_date = dateparser.parse(value)  # slow, needed only for dates that are not ISO dates.
+        return parsed_date.date() if parsed_date else None
+
+
+def date_ordinal(value: Optional[str]) -> Optional[int]:
+    """
+    Returns the ordinal of a date of the api (see parse_date), ordinals are compared as plain integers.
+    """
+    return parsed_date.toordinal() if (parsed_date := parse_date(value)) else None